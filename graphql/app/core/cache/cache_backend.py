@@ -0,0 +1,36 @@
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+
+
+class CacheBackend(ABC):
+    """
+    Armazenamento do cache de leitura. Os valores chegam serializados (bytes), então uma
+    implementação compartilhada (ex.: Redis) permite que vários workers do uvicorn reaproveitem entradas.
+    Cada entrada pode ter tags (ex.: "cnpj:123"); `invalidate` remove de uma vez as entradas de qualquer das tags
+    """
+
+    evictions: int = 0
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float, tags: Iterable[str] = ()) -> None: ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    async def clear(self) -> None: ...
+
+    @abstractmethod
+    async def invalidate(self, tags: Iterable[str]) -> int:
+        """
+        Remove as entradas marcadas com alguma das tags e devolve quantas foram removidas
+        """
+
+    def size(self) -> int:
+        """
+        Bytes ocupados pelas entradas (quando o backend consegue medir)
+        """
+        return 0
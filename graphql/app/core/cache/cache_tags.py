@@ -0,0 +1,33 @@
+from collections.abc import Iterable
+from typing import Any
+
+
+class CacheTags:
+    """
+    Tags das entradas do cache de leitura, usadas na invalidação por alterações nos dados:
+    - `cnpj:<cnpj>`: o resultado só depende das linhas desse contribuinte (em qualquer tabela);
+    - `entidade:<entidade>`: o resultado depende de um conjunto aberto de linhas da entidade
+      (busca por nome, por município, por número), e qualquer alteração nela pode mudá-lo.
+    Uma alteração (entidade, cnpj) invalida as duas tags correspondentes
+    """
+
+    @staticmethod
+    def cnpj(cnpj: str) -> str:
+        return f"cnpj:{cnpj}"
+
+    @staticmethod
+    def cnpjs(cnpjs: Iterable[str]) -> set[str]:
+        return {CacheTags.cnpj(cnpj) for cnpj in cnpjs}
+
+    @staticmethod
+    def entidade(entidade: str) -> str:
+        return f"entidade:{entidade}"
+
+    @staticmethod
+    def linhas(rows: list[dict[str, Any]]) -> set[str]:
+        # Cnpjs das linhas devolvidas: cobre as colunas de outras tabelas trazidas por join
+        return {CacheTags.cnpj(row["cnpj_contribuinte"]) for row in rows if row.get("cnpj_contribuinte")}
+
+    @staticmethod
+    def alteracao(entidade: str, cnpj: str) -> tuple[str, str]:
+        return CacheTags.cnpj(cnpj), CacheTags.entidade(entidade)
@@ -0,0 +1,80 @@
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from app.core.cache.cache_backend import CacheBackend
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Backend local do processo: LRU limitado em bytes, com expiração por entrada e índice tag -> chaves
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._bytes = 0
+        self._items: OrderedDict[str, tuple[float, bytes, frozenset[str]]] = OrderedDict()
+        self._tags: dict[str, set[str]] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        item = self._items.get(key)
+        if item is None:
+            return None
+
+        expires_at, value, _ = item
+        if expires_at < time.monotonic():
+            self._remove(key)
+            return None
+
+        self._items.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float, tags: Iterable[str] = ()) -> None:
+        if key in self._items:
+            self._remove(key)
+
+        # Entrada maior que o cache inteiro não é guardada
+        if len(value) > self.max_bytes:
+            return
+
+        tags = frozenset(tags)
+        self._items[key] = (time.monotonic() + ttl, value, tags)
+        self._bytes += len(value)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._items))
+            self._remove(oldest)
+            self.evictions += 1
+
+    async def delete(self, key: str) -> None:
+        if key in self._items:
+            self._remove(key)
+
+    async def clear(self) -> None:
+        self._items.clear()
+        self._tags.clear()
+        self._bytes = 0
+
+    async def invalidate(self, tags: Iterable[str]) -> int:
+        keys = set()
+        for tag in tags:
+            keys.update(self._tags.get(tag, ()))
+
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def size(self) -> int:
+        return self._bytes
+
+    def _remove(self, key: str) -> None:
+        _, value, tags = self._items.pop(key)
+        self._bytes -= len(value)
+        for tag in tags:
+            keys = self._tags[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
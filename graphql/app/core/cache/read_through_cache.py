@@ -0,0 +1,204 @@
+import asyncio
+import hashlib
+import json
+import logging
+from collections.abc import Iterable
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Awaitable, Callable
+
+from app.core import config
+from app.core.cache.cache_backend import CacheBackend
+from app.core.cache.memory_cache_backend import MemoryCacheBackend
+from app.core.cache.redis_cache_backend import RedisCacheBackend
+
+logger = logging.getLogger(__name__)
+
+# Valores guardados em JSON, nunca em pickle: quem escreve no Redis compartilhado não pode executar código nos workers.
+# Os tipos das linhas que o JSON não tem viram {"__tipo__": nome, "valor": texto}
+_TIPOS: dict[str, tuple[type, Callable[[Any], str], Callable[[str], Any]]] = {
+    "datetime": (datetime, datetime.isoformat, datetime.fromisoformat),
+    "date": (date, date.isoformat, date.fromisoformat),
+    "Decimal": (Decimal, str, Decimal),
+}
+
+
+class _CargaCancelada(Exception):
+    """
+    Entregue a quem aguardava uma carga cancelada, no lugar do CancelledError de outra requisição
+    """
+
+
+class ReadThroughCache:
+    """
+    Cache de leitura na frente dos repositórios: a chave é o statement do builder mais os parâmetros,
+    o TTL é definido por entidade e misses concorrentes da mesma chave disparam uma única consulta.
+    As entradas recebem tags (ver CacheTags) calculadas sobre o valor carregado, e `invalidate` remove as
+    entradas das tags alteradas (ver AlteracaoNotifier), sem esperar o TTL
+    """
+
+    def __init__(self, backend: CacheBackend, ttls: dict[str, float]):
+        self.backend = backend
+        self.ttls = ttls
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+        self._inflight: dict[str, asyncio.Future] = {}
+        # Última invalidação de cada tag enquanto há cargas em andamento (número de sequência)
+        self._sequence = 0
+        self._invalidated: dict[str, int] = {}
+
+    async def get_or_load(
+        self,
+        *,
+        entity: str,
+        statement: Any,
+        parameters: dict[str, Any],
+        loader: Callable[[], Awaitable[Any]],
+        tags: Callable[[Any], Iterable[str]] | None = None,
+    ) -> Any:
+        ttl = self.ttls.get(entity, 0)
+        if ttl <= 0:
+            return await loader()
+
+        key = self._key(entity=entity, statement=statement, parameters=parameters)
+
+        while True:
+            hit, value = await self._get(key)
+            if hit:
+                self.hits += 1
+                return value
+
+            # Single-flight: quem chega enquanto a mesma chave está sendo carregada aguarda o mesmo resultado
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                return await self._load(key=key, ttl=ttl, loader=loader, tags=tags)
+
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except _CargaCancelada:
+                # Quem carregava foi cancelado: os que aguardavam consultam a chave de novo e um deles a carrega
+                continue
+
+    async def _load(
+        self,
+        *,
+        key: str,
+        ttl: float,
+        loader: Callable[[], Awaitable[Any]],
+        tags: Callable[[Any], Iterable[str]] | None,
+    ) -> Any:
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        start = self._sequence
+        try:
+            value = await loader()
+            value_tags = set(tags(value)) if tags is not None else set()
+            # Uma tag invalidada durante a consulta pode ter tornado o valor velho: ele é devolvido, mas não guardado
+            if not any(self._invalidated.get(tag, start) > start for tag in value_tags):
+                await self._set(key, value, ttl, tags=value_tags)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            # O cancelamento (ex.: cliente desconectado) é só desta requisição: os que aguardavam não o herdam
+            future.set_exception(_CargaCancelada())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Evita o aviso de exceção não consumida quando ninguém mais aguardava a chave
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+            if not self._inflight:
+                self._invalidated.clear()
+
+    async def _get(self, key: str) -> tuple[bool, Any]:
+        # Cache indisponível (ex.: Redis fora do ar) ou entrada ilegível viram miss: a leitura segue no banco
+        try:
+            data = await self.backend.get(key)
+            return (False, None) if data is None else (True, _loads(data))
+        except Exception:
+            logger.exception("Falha ao ler do cache")
+            return False, None
+
+    async def _set(self, key: str, value: Any, ttl: float, tags: set[str]) -> None:
+        # Uma falha ao guardar não derruba a leitura que já carregou o valor
+        try:
+            data = _dumps(value)
+            await self.backend.set(key, data, ttl, tags=tags)
+        except Exception:
+            logger.exception("Falha ao gravar no cache")
+
+    async def invalidate(self, tags: Iterable[str]) -> int:
+        tags = set(tags)
+        if self._inflight:
+            self._sequence += 1
+            for tag in tags:
+                self._invalidated[tag] = self._sequence
+
+        removed = await self.backend.invalidate(tags)
+        self.invalidations += removed
+        return removed
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.backend.evictions,
+            "invalidations": self.invalidations,
+            "bytes": self.backend.size(),
+        }
+
+    @staticmethod
+    def _key(*, entity: str, statement: Any, parameters: dict[str, Any]) -> str:
+        raw = f"{entity}|{statement}|{sorted(parameters.items())!r}"
+        return f"{entity}:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, default=_encode, separators=(",", ":")).encode()
+
+
+def _loads(data: bytes) -> Any:
+    return json.loads(data, object_hook=_decode)
+
+
+def _encode(value: Any) -> dict[str, str]:
+    # type() exato: datetime também é instância de date
+    for nome, (tipo, encode, _) in _TIPOS.items():
+        if type(value) is tipo:
+            return {"__tipo__": nome, "valor": encode(value)}
+    raise TypeError(f"Tipo não suportado no cache: {type(value).__name__}")
+
+
+def _decode(obj: dict[str, Any]) -> Any:
+    if obj.keys() == {"__tipo__", "valor"}:
+        _, _, decode = _TIPOS[obj["__tipo__"]]
+        return decode(obj["valor"])
+    return obj
+
+
+def _build_backend() -> CacheBackend:
+    if config.CACHE_BACKEND == "redis":
+        return RedisCacheBackend(url=config.CACHE_REDIS_URL)
+    return MemoryCacheBackend(max_bytes=config.CACHE_MAX_BYTES)
+
+
+cache = ReadThroughCache(
+    backend=_build_backend(),
+    ttls={
+        "contribuinte": config.CACHE_TTL_CONTRIBUINTE,
+        "endereco": config.CACHE_TTL_ENDERECO,
+        "danfe": config.CACHE_TTL_DANFE,
+        "contagem": config.CACHE_TTL_CONTAGEM,
+    },
+)
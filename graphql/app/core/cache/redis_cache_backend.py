@@ -0,0 +1,57 @@
+from collections.abc import Iterable
+
+from app.core.cache.cache_backend import CacheBackend
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Backend compartilhado entre workers; requer o pacote opcional `redis`.
+    Cada tag é um conjunto com as chaves marcadas, que expira junto com a entrada mais longa dele (Redis 7+)
+    """
+
+    def __init__(self, url: str, prefix: str = "graphql:"):
+        try:
+            from redis import asyncio as redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requer o pacote 'redis' instalado")
+
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: float, tags: Iterable[str] = ()) -> None:
+        ttl_ms = int(ttl * 1000)
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.set(self.prefix + key, value, px=ttl_ms)
+            for tag in tags:
+                tag_key = self._tag_key(tag)
+                pipe.sadd(tag_key, key)
+                # NX define o TTL do conjunto novo; GT só o estende
+                pipe.pexpire(tag_key, ttl_ms, nx=True)
+                pipe.pexpire(tag_key, ttl_ms, gt=True)
+            await pipe.execute()
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(self.prefix + key)
+
+    async def clear(self) -> None:
+        async for key in self._client.scan_iter(match=f"{self.prefix}*"):
+            await self._client.delete(key)
+
+    async def invalidate(self, tags: Iterable[str]) -> int:
+        removed = 0
+        for tag in tags:
+            # Lê e apaga o conjunto atomicamente: chaves marcadas depois disso entram em um conjunto novo
+            async with self._client.pipeline(transaction=True) as pipe:
+                pipe.smembers(self._tag_key(tag))
+                pipe.delete(self._tag_key(tag))
+                keys, _ = await pipe.execute()
+
+            if keys:
+                removed += await self._client.delete(*(self.prefix + key.decode() for key in keys))
+        return removed
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
@@ -5,14 +5,125 @@ from dotenv import load_dotenv
 # Carrega variáveis de ambiente do arquivo .env
 load_dotenv()
 
-# Configuração do Oracle
+# Configuração do banco (usuário, senha, host, porta e serviço/nome do banco)
 DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_HOST = os.getenv("DB_HOST")
 DB_PORT = int(os.getenv("DB_PORT", "1521"))
 DB_SERVICE = os.getenv("DB_SERVICE")
 
+# Banco: oracle | postgresql | sqlite. DB_URL (URL SQLAlchemy completa) substitui a montada com as variáveis acima,
+# ex.: sqlite+aiosqlite:///benchmark.db; sem DB_BACKEND, o banco vem do esquema da DB_URL
+DB_URL = os.getenv("DB_URL")
+DB_BACKEND = os.getenv("DB_BACKEND", DB_URL.split(":")[0].split("+")[0] if DB_URL else "oracle")
+
+# Réplicas de leitura (URLs SQLAlchemy separadas por vírgula): consultas GraphQL e exportações leem delas,
+# mutations, ingestão e jobs gravam no primário. Estratégia: least_busy (menos conexões em uso) | round_robin
+DB_REPLICA_URLS = [url.strip() for url in os.getenv("DB_REPLICA_URLS", "").split(",") if url.strip()]
+DB_REPLICA_STRATEGY = os.getenv("DB_REPLICA_STRATEGY", "least_busy")
+# Health check das réplicas (segundos); após DB_REPLICA_MAX_FAILURES falhas seguidas a réplica sai de rotação
+# e volta no primeiro check bem-sucedido
+DB_REPLICA_HEALTH_INTERVAL = float(os.getenv("DB_REPLICA_HEALTH_INTERVAL", "5"))
+DB_REPLICA_HEALTH_TIMEOUT = float(os.getenv("DB_REPLICA_HEALTH_TIMEOUT", "2"))
+DB_REPLICA_MAX_FAILURES = int(os.getenv("DB_REPLICA_MAX_FAILURES", "2"))
+# Read-your-writes: segundos em que as leituras de quem acabou de gravar vão ao primário (0 desliga)
+DB_READ_YOUR_WRITES_SECONDS = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))
+
+# Sessão das requisições GraphQL: true usa uma conexão curta por comando (campos irmãos em paralelo)
+# em vez de uma conexão compartilhada, obtida no primeiro comando e liberada ao fim da execução
+DB_SESSION_SHORT_LIVED = os.getenv("DB_SESSION_SHORT_LIVED", "false").lower() == "true"
+# true: cada campo raiz de lista (danfes, contribuintes, enderecos) usa a própria conexão, em paralelo
+DB_ROOT_FIELD_SESSIONS = os.getenv("DB_ROOT_FIELD_SESSIONS", "false").lower() == "true"
+# Conexões próprias simultâneas por requisição (campos raiz, totalCount e sessões curtas)
+DB_MAX_CONNECTIONS_PER_REQUEST = int(os.getenv("DB_MAX_CONNECTIONS_PER_REQUEST", "3"))
+
+# Exportação em lote: linhas buscadas por round-trip (arraysize/prefetchrows do driver) e por lote codificado
+EXPORT_FETCH_SIZE = int(os.getenv("EXPORT_FETCH_SIZE", "5000"))
+
+# Ingestão em lote: linhas por executemany (array binding) e por commit
+INGESTAO_BATCH_SIZE = int(os.getenv("INGESTAO_BATCH_SIZE", "1000"))
+
+# Agregação de danfes: limite de grupos por consulta e uso da materialized view mensal (mv_danfe_mensal)
+AGREGADO_MAX_GRUPOS = int(os.getenv("AGREGADO_MAX_GRUPOS", "1000"))
+AGREGADO_USAR_MV = os.getenv("AGREGADO_USAR_MV", "false").lower() == "true"
+
+# Resumo mensal de danfes (danfe_resumo_mensal): job de atualização incremental no lifespan e leitura pela agregação.
+# O incremental lê o log nota_fiscal.alteracao (lote e espera de CACHE_INVALIDACAO_LOTE/ESPERA) e recalcula os
+# contribuintes com danfes alteradas. Intervalos em segundos; RESUMO_MENSAL_RECONSTRUCAO=0 desliga a reconstrução
+# completa periódica
+RESUMO_MENSAL_ATIVO = os.getenv("RESUMO_MENSAL_ATIVO", "false").lower() == "true"
+RESUMO_MENSAL_INTERVALO = float(os.getenv("RESUMO_MENSAL_INTERVALO", "60"))
+RESUMO_MENSAL_RECONSTRUCAO = float(os.getenv("RESUMO_MENSAL_RECONSTRUCAO", "86400"))
+
+# Cache de leitura dos repositórios (TTL em segundos; 0 desliga o cache da entidade)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")  # memory | redis
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+CACHE_TTL_CONTRIBUINTE = float(os.getenv("CACHE_TTL_CONTRIBUINTE", "300"))
+CACHE_TTL_ENDERECO = float(os.getenv("CACHE_TTL_ENDERECO", "300"))
+CACHE_TTL_DANFE = float(os.getenv("CACHE_TTL_DANFE", "30"))
+CACHE_TTL_CONTAGEM = float(os.getenv("CACHE_TTL_CONTAGEM", "30"))
+
+# Invalidação do cache por alterações nos dados (por cnpj e por entidade):
+# local = só as escritas feitas por este processo; tabela = log nota_fiscal.alteracao preenchido por triggers,
+# lido a cada CACHE_INVALIDACAO_INTERVALO segundos (todos os processos, réplicas e escritas fora da API)
+CACHE_INVALIDACAO = os.getenv("CACHE_INVALIDACAO", "local")  # local | tabela
+CACHE_INVALIDACAO_INTERVALO = float(os.getenv("CACHE_INVALIDACAO_INTERVALO", "1"))
+CACHE_INVALIDACAO_LOTE = int(os.getenv("CACHE_INVALIDACAO_LOTE", "1000"))
+# Segundos em que um id pulado do log (transação ainda aberta) continua sendo procurado
+CACHE_INVALIDACAO_ESPERA = float(os.getenv("CACHE_INVALIDACAO_ESPERA", "30"))
+
+# Limpeza do log nota_fiscal.alteracao, que os triggers do setup preenchem qualquer que seja CACHE_INVALIDACAO:
+# a cada ALTERACAO_RETENCAO segundos apaga o registrado até a limpeza anterior (com RESUMO_MENSAL_ATIVO, nunca além
+# da marca do resumo). ALTERACAO_RETENCAO=0 desliga a limpeza (banco sem os triggers)
+ALTERACAO_RETENCAO = float(os.getenv("ALTERACAO_RETENCAO", "3600"))
+
+# Consultas persistidas (APQ): documentos parseados/validados em LRU e manifesto opcional carregado no startup
+PERSISTED_QUERIES_MAX_ENTRIES = int(os.getenv("PERSISTED_QUERIES_MAX_ENTRIES", "1000"))
+PERSISTED_QUERIES_MANIFEST = os.getenv("PERSISTED_QUERIES_MANIFEST")
+PERSISTED_QUERIES_ALLOW_LIST_ONLY = os.getenv("PERSISTED_QUERIES_ALLOW_LIST_ONLY", "false").lower() == "true"
+
+# Limites da análise de custo das consultas (documentos acima deles são rejeitados antes de executar SQL)
+QUERY_MAX_COST = int(os.getenv("QUERY_MAX_COST", "200"))
+QUERY_MAX_DEPTH = int(os.getenv("QUERY_MAX_DEPTH", "10"))
+QUERY_MAX_ALIASES = int(os.getenv("QUERY_MAX_ALIASES", "15"))
+
+# Métricas Prometheus em /metrics (pool, SQL por builder, resolvers e operações GraphQL)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+# O label `operation` vem do operationName do cliente: têm série própria as operações do manifesto de consultas
+# persistidas, as de METRICS_OPERACOES (separadas por vírgula) e os primeiros METRICS_MAX_OPERACOES outros nomes
+# vistos; o resto é contado como "outra"
+METRICS_OPERACOES = [nome.strip() for nome in os.getenv("METRICS_OPERACOES", "").split(",") if nome.strip()]
+METRICS_MAX_OPERACOES = int(os.getenv("METRICS_MAX_OPERACOES", "100"))
+
+# Respostas do /graphql: codificador JSON (auto | orjson | msgspec | json) e compressões aceitas, em ordem
+# de preferência (zstd | br | gzip; vazio desliga), aplicadas conforme o Accept-Encoding a partir de
+# GRAPHQL_COMPRESSION_MIN_BYTES
+GRAPHQL_JSON_ENCODER = os.getenv("GRAPHQL_JSON_ENCODER", "auto")
+GRAPHQL_COMPRESSION = [
+    encoding.strip() for encoding in os.getenv("GRAPHQL_COMPRESSION", "zstd,br,gzip").split(",") if encoding.strip()
+]
+GRAPHQL_COMPRESSION_MIN_BYTES = int(os.getenv("GRAPHQL_COMPRESSION_MIN_BYTES", "1024"))
+
+# Entrega incremental (@defer/@stream) em multipart/mixed. Listas com @stream leem do cursor no servidor,
+# GRAPHQL_STREAM_FETCH_SIZE linhas por round-trip
+GRAPHQL_INCREMENTAL_DELIVERY = os.getenv("GRAPHQL_INCREMENTAL_DELIVERY", "true").lower() == "true"
+GRAPHQL_STREAM_FETCH_SIZE = int(os.getenv("GRAPHQL_STREAM_FETCH_SIZE", "20"))
+
+# Assinatura danfeEmitida (WebSocket): um leitor por processo busca as novas danfes a cada DANFE_EMITIDA_INTERVALO
+# segundos, até DANFE_EMITIDA_LOTE por consulta; cada assinante tem uma fila de DANFE_EMITIDA_FILA danfes
+DANFE_EMITIDA_ATIVO = os.getenv("DANFE_EMITIDA_ATIVO", "true").lower() == "true"
+DANFE_EMITIDA_INTERVALO = float(os.getenv("DANFE_EMITIDA_INTERVALO", "1"))
+DANFE_EMITIDA_LOTE = int(os.getenv("DANFE_EMITIDA_LOTE", "500"))
+DANFE_EMITIDA_FILA = int(os.getenv("DANFE_EMITIDA_FILA", "1000"))
+# Segundos em que um id_danfe pulado (transação ainda aberta) continua sendo procurado
+DANFE_EMITIDA_ESPERA = float(os.getenv("DANFE_EMITIDA_ESPERA", "30"))
+
 
 # Validação mínima
-if not all([DB_USER, DB_PASSWORD, DB_HOST, DB_SERVICE]):
+if DB_BACKEND not in ("oracle", "postgresql", "sqlite"):
+    raise RuntimeError(f"DB_BACKEND não suportado: {DB_BACKEND}")
+if DB_BACKEND == "sqlite" and not DB_URL:
+    raise RuntimeError("DB_URL obrigatória com DB_BACKEND=sqlite")
+if not DB_URL and not all([DB_USER, DB_PASSWORD, DB_HOST, DB_SERVICE]):
     raise RuntimeError("Variáveis de ambiente do banco não configuradas corretamente")
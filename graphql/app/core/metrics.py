@@ -0,0 +1,133 @@
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy.pool import Pool
+
+from app.core import config
+
+# Builder usado quando o statement não foi marcado (ex.: ping, SQL avulso)
+UNLABELED = "outros"
+
+# Label das operações sem nome e das que excedem o limite de operações distintas
+ANONYMOUS_OPERATION = "anonima"
+OTHER_OPERATION = "outra"
+# Nomes maiores que isso não viram série (o operationName é livre)
+_MAX_OPERATION_NAME = 100
+
+# Esperas por conexão costumam ficar abaixo de 1 ms; os buckets padrão começam em 5 ms
+_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30)
+_ROWS_BUCKETS = (0, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000, 50000)
+
+
+class _PoolCollector(Collector):
+    """
+    Estado atual dos pools lido na hora da coleta (/metrics), sem custo no caminho das consultas
+    """
+
+    def __init__(self):
+        self._pools: dict[str, Callable[[], Pool]] = {}
+
+    def register(self, name: str, pool: Callable[[], Pool]) -> None:
+        # Função, e não o pool: engine.dispose() recria o pool
+        self._pools[name] = pool
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        size = GaugeMetricFamily("db_pool_size", "Tamanho configurado do pool", labels=["pool"])
+        checked_out = GaugeMetricFamily("db_pool_checked_out", "Conexões em uso", labels=["pool"])
+        overflow = GaugeMetricFamily("db_pool_overflow", "Conexões além de pool_size (overflow)", labels=["pool"])
+
+        for name, get_pool in self._pools.items():
+            pool = get_pool()
+            size.add_metric([name], pool.size())
+            checked_out.add_metric([name], pool.checkedout())
+            overflow.add_metric([name], max(pool.overflow(), 0))
+
+        yield from (size, checked_out, overflow)
+
+
+class Metrics:
+    """
+    Métricas Prometheus do serviço em um registry próprio, expostas em /metrics.
+    Cada registro é um incremento ou observação em memória; nada é calculado até a coleta
+    """
+
+    def __init__(self, enabled: bool = True, operations: Iterable[str] = (), max_operations: int = 100):
+        self.enabled = enabled
+        self.max_operations = max_operations
+        self._known_operations = set(operations)
+        self._seen_operations: set[str] = set()
+        self.registry = CollectorRegistry()
+        self.pools = _PoolCollector()
+        self.registry.register(self.pools)
+
+        self.pool_checkouts = Counter(
+            "db_pool_checkouts", "Checkouts de conexão do pool", ["pool"], registry=self.registry
+        )
+        self.pool_wait = Histogram(
+            "db_pool_wait_seconds",
+            "Espera por uma conexão do pool",
+            ["pool"],
+            buckets=_WAIT_BUCKETS,
+            registry=self.registry,
+        )
+        self.pool_timeouts = Counter(
+            "db_pool_timeouts", "Esperas que estouraram pool_timeout", ["pool"], registry=self.registry
+        )
+        self.sql_duration = Histogram(
+            "db_sql_duration_seconds", "Tempo de execução do SQL por builder", ["builder"], registry=self.registry
+        )
+        self.sql_rows = Histogram(
+            "db_sql_rows",
+            "Linhas devolvidas por consulta, por builder",
+            ["builder"],
+            buckets=_ROWS_BUCKETS,
+            registry=self.registry,
+        )
+        self.resolver_duration = Histogram(
+            "graphql_resolver_duration_seconds",
+            "Latência dos resolvers assíncronos por campo",
+            ["field"],
+            registry=self.registry,
+        )
+        self.requests = Counter(
+            "graphql_requests", "Operações GraphQL", ["operation", "type", "status"], registry=self.registry
+        )
+        self.request_duration = Histogram(
+            "graphql_request_duration_seconds", "Duração das operações GraphQL", ["operation"], registry=self.registry
+        )
+
+    def register_operations(self, names: Iterable[str]) -> None:
+        # Operações conhecidas (ex.: do manifesto de consultas persistidas), fora do limite de max_operations
+        self._known_operations.update(names)
+
+    def operation(self, name: str | None) -> str:
+        """
+        Label `operation` com cardinalidade limitada: o nome vem do cliente, e cada valor novo é uma série a mais.
+        Só as operações conhecidas e as primeiras `max_operations` outras recebem série própria
+        """
+        if name is None:
+            return ANONYMOUS_OPERATION
+        if name in self._known_operations or name in self._seen_operations:
+            return name
+        if len(self._seen_operations) < self.max_operations and len(name) <= _MAX_OPERATION_NAME:
+            self._seen_operations.add(name)
+            return name
+        return OTHER_OPERATION
+
+    def rows(self, statement: Any, count: int) -> None:
+        if self.enabled:
+            builder = statement.get_execution_options().get("builder", UNLABELED)
+            self.sql_rows.labels(builder).observe(count)
+
+    def render(self) -> tuple[bytes, str]:
+        return generate_latest(self.registry), CONTENT_TYPE_LATEST
+
+
+metrics = Metrics(
+    enabled=config.METRICS_ENABLED,
+    operations=config.METRICS_OPERACOES,
+    max_operations=config.METRICS_MAX_OPERACOES,
+)
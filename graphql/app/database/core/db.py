@@ -1,6 +1,14 @@
+import asyncio
+import math
+import time
+from collections.abc import Callable
 from contextlib import asynccontextmanager
 
+from fastapi import Request, Response
+from fastapi.requests import HTTPConnection
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
@@ -8,28 +16,88 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core import config
+from app.core.metrics import UNLABELED, metrics
+from app.database.core.instrumented_pool import InstrumentedPool
+from app.database.core.replica_router import Replica, ReplicaRouter
 
 
 class Base(DeclarativeBase):
     pass
 
 
-DATABASE_URL = (
-    f"oracle+oracledb_async://{config.DB_USER}:{config.DB_PASSWORD}"
-    f"@{config.DB_HOST}:{config.DB_PORT}/"
-    f"?service_name={config.DB_SERVICE}"
-)
+# Driver assíncrono de cada banco (DB_BACKEND); o SQLite exige DB_URL
+_DATABASE_URLS = {
+    "oracle": (
+        f"oracle+oracledb_async://{config.DB_USER}:{config.DB_PASSWORD}"
+        f"@{config.DB_HOST}:{config.DB_PORT}/"
+        f"?service_name={config.DB_SERVICE}"
+    ),
+    "postgresql": (
+        f"postgresql+asyncpg://{config.DB_USER}:{config.DB_PASSWORD}"
+        f"@{config.DB_HOST}:{config.DB_PORT}/{config.DB_SERVICE}"
+    ),
+}
 
+DATABASE_URL = config.DB_URL or _DATABASE_URLS[config.DB_BACKEND]
 
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=False,
-    pool_size=10,
-    max_overflow=20,
-    pool_timeout=30,
-    pool_recycle=1800,
-    pool_pre_ping=True,
-)
+
+def _apply_fetch_options(conn, cursor, statement, parameters, context, executemany):
+    # Statements podem ajustar o tamanho do fetch do driver via execution_options(arraysize=..., prefetchrows=...)
+    options = context.execution_options if context is not None else {}
+    if "arraysize" in options:
+        cursor.arraysize = options["arraysize"]
+    if "prefetchrows" in options and conn.dialect.name == "oracle":
+        # O cursor assíncrono do SQLAlchemy só repassa arraysize; prefetchrows vai direto no cursor do oracledb
+        setattr(getattr(cursor, "_cursor", cursor), "prefetchrows", options["prefetchrows"])
+
+
+def _start_sql_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.sql_start = time.perf_counter()
+
+
+def _record_sql_duration(conn, cursor, statement, parameters, context, executemany):
+    # Builder gravado no statement pelo decorator @instrumented dos builders
+    if context is not None and hasattr(context, "sql_start"):
+        builder = context.execution_options.get("builder", UNLABELED)
+        metrics.sql_duration.labels(builder).observe(time.perf_counter() - context.sql_start)
+
+
+def _create_engine(url: str, label: str) -> AsyncEngine:
+    # Mesma configuração de pool para o primário e para as réplicas
+    new_engine = create_async_engine(
+        url,
+        echo=False,
+        pool_size=10,
+        max_overflow=20,
+        pool_timeout=30,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+        **({"poolclass": InstrumentedPool} if config.METRICS_ENABLED else {}),
+    )
+    event.listen(new_engine.sync_engine, "before_cursor_execute", _apply_fetch_options)
+
+    if config.METRICS_ENABLED:
+        # Checkouts pelos eventos do pool; espera e timeouts no InstrumentedPool; uso e overflow lidos na coleta
+        new_engine.sync_engine.pool.label = label
+        metrics.pools.register(label, lambda: new_engine.sync_engine.pool)
+        checkouts = metrics.pool_checkouts.labels(label)
+        event.listen(new_engine.sync_engine, "checkout", lambda *args: checkouts.inc())
+        event.listen(new_engine.sync_engine, "before_cursor_execute", _start_sql_timer)
+        event.listen(new_engine.sync_engine, "after_cursor_execute", _record_sql_duration)
+
+    if new_engine.dialect.name == "sqlite":
+        database = new_engine.url.database
+
+        @event.listens_for(new_engine.sync_engine, "connect")
+        def _attach_schema(dbapi_connection, connection_record):
+            # O próprio arquivo responde pelo schema nota_fiscal usado nas consultas
+            dbapi_connection.execute(f"ATTACH DATABASE '{database}' AS nota_fiscal")
+
+    return new_engine
+
+
+engine = _create_engine(DATABASE_URL, label="primario")
 
 SessionFactory = async_sessionmaker(
     bind=engine,
@@ -37,17 +105,138 @@ SessionFactory = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Leituras (consultas GraphQL e exportações) nas réplicas; escritas sempre no primário (SessionFactory)
+replica_router = ReplicaRouter(
+    primary=SessionFactory,
+    replicas=[
+        Replica(name=f"replica-{i}", engine=_create_engine(url, label=f"replica-{i}"))
+        for i, url in enumerate(config.DB_REPLICA_URLS)
+    ],
+    strategy=config.DB_REPLICA_STRATEGY,
+    health_interval=config.DB_REPLICA_HEALTH_INTERVAL,
+    health_timeout=config.DB_REPLICA_HEALTH_TIMEOUT,
+    max_failures=config.DB_REPLICA_MAX_FAILURES,
+)
+
+# Cookie do read-your-writes: enquanto existir, as leituras do cliente vão ao primário
+READ_YOUR_WRITES_COOKIE = "nf_leitura_primario"
+
+
+class LazySession:
+    """
+    Sessão da requisição GraphQL com checkout preguiçoso: a conexão do pool só é obtida no primeiro
+    `execute` e é devolvida por `close()` assim que a execução termina (ver SessionReleaseExtension).
+    Resolvers e DataLoaders rodam concorrentemente, mas uma AsyncSession não aceita operações
+    simultâneas, então os comandos da sessão compartilhada são serializados.
+    Com `short_lived`, cada `execute` usa uma sessão própria, liberada logo em seguida,
+    e campos irmãos podem consultar o banco em paralelo.
+    Sessões próprias (`short_lived`, `dedicated` e `root_field`) são limitadas a `max_connections` por requisição.
+    `factory` abre as sessões de leitura (réplica); depois de `pin_primary()` elas passam a vir de `primary`
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], AsyncSession],
+        short_lived: bool = False,
+        root_field_sessions: bool = False,
+        max_connections: int = 3,
+        primary: Callable[[], AsyncSession] | None = None,
+    ):
+        self._factory = factory
+        self._primary = primary or factory
+        self._short_lived = short_lived
+        self._root_field_sessions = root_field_sessions
+        self._session: AsyncSession | None = None
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(max_connections)
+
+    async def execute(self, *args, **kwargs):
+        if self._short_lived:
+            async with self.dedicated() as session:
+                return await session.execute(*args, **kwargs)
+
+        async with self._lock:
+            if self._session is None:
+                self._session = self._factory()
+            return await self._session.execute(*args, **kwargs)
+
+    async def close(self) -> None:
+        async with self._lock:
+            if self._session is not None:
+                session, self._session = self._session, None
+                await session.close()
+
+    async def pin_primary(self) -> None:
+        """
+        Read-your-writes: depois de uma escrita, as leituras restantes da requisição vão ao primário
+        """
+        async with self._lock:
+            self._factory = self._primary
+            if self._session is not None:
+                session, self._session = self._session, None
+                await session.close()
+
+    @asynccontextmanager
+    async def dedicated(self):
+        """
+        Sessão própria, em outra conexão do pool, para consultas que rodam em paralelo com as demais
+        """
+        async with self._semaphore:
+            async with self._factory() as session:
+                yield session
+
+    @asynccontextmanager
+    async def root_field(self):
+        """
+        Sessão de um campo raiz. Com `root_field_sessions`, cada campo raiz usa a própria conexão
+        e campos raiz independentes (danfes, contribuintes, enderecos) consultam o banco em paralelo
+        """
+        if not self._root_field_sessions:
+            yield self
+            return
+
+        async with self.dedicated() as session:
+            yield session
+
 
 @asynccontextmanager
 async def get_db_session():
+    # Primário: escritas, ingestão e jobs
     async with SessionFactory() as session:
         yield session
 
 
-async def get_graphql_context():
-    async with get_db_session() as session:
-        yield {"session": session}
+@asynccontextmanager
+async def get_read_session(request: Request | None = None):
+    async with read_session_factory(request)() as session:
+        yield session
+
+
+def read_session_factory(request: HTTPConnection | None = None) -> Callable[[], AsyncSession]:
+    # Réplica escolhida pelo replica_router (primário se o cliente acabou de gravar)
+    return SessionFactory if _reads_from_primary(request) else replica_router.session
+
+
+def mark_write(response: Response) -> None:
+    """
+    Read-your-writes entre requisições: por DB_READ_YOUR_WRITES_SECONDS, as leituras do cliente
+    vão ao primário, enquanto as réplicas ainda não receberam a escrita
+    """
+    if replica_router.replicas and config.DB_READ_YOUR_WRITES_SECONDS > 0:
+        max_age = math.ceil(config.DB_READ_YOUR_WRITES_SECONDS)
+        response.set_cookie(READ_YOUR_WRITES_COOKIE, "1", max_age=max_age, httponly=True, samesite="lax")
+
+
+def _reads_from_primary(request: HTTPConnection | None) -> bool:
+    return request is not None and READ_YOUR_WRITES_COOKIE in request.cookies
+
+
+def startup_db() -> None:
+    # Health check periódico das réplicas (nada a fazer sem réplicas configuradas)
+    replica_router.start()
 
 
 async def shutdown_db():
+    await replica_router.stop()
+    await replica_router.dispose()
     await engine.dispose()
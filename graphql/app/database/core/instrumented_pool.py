@@ -0,0 +1,32 @@
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import metrics
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Pool assíncrono padrão que mede a espera por conexão (do pedido até o checkout) e os timeouts.
+    Os eventos de pool do SQLAlchemy só disparam depois que a conexão foi obtida, por isso a espera é medida aqui
+    """
+
+    label = "primario"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            metrics.pool_timeouts.labels(self.label).inc()
+            raise
+
+        metrics.pool_wait.labels(self.label).observe(time.perf_counter() - start)
+        return connection
+
+    def recreate(self) -> "InstrumentedPool":
+        # engine.dispose() recria o pool: o nome usado nas métricas acompanha
+        pool = super().recreate()
+        pool.label = self.label
+        return pool
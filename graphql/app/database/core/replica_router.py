@@ -0,0 +1,114 @@
+import asyncio
+import itertools
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+
+class Replica:
+
+    def __init__(self, name: str, engine: AsyncEngine):
+        self.name = name
+        self.engine = engine
+        self.factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        self.healthy = True
+        self.failures = 0
+
+    def busy(self) -> int:
+        # Conexões do pool da réplica em uso neste momento
+        return self.engine.sync_engine.pool.checkedout()
+
+
+class ReplicaRouter:
+    """
+    Distribui as sessões de leitura entre as réplicas saudáveis (`least_busy`: menos conexões em uso;
+    `round_robin`: uma de cada vez). Sem réplicas, ou com todas fora de rotação, as leituras vão ao primário.
+    O health check tira de rotação a réplica com `max_failures` falhas seguidas e a devolve no primeiro sucesso
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker[AsyncSession],
+        replicas: list[Replica],
+        strategy: str = "least_busy",
+        health_interval: float = 5,
+        health_timeout: float = 2,
+        max_failures: int = 2,
+    ):
+        if strategy not in ("least_busy", "round_robin"):
+            raise ValueError(f"Estratégia de réplicas desconhecida: {strategy}")
+
+        self.primary = primary
+        self.replicas = replicas
+        self.strategy = strategy
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self.max_failures = max_failures
+        self._counter = itertools.count()
+        self._task: asyncio.Task | None = None
+
+    def session(self) -> AsyncSession:
+        replica = self.choose()
+        return replica.factory() if replica is not None else self.primary()
+
+    def choose(self) -> Replica | None:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+
+        # Rotação a cada escolha: no least_busy, empates também se alternam entre as réplicas
+        start = next(self._counter) % len(healthy)
+        rotated = healthy[start:] + healthy[:start]
+        if self.strategy == "round_robin":
+            return rotated[0]
+        return min(rotated, key=Replica.busy)
+
+    def start(self) -> None:
+        if self.replicas and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="replica-health-check")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    async def check(self) -> None:
+        await asyncio.gather(*(self._check(replica) for replica in self.replicas))
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.health_interval)
+
+    async def _check(self, replica: Replica) -> None:
+        try:
+            await asyncio.wait_for(self._ping(replica), timeout=self.health_timeout)
+        except Exception as e:
+            replica.failures += 1
+            if replica.healthy and replica.failures >= self.max_failures:
+                replica.healthy = False
+                logger.warning("Réplica %s fora de rotação após %d falhas: %s", replica.name, replica.failures, e)
+            return
+
+        if not replica.healthy:
+            logger.info("Réplica %s de volta à rotação", replica.name)
+        replica.healthy = True
+        replica.failures = 0
+
+    @staticmethod
+    async def _ping(replica: Replica) -> None:
+        # Ping nativo do dialeto (ex.: SELECT 1 FROM DUAL no Oracle) em uma conexão do pool da réplica
+        async with replica.engine.connect() as connection:
+            await connection.run_sync(lambda sync: sync.dialect.do_ping(sync.connection.dbapi_connection))
@@ -3,10 +3,34 @@
 -- Tabela contribuinte
 CREATE TABLE nota_fiscal.contribuinte (
     cnpj_contribuinte VARCHAR2(20) PRIMARY KEY,
-    nm_fantasia VARCHAR2(200) NOT NULL
+    nm_fantasia VARCHAR2(200) NOT NULL,
+    -- Nome sem acentos e em maiúsculas, usado na busca por prefixo
+    nm_fantasia_busca VARCHAR2(200) GENERATED ALWAYS AS (
+        UPPER(TRANSLATE(
+            nm_fantasia,
+            'áàâãäéèêëíìîïóòôõöúùûüçÁÀÂÃÄÉÈÊËÍÌÎÏÓÒÔÕÖÚÙÛÜÇ',
+            'aaaaaeeeeiiiiooooouuuucAAAAAEEEEIIIIOOOOOUUUUC'
+        ))
+    ) VIRTUAL
 );
 GRANT SELECT, INSERT, UPDATE, DELETE ON nota_fiscal.contribuinte TO PUBLIC;
 
+-- Índice da busca por prefixo (modo PREFIXO)
+CREATE INDEX nota_fiscal.ix_contribuinte_nm_busca ON nota_fiscal.contribuinte (nm_fantasia_busca);
+
+-- Índice Oracle Text da busca por palavras (modo TEXTO), sem diferenciar acentos e com prefixos indexados
+BEGIN
+    CTX_DDL.CREATE_PREFERENCE('nota_fiscal.nm_fantasia_lexer', 'BASIC_LEXER');
+    CTX_DDL.SET_ATTRIBUTE('nota_fiscal.nm_fantasia_lexer', 'BASE_LETTER', 'YES');
+    CTX_DDL.CREATE_PREFERENCE('nota_fiscal.nm_fantasia_wordlist', 'BASIC_WORDLIST');
+    CTX_DDL.SET_ATTRIBUTE('nota_fiscal.nm_fantasia_wordlist', 'PREFIX_INDEX', 'TRUE');
+    CTX_DDL.SET_ATTRIBUTE('nota_fiscal.nm_fantasia_wordlist', 'SUBSTRING_INDEX', 'TRUE');
+END;
+/
+CREATE INDEX nota_fiscal.ix_contribuinte_nm_texto ON nota_fiscal.contribuinte (nm_fantasia)
+    INDEXTYPE IS CTXSYS.CONTEXT
+    PARAMETERS ('LEXER nota_fiscal.nm_fantasia_lexer WORDLIST nota_fiscal.nm_fantasia_wordlist SYNC (ON COMMIT)');
+
 -- Tabela danfe
 CREATE TABLE nota_fiscal.danfe (
     id_danfe NUMBER GENERATED BY DEFAULT ON NULL AS IDENTITY PRIMARY KEY,
@@ -26,12 +50,175 @@ CREATE TABLE nota_fiscal.endereco (
 );
 GRANT SELECT, INSERT, UPDATE, DELETE ON nota_fiscal.endereco TO PUBLIC;
 
+-- Índice da consulta danfes (contribuinte + período de emissão)
+CREATE INDEX nota_fiscal.ix_danfe_cnpj_emissao ON nota_fiscal.danfe (cnpj_contribuinte, data_emissao);
+
+-- Totais mensais de danfe por contribuinte e endereço (caminho rápido da consulta danfeAgregado, AGREGADO_USAR_MV=true).
+-- Atualizada sob demanda pelo job abaixo; entre uma atualização e outra, os totais podem estar defasados.
+-- atomic_refresh => TRUE: a recarga (DELETE + INSERT) roda numa transação e as leituras continuam vendo os totais
+-- anteriores até o commit. Com FALSE, a view seria truncada e ficaria vazia durante a recarga
+CREATE MATERIALIZED VIEW nota_fiscal.mv_danfe_mensal
+    BUILD IMMEDIATE
+    REFRESH COMPLETE ON DEMAND
+    ENABLE QUERY REWRITE
+AS
+SELECT d.cnpj_contribuinte,
+    TRUNC(d.data_emissao, 'MM') AS mes_emissao,
+    EXTRACT(YEAR FROM d.data_emissao) AS ano,
+    EXTRACT(MONTH FROM d.data_emissao) AS mes,
+    e.uf,
+    e.municipio,
+    COUNT(*) AS quantidade,
+    SUM(d.valor_total) AS soma,
+    MIN(d.valor_total) AS minimo,
+    MAX(d.valor_total) AS maximo
+FROM nota_fiscal.danfe d
+LEFT JOIN nota_fiscal.endereco e ON e.cnpj_contribuinte = d.cnpj_contribuinte
+GROUP BY d.cnpj_contribuinte,
+    TRUNC(d.data_emissao, 'MM'),
+    EXTRACT(YEAR FROM d.data_emissao),
+    EXTRACT(MONTH FROM d.data_emissao),
+    e.uf,
+    e.municipio;
+GRANT SELECT ON nota_fiscal.mv_danfe_mensal TO PUBLIC;
+
+CREATE INDEX nota_fiscal.ix_mv_danfe_mensal_cnpj ON nota_fiscal.mv_danfe_mensal (cnpj_contribuinte, mes_emissao);
+CREATE INDEX nota_fiscal.ix_mv_danfe_mensal_uf ON nota_fiscal.mv_danfe_mensal (uf, municipio, mes_emissao);
+
+BEGIN
+    DBMS_SCHEDULER.CREATE_JOB(
+        job_name => 'nota_fiscal.job_refresh_mv_danfe_mensal',
+        job_type => 'PLSQL_BLOCK',
+        job_action => 'BEGIN DBMS_MVIEW.REFRESH(''nota_fiscal.mv_danfe_mensal'', ''C'', atomic_refresh => TRUE); END;',
+        repeat_interval => 'FREQ=HOURLY',
+        enabled => TRUE
+    );
+END;
+/
+
+-- Resumo mensal de danfes por contribuinte, mantido pelo job DanfeResumoJob (RESUMO_MENSAL_ATIVO=true):
+-- a cada ciclo recalcula os contribuintes com danfes no log de alterações (nota_fiscal.alteracao, abaixo)
+-- acima da marca d'água registrada em danfe_resumo_controle. O primeiro ciclo, com a marca ainda nula, constrói o
+-- resumo inteiro a partir das danfes existentes; até lá a agregação não o usa
+CREATE TABLE nota_fiscal.danfe_resumo_mensal (
+    cnpj_contribuinte VARCHAR2(20) NOT NULL,
+    ano NUMBER(4) NOT NULL,
+    mes NUMBER(2) NOT NULL,
+    mes_emissao DATE NOT NULL,
+    quantidade NUMBER NOT NULL,
+    soma NUMBER(16,2) NOT NULL,
+    minimo NUMBER(12,2) NOT NULL,
+    maximo NUMBER(12,2) NOT NULL,
+    CONSTRAINT pk_danfe_resumo_mensal PRIMARY KEY (cnpj_contribuinte, ano, mes)
+);
+GRANT SELECT, INSERT, UPDATE, DELETE ON nota_fiscal.danfe_resumo_mensal TO PUBLIC;
+
+CREATE INDEX nota_fiscal.ix_danfe_resumo_mensal_mes ON nota_fiscal.danfe_resumo_mensal (cnpj_contribuinte, mes_emissao);
+
+CREATE TABLE nota_fiscal.danfe_resumo_controle (
+    nome VARCHAR2(50) PRIMARY KEY,
+    -- Nula até a primeira construção do resumo, feita pelo job
+    ultimo_id_alteracao NUMBER,
+    atualizado_em TIMESTAMP
+);
+GRANT SELECT, INSERT, UPDATE, DELETE ON nota_fiscal.danfe_resumo_controle TO PUBLIC;
+
+INSERT INTO nota_fiscal.danfe_resumo_controle (nome) VALUES ('danfe_resumo_mensal');
+COMMIT;
+
+-- Log de alterações para a invalidação do cache (CACHE_INVALIDACAO=tabela) e o resumo mensal: uma linha por registro
+-- inserido, alterado ou excluído, gravada pelos triggers abaixo na mesma transação da escrita e lida pelo
+-- TabelaAlteracaoNotifier e pelo DanfeResumoJob acima da marca d'água (id_alteracao). Os triggers gravam mesmo com
+-- CACHE_INVALIDACAO=local; o AlteracaoLimpezaJob apaga as linhas mais antigas que ALTERACAO_RETENCAO segundos
+CREATE TABLE nota_fiscal.alteracao (
+    id_alteracao NUMBER GENERATED BY DEFAULT ON NULL AS IDENTITY PRIMARY KEY,
+    entidade VARCHAR2(20) NOT NULL,
+    cnpj_contribuinte VARCHAR2(20) NOT NULL,
+    data_alteracao TIMESTAMP DEFAULT SYSTIMESTAMP NOT NULL
+);
+GRANT SELECT, INSERT, DELETE ON nota_fiscal.alteracao TO PUBLIC;
+
+-- Uma alteração de cnpj registra o antigo e o novo
+CREATE OR REPLACE TRIGGER nota_fiscal.trg_contribuinte_alteracao
+    AFTER INSERT OR UPDATE OR DELETE ON nota_fiscal.contribuinte
+    FOR EACH ROW
+BEGIN
+    IF :NEW.cnpj_contribuinte IS NOT NULL THEN
+        INSERT INTO nota_fiscal.alteracao (entidade, cnpj_contribuinte) VALUES ('contribuinte', :NEW.cnpj_contribuinte);
+    END IF;
+    IF :OLD.cnpj_contribuinte IS NOT NULL
+        AND (:NEW.cnpj_contribuinte IS NULL OR :NEW.cnpj_contribuinte <> :OLD.cnpj_contribuinte) THEN
+        INSERT INTO nota_fiscal.alteracao (entidade, cnpj_contribuinte) VALUES ('contribuinte', :OLD.cnpj_contribuinte);
+    END IF;
+END;
+/
+
+CREATE OR REPLACE TRIGGER nota_fiscal.trg_endereco_alteracao
+    AFTER INSERT OR UPDATE OR DELETE ON nota_fiscal.endereco
+    FOR EACH ROW
+BEGIN
+    IF :NEW.cnpj_contribuinte IS NOT NULL THEN
+        INSERT INTO nota_fiscal.alteracao (entidade, cnpj_contribuinte) VALUES ('endereco', :NEW.cnpj_contribuinte);
+    END IF;
+    IF :OLD.cnpj_contribuinte IS NOT NULL
+        AND (:NEW.cnpj_contribuinte IS NULL OR :NEW.cnpj_contribuinte <> :OLD.cnpj_contribuinte) THEN
+        INSERT INTO nota_fiscal.alteracao (entidade, cnpj_contribuinte) VALUES ('endereco', :OLD.cnpj_contribuinte);
+    END IF;
+END;
+/
+
+CREATE OR REPLACE TRIGGER nota_fiscal.trg_danfe_alteracao
+    AFTER INSERT OR UPDATE OR DELETE ON nota_fiscal.danfe
+    FOR EACH ROW
+BEGIN
+    IF :NEW.cnpj_contribuinte IS NOT NULL THEN
+        INSERT INTO nota_fiscal.alteracao (entidade, cnpj_contribuinte) VALUES ('danfe', :NEW.cnpj_contribuinte);
+    END IF;
+    IF :OLD.cnpj_contribuinte IS NOT NULL
+        AND (:NEW.cnpj_contribuinte IS NULL OR :NEW.cnpj_contribuinte <> :OLD.cnpj_contribuinte) THEN
+        INSERT INTO nota_fiscal.alteracao (entidade, cnpj_contribuinte) VALUES ('danfe', :OLD.cnpj_contribuinte);
+    END IF;
+END;
+/
+
+/*
+-- Opcional: tabela danfe particionada por ano de emissão (uma partição criada automaticamente por ano),
+-- permitindo partition pruning no filtro data_emissao >= :inicio AND data_emissao < :fim
+CREATE TABLE nota_fiscal.danfe (
+    id_danfe NUMBER GENERATED BY DEFAULT ON NULL AS IDENTITY PRIMARY KEY,
+    cnpj_contribuinte VARCHAR2(20) REFERENCES nota_fiscal.contribuinte(cnpj_contribuinte) NOT NULL,
+    numero VARCHAR2(15) UNIQUE NOT NULL,
+    valor_total NUMBER(12,2) NOT NULL,
+    data_emissao DATE NOT NULL
+)
+PARTITION BY RANGE (data_emissao) INTERVAL (NUMTOYMINTERVAL(1, 'YEAR'))
+(PARTITION p_anterior_2020 VALUES LESS THAN (DATE '2020-01-01'));
+GRANT SELECT, INSERT, UPDATE, DELETE ON nota_fiscal.danfe TO PUBLIC;
+
+CREATE INDEX nota_fiscal.ix_danfe_cnpj_emissao ON nota_fiscal.danfe (cnpj_contribuinte, data_emissao) LOCAL;
+*/
+
 /*
 ALTER USER nota_fiscal QUOTA UNLIMITED ON USERS;
 
+BEGIN
+    DBMS_SCHEDULER.DROP_JOB('nota_fiscal.job_refresh_mv_danfe_mensal');
+END;
+/
+DROP MATERIALIZED VIEW nota_fiscal.mv_danfe_mensal;
+
+DROP TABLE nota_fiscal.alteracao;
+DROP TABLE nota_fiscal.danfe_resumo_controle;
+DROP TABLE nota_fiscal.danfe_resumo_mensal;
 DROP TABLE nota_fiscal.endereco;
 DROP TABLE nota_fiscal.danfe;
 DROP TABLE nota_fiscal.contribuinte;
+
+BEGIN
+    CTX_DDL.DROP_PREFERENCE('nota_fiscal.nm_fantasia_lexer');
+    CTX_DDL.DROP_PREFERENCE('nota_fiscal.nm_fantasia_wordlist');
+END;
+/
 */
 
 ---------------------------------------------
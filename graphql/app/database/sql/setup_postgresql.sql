@@ -0,0 +1,133 @@
+-- Estrutura equivalente ao setup.sql (Oracle) para DB_BACKEND=postgresql.
+-- Sem Oracle Text: a busca por palavras (modo TEXTO) fica indisponível; PREFIXO e CONTEM funcionam normalmente
+---------------------------------------------
+
+CREATE SCHEMA IF NOT EXISTS nota_fiscal;
+
+-- Tabela contribuinte
+CREATE TABLE nota_fiscal.contribuinte (
+    cnpj_contribuinte VARCHAR(20) PRIMARY KEY,
+    nm_fantasia VARCHAR(200) NOT NULL,
+    -- Nome sem acentos e em maiúsculas, usado na busca por prefixo
+    nm_fantasia_busca VARCHAR(200) GENERATED ALWAYS AS (
+        UPPER(TRANSLATE(
+            nm_fantasia,
+            'áàâãäéèêëíìîïóòôõöúùûüçÁÀÂÃÄÉÈÊËÍÌÎÏÓÒÔÕÖÚÙÛÜÇ',
+            'aaaaaeeeeiiiiooooouuuucAAAAAEEEEIIIIOOOOOUUUUC'
+        ))
+    ) STORED
+);
+
+-- Índice da busca por prefixo (modo PREFIXO); text_pattern_ops permite LIKE 'prefixo%' em qualquer collation
+CREATE INDEX ix_contribuinte_nm_busca ON nota_fiscal.contribuinte (nm_fantasia_busca text_pattern_ops);
+
+-- Tabela danfe
+CREATE TABLE nota_fiscal.danfe (
+    id_danfe BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    cnpj_contribuinte VARCHAR(20) NOT NULL REFERENCES nota_fiscal.contribuinte (cnpj_contribuinte),
+    numero VARCHAR(15) UNIQUE NOT NULL,
+    valor_total NUMERIC(12,2) NOT NULL,
+    data_emissao TIMESTAMP NOT NULL
+);
+
+-- Tabela endereco
+CREATE TABLE nota_fiscal.endereco (
+    cnpj_contribuinte VARCHAR(20) PRIMARY KEY REFERENCES nota_fiscal.contribuinte (cnpj_contribuinte),
+    logradouro VARCHAR(200) NOT NULL,
+    municipio VARCHAR(100) NOT NULL,
+    uf CHAR(2) NOT NULL
+);
+
+-- Índice da consulta danfes (contribuinte + período de emissão)
+CREATE INDEX ix_danfe_cnpj_emissao ON nota_fiscal.danfe (cnpj_contribuinte, data_emissao);
+
+-- Totais mensais de danfe por contribuinte e endereço (AGREGADO_USAR_MV=true).
+-- Atualizar com REFRESH MATERIALIZED VIEW CONCURRENTLY nota_fiscal.mv_danfe_mensal (cron, pg_cron etc.)
+CREATE MATERIALIZED VIEW nota_fiscal.mv_danfe_mensal AS
+SELECT d.cnpj_contribuinte,
+    DATE_TRUNC('month', d.data_emissao) AS mes_emissao,
+    EXTRACT(YEAR FROM d.data_emissao) AS ano,
+    EXTRACT(MONTH FROM d.data_emissao) AS mes,
+    e.uf,
+    e.municipio,
+    COUNT(*) AS quantidade,
+    SUM(d.valor_total) AS soma,
+    MIN(d.valor_total) AS minimo,
+    MAX(d.valor_total) AS maximo
+FROM nota_fiscal.danfe d
+LEFT JOIN nota_fiscal.endereco e ON e.cnpj_contribuinte = d.cnpj_contribuinte
+GROUP BY d.cnpj_contribuinte,
+    DATE_TRUNC('month', d.data_emissao),
+    EXTRACT(YEAR FROM d.data_emissao),
+    EXTRACT(MONTH FROM d.data_emissao),
+    e.uf,
+    e.municipio;
+
+CREATE UNIQUE INDEX ix_mv_danfe_mensal ON nota_fiscal.mv_danfe_mensal (cnpj_contribuinte, ano, mes, uf, municipio);
+CREATE INDEX ix_mv_danfe_mensal_mes ON nota_fiscal.mv_danfe_mensal (cnpj_contribuinte, mes_emissao);
+
+-- Resumo mensal de danfes por contribuinte, mantido pelo job DanfeResumoJob (RESUMO_MENSAL_ATIVO=true)
+-- a partir do log de alterações (nota_fiscal.alteracao, abaixo); o primeiro ciclo, com a marca ainda nula, constrói
+-- o resumo inteiro a partir das danfes existentes
+CREATE TABLE nota_fiscal.danfe_resumo_mensal (
+    cnpj_contribuinte VARCHAR(20) NOT NULL,
+    ano INTEGER NOT NULL,
+    mes INTEGER NOT NULL,
+    mes_emissao TIMESTAMP NOT NULL,
+    quantidade BIGINT NOT NULL,
+    soma NUMERIC(16,2) NOT NULL,
+    minimo NUMERIC(12,2) NOT NULL,
+    maximo NUMERIC(12,2) NOT NULL,
+    CONSTRAINT pk_danfe_resumo_mensal PRIMARY KEY (cnpj_contribuinte, ano, mes)
+);
+
+CREATE INDEX ix_danfe_resumo_mensal_mes ON nota_fiscal.danfe_resumo_mensal (cnpj_contribuinte, mes_emissao);
+
+CREATE TABLE nota_fiscal.danfe_resumo_controle (
+    nome VARCHAR(50) PRIMARY KEY,
+    -- Nula até a primeira construção do resumo, feita pelo job
+    ultimo_id_alteracao BIGINT,
+    atualizado_em TIMESTAMP
+);
+
+INSERT INTO nota_fiscal.danfe_resumo_controle (nome) VALUES ('danfe_resumo_mensal');
+
+-- Log de alterações para a invalidação do cache (CACHE_INVALIDACAO=tabela) e o resumo mensal, preenchido pelos
+-- triggers abaixo em qualquer modo e apagado pelo AlteracaoLimpezaJob (ALTERACAO_RETENCAO)
+CREATE TABLE nota_fiscal.alteracao (
+    id_alteracao BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    entidade VARCHAR(20) NOT NULL,
+    cnpj_contribuinte VARCHAR(20) NOT NULL,
+    data_alteracao TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Entidade no argumento do trigger; uma alteração de cnpj registra o antigo e o novo
+CREATE OR REPLACE FUNCTION nota_fiscal.registra_alteracao() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP <> 'DELETE' THEN
+        INSERT INTO nota_fiscal.alteracao (entidade, cnpj_contribuinte) VALUES (TG_ARGV[0], NEW.cnpj_contribuinte);
+    END IF;
+    IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND NEW.cnpj_contribuinte IS DISTINCT FROM OLD.cnpj_contribuinte) THEN
+        INSERT INTO nota_fiscal.alteracao (entidade, cnpj_contribuinte) VALUES (TG_ARGV[0], OLD.cnpj_contribuinte);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_contribuinte_alteracao AFTER INSERT OR UPDATE OR DELETE ON nota_fiscal.contribuinte
+    FOR EACH ROW EXECUTE FUNCTION nota_fiscal.registra_alteracao('contribuinte');
+CREATE TRIGGER trg_endereco_alteracao AFTER INSERT OR UPDATE OR DELETE ON nota_fiscal.endereco
+    FOR EACH ROW EXECUTE FUNCTION nota_fiscal.registra_alteracao('endereco');
+CREATE TRIGGER trg_danfe_alteracao AFTER INSERT OR UPDATE OR DELETE ON nota_fiscal.danfe
+    FOR EACH ROW EXECUTE FUNCTION nota_fiscal.registra_alteracao('danfe');
+
+/*
+DROP TABLE nota_fiscal.alteracao;
+DROP FUNCTION nota_fiscal.registra_alteracao CASCADE;
+DROP TABLE nota_fiscal.danfe_resumo_controle;
+DROP TABLE nota_fiscal.danfe_resumo_mensal;
+DROP MATERIALIZED VIEW nota_fiscal.mv_danfe_mensal;
+DROP TABLE nota_fiscal.endereco;
+DROP TABLE nota_fiscal.danfe;
+DROP TABLE nota_fiscal.contribuinte;
+*/
@@ -0,0 +1,90 @@
+from typing import Any
+
+from sqlalchemy import bindparam, text
+
+from app.core import config
+from app.domain.builders.danfe_resumo_builder import RESUMO_MENSAL
+from app.domain.builders.helpers.builder_helper import instrumented
+from app.domain.builders.helpers.dialect_helper import current_dialect
+
+
+@instrumented
+class AlteracaoBuilder:
+
+    class Alteracoes:
+
+        # Alterações registradas pelos triggers depois da marca d'água (id_alteracao crescente)
+        _QUERY = """
+        SELECT a.id_alteracao,
+            a.entidade,
+            a.cnpj_contribuinte
+        FROM nota_fiscal.alteracao a
+        WHERE a.id_alteracao > :idInicio
+        ORDER BY a.id_alteracao
+        {limit}
+        """
+
+        @classmethod
+        def build_statement(cls, id_inicio: int, limit: int) -> tuple[str, dict[str, Any]]:
+            statement = text(cls._QUERY.format(limit=current_dialect().limit()))
+            parameters = {"idInicio": id_inicio, "limit": limit}
+
+            return statement, parameters
+
+    class Pendentes:
+
+        # Ids que a marca pulou (transações ainda não confirmadas quando ela passou por eles)
+        _QUERY = """
+        SELECT a.id_alteracao,
+            a.entidade,
+            a.cnpj_contribuinte
+        FROM nota_fiscal.alteracao a
+        WHERE a.id_alteracao IN :ids
+        """
+
+        @classmethod
+        def build_statement(cls, ids: list[int]) -> tuple[str, dict[str, Any]]:
+            statement = text(cls._QUERY).bindparams(bindparam("ids", expanding=True))
+            parameters = {"ids": ids}
+
+            return statement, parameters
+
+    class UltimoId:
+
+        _QUERY = """
+        SELECT MAX(a.id_alteracao)
+        FROM nota_fiscal.alteracao a
+        """
+
+        @classmethod
+        def build_statement(cls) -> tuple[str, dict[str, Any]]:
+            statement = text(cls._QUERY)
+            parameters: dict[str, Any] = {}
+
+            return statement, parameters
+
+    class Limpeza:
+
+        _QUERY = """
+        DELETE FROM nota_fiscal.alteracao
+        WHERE id_alteracao <= :idFim
+        {resumo}
+        """
+
+        # O resumo mensal também lê o log: o que ele ainda não consolidou fica
+        _RESUMO = """AND id_alteracao <= (
+            SELECT ctl.ultimo_id_alteracao
+            FROM nota_fiscal.danfe_resumo_controle ctl
+            WHERE ctl.nome = :resumo
+        )"""
+
+        @classmethod
+        def build_statement(cls, id_fim: int) -> tuple[str, dict[str, Any]]:
+            parameters: dict[str, Any] = {"idFim": id_fim}
+            if config.RESUMO_MENSAL_ATIVO:
+                statement = text(cls._QUERY.format(resumo=cls._RESUMO))
+                parameters["resumo"] = RESUMO_MENSAL
+            else:
+                statement = text(cls._QUERY.format(resumo=""))
+
+            return statement, parameters
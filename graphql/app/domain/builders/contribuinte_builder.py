@@ -1,49 +1,166 @@
+import re
 from typing import Any
 
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 
+from app.core.exceptions import ValidationException
+from app.domain.builders.helpers.builder_helper import instrumented
+from app.domain.builders.helpers.dialect_helper import current_dialect
 from app.domain.builders.helpers.sql_helper import SqlHelper
-from app.presentation.filters.contribuinte_filter import ContribuinteFilter, ContribuintesFilter
+from app.presentation.enums.contribuinte_enum import ModoBusca
+from app.presentation.filters.contribuinte_filter import ContribuintesFilter
 
+# Mesmo mapa do TRANSLATE da coluna nm_fantasia_busca (setup.sql e setup_postgresql.sql): letras fora dele
+# (ex.: Ñ) ficam iguais no termo e na coluna, e a busca por prefixo continua as encontrando
+_ACENTOS = str.maketrans(
+    "áàâãäéèêëíìîïóòôõöúùûüçÁÀÂÃÄÉÈÊËÍÌÎÏÓÒÔÕÖÚÙÛÜÇ",
+    "aaaaaeeeeiiiiooooouuuucAAAAAEEEEIIIIOOOOOUUUUC",
+)
 
+# Colunas projetáveis: nome no DTO -> expressão SQL
+_COLUMNS = {
+    "cnpj_contribuinte": "c.cnpj_contribuinte",
+    "nm_fantasia": "c.nm_fantasia",
+}
+
+
+@instrumented
 class ContribuinteBuilder:
 
-    class Contribuinte:
+    class ContribuinteLote:
 
         _QUERY = """
         SELECT c.cnpj_contribuinte,
             c.nm_fantasia
         FROM nota_fiscal.contribuinte c
-        WHERE c.cnpj_contribuinte = :cnpj
+        WHERE c.cnpj_contribuinte IN :cnpjs
         """
 
         @classmethod
-        def build_statement(cls, filtro: ContribuinteFilter) -> tuple[str, dict[str, Any]]:
-            statement = text(cls._QUERY)
-            parameters = filtro.parameters()
+        def build_statement(cls, cnpjs: list[str]) -> tuple[str, dict[str, Any]]:
+            # Lista expandida em IN (:cnpjs_1, :cnpjs_2, ...) no momento da execução
+            statement = text(cls._QUERY).bindparams(bindparam("cnpjs", expanding=True))
+            parameters = {"cnpjs": cnpjs}
 
             return statement, parameters
 
     class Contribuintes:
 
         _QUERY = """
-        SELECT c.cnpj_contribuinte,
-            c.nm_fantasia
+        SELECT {columns}
         FROM nota_fiscal.contribuinte c
-        WHERE c.nm_fantasia LIKE '%' || :nmFantasia || '%'
+        WHERE {condition}
         """
 
+        _CONDITIONS = {
+            ModoBusca.PREFIXO: "c.nm_fantasia_busca LIKE :nmFantasiaPrefixo ESCAPE '\\'",
+            ModoBusca.CONTEM: "c.nm_fantasia LIKE :nmFantasiaContem ESCAPE '\\'",
+            ModoBusca.TEXTO: "CONTAINS(c.nm_fantasia, :nmFantasiaTexto, 1) > 0",
+        }
+
+        _ORDER_BY = {
+            ModoBusca.PREFIXO: ("nm_fantasia", "cnpj_contribuinte"),
+            ModoBusca.CONTEM: ("nm_fantasia", "cnpj_contribuinte"),
+            ModoBusca.TEXTO: ("relevancia DESC", "nm_fantasia", "cnpj_contribuinte"),
+        }
+
+        @classmethod
+        def cursor_keys(cls, modo: ModoBusca | str) -> tuple[str, ...]:
+            # Chaves gravadas no cursor: as colunas da ordenação do modo (relevancia só no TEXTO)
+            return tuple(column.partition(" ")[0] for column in cls._ORDER_BY[ModoBusca(modo)])
+
         @classmethod
         def build_statement(
             cls,
             filtro: ContribuintesFilter,
-            offset: int,
+            after: dict[str, Any] | None,
             limit: int,
+            campos: set[str] | None = None,
         ) -> tuple[str, dict[str, Any]]:
-            query = cls._QUERY
-            order_by = "nm_fantasia"
+            modo = ModoBusca(filtro.modo)
+            order_by = cls._ORDER_BY[modo]
+
+            available = _COLUMNS
+            required = ("nm_fantasia", "cnpj_contribuinte")
+            if modo is ModoBusca.TEXTO:
+                available = _COLUMNS | {"relevancia": "SCORE(1) AS relevancia"}
+                required = ("relevancia", *required)
+
+            columns, _ = SqlHelper.project(columns=available, campos=campos, required=required)
+            query = cls._QUERY.format(columns=columns, condition=cls._CONDITIONS[modo])
+
+            statement = SqlHelper.paginate(query=query, order_by=order_by, after=after)
+            parameters = (
+                filtro.parameters(limit=limit)
+                | cls._search_parameters(modo=modo, termo=filtro.nmFantasia)
+                | SqlHelper.seek_parameters(order_by=order_by, after=after)
+            )
+
+            return statement, parameters
+
+        @classmethod
+        def build_count_statement(cls, filtro: ContribuintesFilter) -> tuple[str, dict[str, Any]]:
+            modo = ModoBusca(filtro.modo)
+            columns, _ = SqlHelper.project(columns=_COLUMNS, campos=set(), required=("cnpj_contribuinte",))
+            query = cls._QUERY.format(columns=columns, condition=cls._CONDITIONS[modo])
+
+            statement = SqlHelper.count(query=query)
+            parameters = filtro.parameters() | cls._search_parameters(modo=modo, termo=filtro.nmFantasia)
 
-            statement = SqlHelper.paginate(query=query, order_by=order_by)
-            parameters = filtro.parameters(offset=offset, limit=limit)
+            return statement, parameters
+
+        @staticmethod
+        def _search_parameters(modo: ModoBusca, termo: str) -> dict[str, Any]:
+            if modo is ModoBusca.PREFIXO:
+                normalizado = nm_fantasia_busca(termo).strip()
+                return {"nmFantasiaPrefixo": f"{_escape_like(normalizado)}%"}
+
+            if modo is ModoBusca.CONTEM:
+                # Curingas montados aqui, e não com || no SQL, para o mesmo texto valer em todos os bancos
+                return {"nmFantasiaContem": f"%{_escape_like(termo)}%"}
+
+            if modo is ModoBusca.TEXTO:
+                if not current_dialect().text_search:
+                    raise ValidationException("Busca por texto disponível apenas no Oracle; use PREFIXO ou CONTEM")
+
+                # Cada palavra vira um termo com curinga final, todos obrigatórios; demais caracteres
+                # são descartados para não serem interpretados como operadores do Oracle Text
+                palavras = re.findall(r"\w+", termo)
+                if not palavras:
+                    raise ValidationException("Informe ao menos uma palavra para a busca por texto")
+                return {"nmFantasiaTexto": " AND ".join(f"{palavra}%" for palavra in palavras)}
+
+            return {}
+
+    class Merge:
+
+        # Upsert pela chave natural, executado com array binding (executemany) em lotes
+        COLUMNS = ("cnpj_contribuinte", "nm_fantasia")
+
+        _KEYS = ("cnpj_contribuinte",)
+
+        _UPDATES = {"nm_fantasia": "{source}.nm_fantasia"}
+
+        @classmethod
+        def build_statement(cls, rows: list[dict[str, Any]]) -> tuple[str, list[dict[str, Any]]]:
+            statement = text(
+                current_dialect().upsert(
+                    table="nota_fiscal.contribuinte",
+                    alias="c",
+                    columns=cls.COLUMNS,
+                    keys=cls._KEYS,
+                    updates=cls._UPDATES,
+                )
+            )
+            parameters = [{column: row[column] for column in cls.COLUMNS} for row in rows]
 
             return statement, parameters
+
+
+def nm_fantasia_busca(nome: str) -> str:
+    # Valor da coluna nm_fantasia_busca para `nome`: sem os acentos de _ACENTOS e em maiúsculas
+    return nome.translate(_ACENTOS).upper()
+
+
+def _escape_like(termo: str) -> str:
+    return re.sub(r"([\\%_])", r"\\\1", termo)
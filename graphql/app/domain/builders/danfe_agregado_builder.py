@@ -0,0 +1,195 @@
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import text
+
+from app.core import config
+from app.domain.builders.helpers.builder_helper import instrumented
+from app.domain.builders.helpers.dialect_helper import Dialect, current_dialect
+from app.domain.helpers.resumo_helper import resumo_mensal
+from app.presentation.filters.danfe_filter import DanfeAgregadoFilter
+
+# Agrupamento -> alias da dimensão no resultado
+_DIMENSIONS = {
+    "CNPJ": "cnpj_contribuinte",
+    "ANO": "ano",
+    "MES": "mes",
+    "UF": "uf",
+    "MUNICIPIO": "municipio",
+}
+
+# Expressões de cada dimensão (e do período dos filtros) sobre uma das fontes mensais
+# (materialized view mv_danfe_mensal ou tabela danfe_resumo_mensal, ambas com alias "m")
+_EXPRESSIONS_MENSAL = {
+    "cnpj_contribuinte": "m.cnpj_contribuinte",
+    "ano": "m.ano",
+    "mes": "m.mes",
+    "uf": "m.uf",
+    "municipio": "m.municipio",
+    "periodo": "m.mes_emissao",
+}
+
+# Fontes mensais pré-agregadas: tabela e dimensões que cada uma consegue responder
+_MENSAIS = {
+    "resumo": ("nota_fiscal.danfe_resumo_mensal", {"cnpj_contribuinte", "ano", "mes"}),
+    "mv": ("nota_fiscal.mv_danfe_mensal", {"cnpj_contribuinte", "ano", "mes", "uf", "municipio"}),
+}
+
+_JOIN_ENDERECO = "LEFT JOIN nota_fiscal.endereco e ON e.cnpj_contribuinte = d.cnpj_contribuinte"
+
+
+@instrumented
+class DanfeAgregadoBuilder:
+
+    class Agregado:
+
+        _QUERY = """
+        SELECT {dimensions}
+            COUNT(*) AS quantidade,
+            SUM(d.valor_total) AS soma,
+            AVG(d.valor_total) AS media,
+            MIN(d.valor_total) AS minimo,
+            MAX(d.valor_total) AS maximo
+        FROM nota_fiscal.danfe d
+        {joins}
+        {where}
+        {group_by}
+        {limit}
+        """
+
+        # Caminho rápido: os totais mensais já consolidados são somados de novo.
+        # A média é recalculada a partir da soma e da quantidade, nunca como média das médias.
+        # Sem agruparPor e sem meses no filtro, SUM devolve NULL: a quantidade vira 0, como o COUNT(*) do _QUERY
+        _QUERY_MENSAL = """
+        SELECT {dimensions}
+            COALESCE(SUM(m.quantidade), 0) AS quantidade,
+            SUM(m.soma) AS soma,
+            SUM(m.soma) / NULLIF(SUM(m.quantidade), 0) AS media,
+            MIN(m.minimo) AS minimo,
+            MAX(m.maximo) AS maximo
+        FROM {table} m
+        {where}
+        {group_by}
+        {limit}
+        """
+
+        @classmethod
+        def build_statement(cls, filtro: DanfeAgregadoFilter, limit: int) -> tuple[str, dict[str, Any]]:
+            dialect = current_dialect()
+            dimensions = [_DIMENSIONS[agrupamento] for agrupamento in dict.fromkeys(filtro.agruparPor)]
+            mensal = cls._mensal(filtro=filtro, dimensions=dimensions)
+            expressions = _expressions_danfe(dialect) if mensal is None else _EXPRESSIONS_MENSAL
+
+            conditions, parameters = cls._conditions(filtro=filtro, expressions=expressions)
+
+            select = "".join(f"{expressions[dimension]} AS {dimension},\n            " for dimension in dimensions)
+            where = "WHERE " + "\n            AND ".join(conditions) if conditions else ""
+            group_by = ""
+            if dimensions:
+                group_by = (
+                    f"GROUP BY {', '.join(expressions[dimension] for dimension in dimensions)}\n"
+                    f"        ORDER BY {', '.join(dimensions)}"
+                )
+
+            if mensal is not None:
+                query = cls._QUERY_MENSAL.format(
+                    dimensions=select,
+                    table=mensal,
+                    where=where,
+                    group_by=group_by,
+                    limit=dialect.limit(),
+                )
+            else:
+                # O endereço só entra se alguma dimensão ou filtro usar UF/município
+                uses_endereco = filtro.uf is not None or filtro.municipio is not None
+                uses_endereco = uses_endereco or any(
+                    expressions[dimension].startswith("e.") for dimension in dimensions
+                )
+                joins = _JOIN_ENDERECO if uses_endereco else ""
+                query = cls._QUERY.format(
+                    dimensions=select,
+                    joins=joins,
+                    where=where,
+                    group_by=group_by,
+                    limit=dialect.limit(),
+                )
+
+            statement = text(query)
+            parameters["limit"] = limit
+
+            return statement, parameters
+
+        @staticmethod
+        def _mensal(filtro: DanfeAgregadoFilter, dimensions: list[str]) -> str | None:
+            """
+            Tabela mensal pré-agregada que responde à consulta, na ordem de preferência (resumo, view),
+            ou None quando o grão pedido exige ler a danfe
+            """
+            # Granularidade mensal: o período precisa começar e terminar em limites de mês
+            if filtro.dataInicio is not None and filtro.dataInicio.day != 1:
+                return None
+            if filtro.dataFim is not None and (filtro.dataFim + timedelta(days=1)).day != 1:
+                return None
+
+            used = set(dimensions)
+            if filtro.uf is not None:
+                used.add("uf")
+            if filtro.municipio is not None:
+                used.add("municipio")
+
+            # O resumo só responde depois de construído: antes disso estaria vazio
+            habilitadas = {
+                "resumo": config.RESUMO_MENSAL_ATIVO and resumo_mensal.pronto,
+                "mv": config.AGREGADO_USAR_MV,
+            }
+            for fonte, (table, available) in _MENSAIS.items():
+                if habilitadas[fonte] and used <= available:
+                    return table
+
+            return None
+
+        @staticmethod
+        def _conditions(filtro: DanfeAgregadoFilter, expressions: dict[str, str]) -> tuple[list[str], dict[str, Any]]:
+            # Mesmos intervalos semiabertos (sargable) do DanfeBuilder.Danfes
+            conditions: list[str] = []
+            parameters: dict[str, Any] = {}
+            periodo = expressions["periodo"]
+
+            if filtro.cnpj is not None:
+                conditions.append(f"{expressions['cnpj_contribuinte']} = :cnpj")
+                parameters["cnpj"] = filtro.cnpj
+            if filtro.ano is not None:
+                conditions += [f"{periodo} >= :anoInicio", f"{periodo} < :anoFim"]
+                parameters["anoInicio"] = datetime(filtro.ano, 1, 1)
+                parameters["anoFim"] = datetime(filtro.ano + 1, 1, 1)
+            if filtro.dataInicio is not None:
+                conditions.append(f"{periodo} >= :dataInicio")
+                parameters["dataInicio"] = _inicio_do_dia(filtro.dataInicio)
+            if filtro.dataFim is not None:
+                # dataFim é inclusiva: vale até o fim do dia
+                conditions.append(f"{periodo} < :dataFim")
+                parameters["dataFim"] = _inicio_do_dia(filtro.dataFim + timedelta(days=1))
+            if filtro.uf is not None:
+                conditions.append(f"{expressions['uf']} = :uf")
+                parameters["uf"] = filtro.uf
+            if filtro.municipio is not None:
+                conditions.append(f"{expressions['municipio']} = :municipio")
+                parameters["municipio"] = filtro.municipio
+
+            return conditions, parameters
+
+
+def _expressions_danfe(dialect: Dialect) -> dict[str, str]:
+    # Mesmas dimensões, calculadas sobre a danfe (ano e mês extraídos da data de emissão)
+    return {
+        "cnpj_contribuinte": "d.cnpj_contribuinte",
+        "ano": dialect.year("d.data_emissao"),
+        "mes": dialect.month("d.data_emissao"),
+        "uf": "e.uf",
+        "municipio": "e.municipio",
+        "periodo": "d.data_emissao",
+    }
+
+
+def _inicio_do_dia(dia: date) -> datetime:
+    return datetime.combine(dia, datetime.min.time())
@@ -1,14 +1,38 @@
+from datetime import datetime, timedelta
 from typing import Any
 
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 
+from app.core import config
+from app.domain.builders.helpers.builder_helper import instrumented
+from app.domain.builders.helpers.dialect_helper import current_dialect
 from app.domain.builders.helpers.sql_helper import SqlHelper
-from app.presentation.filters.danfe_filter import DanfeFilter, DanfesFilter
+from app.presentation.filters.danfe_filter import DanfesFilter
 
+# Colunas projetáveis: nome no DTO -> expressão SQL
+_COLUMNS = {
+    "cnpj_contribuinte": "d.cnpj_contribuinte",
+    "nm_fantasia": "c.nm_fantasia",
+    "numero": "d.numero",
+    "valor_total": "d.valor_total",
+    "data_emissao": "d.data_emissao",
+    "logradouro": "e.logradouro",
+    "municipio": "e.municipio",
+    "uf": "e.uf",
+}
 
+# Joins opcionais, incluídos apenas se alguma coluna do alias for projetada. O endereço é LEFT JOIN aqui e nas
+# consultas por número: danfe de contribuinte sem endereço aparece em todas, com logradouro/município/UF nulos
+_JOINS = {
+    "c": "INNER JOIN nota_fiscal.contribuinte c ON c.cnpj_contribuinte = d.cnpj_contribuinte",
+    "e": "LEFT JOIN nota_fiscal.endereco e ON e.cnpj_contribuinte = d.cnpj_contribuinte",
+}
+
+
+@instrumented
 class DanfeBuilder:
 
-    class Danfe:
+    class DanfeLote:
 
         _QUERY = """
         SELECT c.cnpj_contribuinte,
@@ -21,21 +45,193 @@ class DanfeBuilder:
             e.uf
         FROM nota_fiscal.contribuinte c
         INNER JOIN nota_fiscal.danfe d ON d.cnpj_contribuinte = c.cnpj_contribuinte
-        INNER JOIN nota_fiscal.endereco e ON e.cnpj_contribuinte = c.cnpj_contribuinte
-        WHERE d.numero = :numero
+        LEFT JOIN nota_fiscal.endereco e ON e.cnpj_contribuinte = c.cnpj_contribuinte
+        WHERE d.numero IN :numeros
         """
 
         @classmethod
-        def build_statement(cls, filtro: DanfeFilter) -> tuple[str, dict[str, Any]]:
-            statement = text(cls._QUERY)
-            parameters = filtro.parameters()
+        def build_statement(cls, numeros: list[str]) -> tuple[str, dict[str, Any]]:
+            # Lista expandida em IN (:numeros_1, :numeros_2, ...) no momento da execução
+            statement = text(cls._QUERY).bindparams(bindparam("numeros", expanding=True))
+            parameters = {"numeros": numeros}
+
+            return statement, parameters
+
+    class DanfesContribuinte:
+
+        _QUERY = """
+        SELECT {columns}
+        FROM nota_fiscal.danfe d
+        {joins}
+        WHERE d.cnpj_contribuinte IN :cnpjs
+        """
+
+        ORDER_BY = ("data_emissao", "numero")
+
+        @classmethod
+        def build_statement(
+            cls,
+            cnpjs: list[str],
+            after: dict[str, Any] | None,
+            limit: int,
+            campos: set[str] | None = None,
+        ) -> tuple[str, dict[str, Any]]:
+            columns, joins = SqlHelper.project(
+                columns=_COLUMNS,
+                campos=campos,
+                required=("cnpj_contribuinte", *cls.ORDER_BY),
+                joins=_JOINS,
+            )
+            query = cls._QUERY.format(columns=columns, joins=joins)
+            order_by = cls.ORDER_BY
+
+            statement = SqlHelper.paginate_partitioned(
+                query=query,
+                partition_by="cnpj_contribuinte",
+                order_by=order_by,
+                after=after,
+            ).bindparams(bindparam("cnpjs", expanding=True))
+            parameters = {"cnpjs": cnpjs, "limit": limit} | SqlHelper.seek_parameters(order_by=order_by, after=after)
 
             return statement, parameters
 
     class Danfes:
 
         _QUERY = """
-        SELECT c.cnpj_contribuinte,
+        SELECT {columns}
+        FROM nota_fiscal.danfe d
+        {joins}
+        WHERE {conditions}
+        """
+
+        # O filtro fixa o contribuinte, então nm_fantasia é constante e não precisa entrar na ordenação
+        ORDER_BY = ("data_emissao", "numero")
+
+        @classmethod
+        def build_statement(
+            cls,
+            filtro: DanfesFilter,
+            after: dict[str, Any] | None,
+            limit: int,
+            campos: set[str] | None = None,
+        ) -> tuple[str, dict[str, Any]]:
+            columns, joins = SqlHelper.project(
+                columns=_COLUMNS,
+                campos=campos,
+                required=("cnpj_contribuinte", *cls.ORDER_BY),
+                joins=_JOINS,
+            )
+            conditions, condition_parameters = cls._conditions(filtro=filtro)
+            query = cls._QUERY.format(columns=columns, joins=joins, conditions=conditions)
+            order_by = cls.ORDER_BY
+
+            statement = SqlHelper.paginate(query=query, order_by=order_by, after=after)
+            parameters = (
+                filtro.parameters(limit=limit)
+                | condition_parameters
+                | SqlHelper.seek_parameters(order_by=order_by, after=after)
+            )
+
+            return statement, parameters
+
+        @classmethod
+        def build_stream_statement(
+            cls,
+            filtro: DanfesFilter,
+            after: dict[str, Any] | None,
+            limit: int,
+            campos: set[str] | None = None,
+        ) -> tuple[str, dict[str, Any]]:
+            # Mesma página, lida do cursor no servidor em round-trips pequenos: as primeiras linhas saem logo (@stream)
+            statement, parameters = cls.build_statement(filtro=filtro, after=after, limit=limit, campos=campos)
+            statement = statement.execution_options(
+                stream_results=True,
+                yield_per=config.GRAPHQL_STREAM_FETCH_SIZE,
+                arraysize=config.GRAPHQL_STREAM_FETCH_SIZE,
+                prefetchrows=config.GRAPHQL_STREAM_FETCH_SIZE,
+            )
+
+            return statement, parameters
+
+        @classmethod
+        def build_count_statement(cls, filtro: DanfesFilter) -> tuple[str, dict[str, Any]]:
+            # Só a coluna do filtro: o COUNT não precisa dos joins
+            columns, joins = SqlHelper.project(
+                columns=_COLUMNS,
+                campos=set(),
+                required=("cnpj_contribuinte",),
+                joins=_JOINS,
+            )
+            conditions, condition_parameters = cls._conditions(filtro=filtro)
+            query = cls._QUERY.format(columns=columns, joins=joins, conditions=conditions)
+
+            statement = SqlHelper.count(query=query)
+            parameters = filtro.parameters() | condition_parameters
+
+            return statement, parameters
+
+        @classmethod
+        def build_export_statement(
+            cls,
+            filtro: DanfesFilter,
+            campos: set[str] | None = None,
+        ) -> tuple[str, dict[str, Any]]:
+            # Sem paginação: cursor no servidor e busca em lotes de EXPORT_FETCH_SIZE linhas por round-trip
+            columns, joins = SqlHelper.project(
+                columns=_COLUMNS,
+                campos=campos,
+                required=cls.ORDER_BY,
+                joins=_JOINS,
+            )
+            conditions, condition_parameters = cls._conditions(filtro=filtro)
+            query = cls._QUERY.format(columns=columns, joins=joins, conditions=conditions)
+
+            statement = SqlHelper.order(query=query, order_by=cls.ORDER_BY).execution_options(
+                stream_results=True,
+                yield_per=config.EXPORT_FETCH_SIZE,
+                arraysize=config.EXPORT_FETCH_SIZE,
+                prefetchrows=config.EXPORT_FETCH_SIZE,
+            )
+            parameters = filtro.parameters() | condition_parameters
+
+            return statement, parameters
+
+        @classmethod
+        def export_columns(cls, campos: set[str] | None = None) -> list[str]:
+            # Colunas de build_export_statement, na ordem do SELECT: o cabeçalho da exportação sai mesmo sem linhas
+            return SqlHelper.projected(columns=_COLUMNS, campos=campos, required=cls.ORDER_BY)
+
+        @staticmethod
+        def _conditions(filtro: DanfesFilter) -> tuple[str, dict[str, Any]]:
+            # Períodos viram intervalos semiabertos sobre a coluna pura (sargable),
+            # aproveitando o índice (cnpj_contribuinte, data_emissao) e o partition pruning
+            conditions = ["d.cnpj_contribuinte = :cnpj"]
+            parameters: dict[str, Any] = {}
+
+            if filtro.ano is not None:
+                conditions += ["d.data_emissao >= :anoInicio", "d.data_emissao < :anoFim"]
+                parameters["anoInicio"] = datetime(filtro.ano, 1, 1)
+                parameters["anoFim"] = datetime(filtro.ano + 1, 1, 1)
+            if filtro.dataInicio is not None:
+                conditions.append("d.data_emissao >= :dataInicio")
+                parameters["dataInicio"] = datetime.combine(filtro.dataInicio, datetime.min.time())
+            if filtro.dataFim is not None:
+                # dataFim é inclusiva: vale até o fim do dia
+                conditions.append("d.data_emissao < :dataFim")
+                parameters["dataFim"] = datetime.combine(filtro.dataFim + timedelta(days=1), datetime.min.time())
+            if filtro.valorMinimo is not None:
+                conditions.append("d.valor_total >= :valorMinimo")
+            if filtro.valorMaximo is not None:
+                conditions.append("d.valor_total <= :valorMaximo")
+
+            return "\n            AND ".join(conditions), parameters
+
+    class Emitidas:
+
+        # Danfes inseridas depois da marca d'água (id_danfe crescente), em ordem de inserção
+        _QUERY = """
+        SELECT d.id_danfe,
+            c.cnpj_contribuinte,
             c.nm_fantasia,
             d.numero,
             d.valor_total,
@@ -43,24 +239,69 @@ class DanfeBuilder:
             e.logradouro,
             e.municipio,
             e.uf
-        FROM nota_fiscal.contribuinte c
-        INNER JOIN nota_fiscal.danfe d ON d.cnpj_contribuinte = c.cnpj_contribuinte
-        INNER JOIN nota_fiscal.endereco e ON e.cnpj_contribuinte = c.cnpj_contribuinte
-        WHERE c.cnpj_contribuinte = :cnpj
-            AND EXTRACT (YEAR FROM d.data_emissao) = :ano
+        FROM nota_fiscal.danfe d
+        INNER JOIN nota_fiscal.contribuinte c ON c.cnpj_contribuinte = d.cnpj_contribuinte
+        LEFT JOIN nota_fiscal.endereco e ON e.cnpj_contribuinte = d.cnpj_contribuinte
+        WHERE {condition}
+        ORDER BY d.id_danfe
+        {limit}
         """
 
         @classmethod
-        def build_statement(
-            cls,
-            filtro: DanfesFilter,
-            offset: int,
-            limit: int,
-        ) -> tuple[str, dict[str, Any]]:
-            query = cls._QUERY
-            order_by = "nm_fantasia, data_emissao"
+        def build_statement(cls, id_inicio: int, limit: int) -> tuple[str, dict[str, Any]]:
+            statement = text(cls._QUERY.format(condition="d.id_danfe > :idInicio", limit=current_dialect().limit()))
+            parameters = {"idInicio": id_inicio, "limit": limit}
+
+            return statement, parameters
+
+        @classmethod
+        def build_pendentes_statement(cls, ids: list[int]) -> tuple[str, dict[str, Any]]:
+            # Ids que a marca pulou (transações ainda não confirmadas quando ela passou por eles)
+            statement = text(cls._QUERY.format(condition="d.id_danfe IN :ids", limit="")).bindparams(
+                bindparam("ids", expanding=True)
+            )
+            parameters = {"ids": ids}
+
+            return statement, parameters
+
+    class UltimoId:
+
+        _QUERY = """
+        SELECT MAX(d.id_danfe)
+        FROM nota_fiscal.danfe d
+        """
 
-            statement = SqlHelper.paginate(query=query, order_by=order_by)
-            parameters = filtro.parameters(offset=offset, limit=limit)
+        @classmethod
+        def build_statement(cls) -> tuple[str, dict[str, Any]]:
+            statement = text(cls._QUERY)
+            parameters: dict[str, Any] = {}
+
+            return statement, parameters
+
+    class Merge:
+
+        # Upsert pela chave natural (numero), executado com array binding (executemany) em lotes
+        COLUMNS = ("cnpj_contribuinte", "numero", "valor_total", "data_emissao")
+
+        _KEYS = ("numero",)
+
+        _UPDATES = {
+            "cnpj_contribuinte": "{source}.cnpj_contribuinte",
+            "valor_total": "{source}.valor_total",
+            "data_emissao": "{source}.data_emissao",
+        }
+
+        @classmethod
+        def build_statement(cls, rows: list[dict[str, Any]]) -> tuple[str, list[dict[str, Any]]]:
+            statement = text(
+                current_dialect().upsert(
+                    table="nota_fiscal.danfe",
+                    alias="d",
+                    columns=cls.COLUMNS,
+                    keys=cls._KEYS,
+                    updates=cls._UPDATES,
+                )
+            )
+            parameters = [{column: row[column] for column in cls.COLUMNS} for row in rows]
 
             return statement, parameters
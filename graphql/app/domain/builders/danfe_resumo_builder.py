@@ -0,0 +1,111 @@
+from typing import Any
+
+from sqlalchemy import bindparam, text
+
+from app.domain.builders.helpers.builder_helper import instrumented
+from app.domain.builders.helpers.dialect_helper import Dialect, current_dialect
+
+# Nome do resumo na tabela de controle (marca d'água por resumo)
+RESUMO_MENSAL = "danfe_resumo_mensal"
+
+_COLUMNS = ("cnpj_contribuinte", "ano", "mes", "mes_emissao", "quantidade", "soma", "minimo", "maximo")
+
+
+@instrumented
+class DanfeResumoBuilder:
+
+    class Marca:
+
+        # FOR UPDATE: só um worker/processo atualiza o resumo por vez; os demais esperam o commit
+        _QUERY = """
+        SELECT ctl.ultimo_id_alteracao
+        FROM nota_fiscal.danfe_resumo_controle ctl
+        WHERE ctl.nome = :nome
+        {for_update}
+        """
+
+        @classmethod
+        def build_statement(cls) -> tuple[str, dict[str, Any]]:
+            statement = text(cls._QUERY.format(for_update=current_dialect().for_update()))
+            parameters = {"nome": RESUMO_MENSAL}
+
+            return statement, parameters
+
+    class Limpeza:
+
+        # Sem `cnpjs`, o resumo inteiro
+        _STATEMENT = """
+        DELETE FROM nota_fiscal.danfe_resumo_mensal
+        {where}
+        """
+
+        @classmethod
+        def build_statement(cls, cnpjs: list[str] | None = None) -> tuple[str, dict[str, Any]]:
+            if cnpjs is None:
+                return text(cls._STATEMENT.format(where="")), {}
+
+            statement = text(cls._STATEMENT.format(where="WHERE cnpj_contribuinte IN :cnpjs")).bindparams(
+                bindparam("cnpjs", expanding=True)
+            )
+            parameters = {"cnpjs": cnpjs}
+
+            return statement, parameters
+
+    class Reconstrucao:
+
+        # Recalcula os totais a partir das danfes atuais (sem `cnpjs`, de todos os contribuintes): como a Limpeza
+        # vem antes, reflete inserções, alterações e exclusões, e recalcular o mesmo contribuinte de novo não muda nada
+        _STATEMENT = """
+        INSERT INTO nota_fiscal.danfe_resumo_mensal ({columns})
+        {source}
+        """
+
+        @classmethod
+        def build_statement(cls, cnpjs: list[str] | None = None) -> tuple[str, dict[str, Any]]:
+            where = "1 = 1" if cnpjs is None else "d.cnpj_contribuinte IN :cnpjs"
+            source = _totais(dialect=current_dialect(), where=where)
+            statement = text(cls._STATEMENT.format(columns=", ".join(_COLUMNS), source=source))
+            if cnpjs is None:
+                return statement, {}
+
+            statement = statement.bindparams(bindparam("cnpjs", expanding=True))
+            parameters = {"cnpjs": cnpjs}
+
+            return statement, parameters
+
+    class AtualizaMarca:
+
+        _STATEMENT = """
+        UPDATE nota_fiscal.danfe_resumo_controle
+        SET ultimo_id_alteracao = :ultimoId,
+            atualizado_em = {now}
+        WHERE nome = :nome
+        """
+
+        @classmethod
+        def build_statement(cls, ultimo_id: int) -> tuple[str, dict[str, Any]]:
+            statement = text(cls._STATEMENT.format(now=current_dialect().now()))
+            parameters = {"nome": RESUMO_MENSAL, "ultimoId": ultimo_id}
+
+            return statement, parameters
+
+
+def _totais(dialect: Dialect, where: str) -> str:
+    # Totais mensais por contribuinte das danfes que atendem `where`, nas colunas de _COLUMNS
+    ano = dialect.year("d.data_emissao")
+    mes = dialect.month("d.data_emissao")
+    mes_emissao = dialect.month_start("d.data_emissao")
+
+    return f"""
+        SELECT d.cnpj_contribuinte,
+            {ano} AS ano,
+            {mes} AS mes,
+            {mes_emissao} AS mes_emissao,
+            COUNT(*) AS quantidade,
+            SUM(d.valor_total) AS soma,
+            MIN(d.valor_total) AS minimo,
+            MAX(d.valor_total) AS maximo
+        FROM nota_fiscal.danfe d
+        WHERE {where}
+        GROUP BY d.cnpj_contribuinte, {ano}, {mes}, {mes_emissao}
+        """
@@ -1,14 +1,25 @@
 from typing import Any
 
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 
+from app.domain.builders.helpers.builder_helper import instrumented
+from app.domain.builders.helpers.dialect_helper import current_dialect
 from app.domain.builders.helpers.sql_helper import SqlHelper
-from app.presentation.filters.endereco_filter import EnderecoFilter, EnderecosFilter
+from app.presentation.filters.endereco_filter import EnderecosFilter
 
+# Colunas projetáveis: nome no DTO -> expressão SQL
+_COLUMNS = {
+    "cnpj_contribuinte": "e.cnpj_contribuinte",
+    "logradouro": "e.logradouro",
+    "municipio": "e.municipio",
+    "uf": "e.uf",
+}
 
+
+@instrumented
 class EnderecoBuilder:
 
-    class Endereco:
+    class EnderecoLote:
 
         _QUERY = """
         SELECT e.cnpj_contribuinte,
@@ -16,39 +27,79 @@ class EnderecoBuilder:
             e.municipio,
             e.uf
         FROM nota_fiscal.endereco e
-        WHERE e.cnpj_contribuinte = :cnpj
+        WHERE e.cnpj_contribuinte IN :cnpjs
         """
 
         @classmethod
-        def build_statement(cls, filtro: EnderecoFilter) -> tuple[str, dict[str, Any]]:
-            statement = text(cls._QUERY)
-            parameters = filtro.parameters()
+        def build_statement(cls, cnpjs: list[str]) -> tuple[str, dict[str, Any]]:
+            # Lista expandida em IN (:cnpjs_1, :cnpjs_2, ...) no momento da execução
+            statement = text(cls._QUERY).bindparams(bindparam("cnpjs", expanding=True))
+            parameters = {"cnpjs": cnpjs}
 
             return statement, parameters
 
     class Enderecos:
 
         _QUERY = """
-        SELECT e.cnpj_contribuinte,
-            e.logradouro,
-            e.municipio,
-            e.uf
+        SELECT {columns}
         FROM nota_fiscal.endereco e
         WHERE e.uf = :uf
             AND e.municipio = :municipio
         """
 
+        ORDER_BY = ("uf", "municipio", "logradouro", "cnpj_contribuinte")
+
         @classmethod
         def build_statement(
             cls,
             filtro: EnderecosFilter,
-            offset: int,
+            after: dict[str, Any] | None,
             limit: int,
+            campos: set[str] | None = None,
         ) -> tuple[str, dict[str, Any]]:
-            query = cls._QUERY
-            order_by = "uf, municipio, logradouro"
+            columns, _ = SqlHelper.project(columns=_COLUMNS, campos=campos, required=cls.ORDER_BY)
+            query = cls._QUERY.format(columns=columns)
+            order_by = cls.ORDER_BY
+
+            statement = SqlHelper.paginate(query=query, order_by=order_by, after=after)
+            parameters = filtro.parameters(limit=limit) | SqlHelper.seek_parameters(order_by=order_by, after=after)
 
-            statement = SqlHelper.paginate(query=query, order_by=order_by)
-            parameters = filtro.parameters(offset=offset, limit=limit)
+            return statement, parameters
+
+        @classmethod
+        def build_count_statement(cls, filtro: EnderecosFilter) -> tuple[str, dict[str, Any]]:
+            columns, _ = SqlHelper.project(columns=_COLUMNS, campos=set(), required=("cnpj_contribuinte",))
+            query = cls._QUERY.format(columns=columns)
+
+            statement = SqlHelper.count(query=query)
+            parameters = filtro.parameters()
+
+            return statement, parameters
+
+    class Merge:
+
+        # Upsert pela chave natural, executado com array binding (executemany) em lotes
+        COLUMNS = ("cnpj_contribuinte", "logradouro", "municipio", "uf")
+
+        _KEYS = ("cnpj_contribuinte",)
+
+        _UPDATES = {
+            "logradouro": "{source}.logradouro",
+            "municipio": "{source}.municipio",
+            "uf": "{source}.uf",
+        }
+
+        @classmethod
+        def build_statement(cls, rows: list[dict[str, Any]]) -> tuple[str, list[dict[str, Any]]]:
+            statement = text(
+                current_dialect().upsert(
+                    table="nota_fiscal.endereco",
+                    alias="e",
+                    columns=cls.COLUMNS,
+                    keys=cls._KEYS,
+                    updates=cls._UPDATES,
+                )
+            )
+            parameters = [{column: row[column] for column in cls.COLUMNS} for row in rows]
 
             return statement, parameters
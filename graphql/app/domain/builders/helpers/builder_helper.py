@@ -0,0 +1,28 @@
+from functools import wraps
+from typing import Any, Callable
+
+
+def instrumented(builder: type) -> type:
+    """
+    Grava nos statements de cada classe aninhada o nome dela (ex.: DanfeBuilder.Danfes),
+    usado nas métricas de tempo de SQL e de linhas devolvidas por builder
+    """
+    for name, nested in vars(builder).items():
+        if not isinstance(nested, type):
+            continue
+
+        label = f"{builder.__name__}.{name}"
+        for attribute, method in list(vars(nested).items()):
+            if attribute.startswith("build_") and isinstance(method, classmethod):
+                setattr(nested, attribute, classmethod(_labeled(method.__func__, label)))
+
+    return builder
+
+
+def _labeled(build: Callable[..., tuple[Any, Any]], label: str) -> Callable[..., tuple[Any, Any]]:
+    @wraps(build)
+    def wrapper(cls, *args, **kwargs):
+        statement, parameters = build(cls, *args, **kwargs)
+        return statement.execution_options(builder=label), parameters
+
+    return wrapper
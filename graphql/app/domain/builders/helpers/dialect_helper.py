@@ -0,0 +1,148 @@
+from app.core import config
+
+
+class Dialect:
+    """
+    Trechos de SQL que variam entre os bancos suportados (DB_BACKEND).
+    A base segue o SQL padrão aceito por PostgreSQL e SQLite; o Oracle sobrescreve o que é próprio dele
+    """
+
+    name = ""
+
+    # Busca por palavras com Oracle Text (CONTAINS/SCORE), sem equivalente nos demais bancos
+    text_search = False
+
+    def limit(self, parameter: str = "limit") -> str:
+        return f"LIMIT :{parameter}"
+
+    def year(self, expression: str) -> str:
+        return f"EXTRACT(YEAR FROM {expression})"
+
+    def month(self, expression: str) -> str:
+        return f"EXTRACT(MONTH FROM {expression})"
+
+    def month_start(self, expression: str) -> str:
+        return f"DATE_TRUNC('month', {expression})"
+
+    def least(self, *expressions: str) -> str:
+        return f"LEAST({', '.join(expressions)})"
+
+    def greatest(self, *expressions: str) -> str:
+        return f"GREATEST({', '.join(expressions)})"
+
+    def now(self) -> str:
+        return "CURRENT_TIMESTAMP"
+
+    def for_update(self) -> str:
+        return "FOR UPDATE"
+
+    def upsert(
+        self,
+        table: str,
+        alias: str,
+        columns: tuple[str, ...],
+        keys: tuple[str, ...],
+        updates: dict[str, str],
+        source: str | None = None,
+    ) -> str:
+        """
+        Insere ou atualiza pela chave `keys`. As linhas vêm de `source` (consulta com as colunas de `columns`)
+        ou, sem ela, de parâmetros nomeados como as colunas (executemany).
+        Em `updates`, {target} é a linha existente e {source} a nova, ex.: "{target}.soma + {source}.soma"
+        """
+        if source is None:
+            rows = f"VALUES ({', '.join(f':{column}' for column in columns)})"
+        else:
+            # WHERE explícito: sem ele o SQLite confunde o ON CONFLICT com o ON de um join
+            rows = f"SELECT {', '.join(f's.{column}' for column in columns)} FROM ({source}) s WHERE 1 = 1"
+        assignments = ",\n            ".join(
+            f"{column} = {expression.format(target=alias, source='excluded')}" for column, expression in updates.items()
+        )
+
+        return f"""
+        INSERT INTO {table} AS {alias} ({', '.join(columns)})
+        {rows}
+        ON CONFLICT ({', '.join(keys)}) DO UPDATE SET
+            {assignments}
+        """
+
+
+class OracleDialect(Dialect):
+
+    name = "oracle"
+    text_search = True
+
+    def limit(self, parameter: str = "limit") -> str:
+        return f"FETCH NEXT :{parameter} ROWS ONLY"
+
+    def month_start(self, expression: str) -> str:
+        return f"TRUNC({expression}, 'MM')"
+
+    def now(self) -> str:
+        return "SYSTIMESTAMP"
+
+    def upsert(
+        self,
+        table: str,
+        alias: str,
+        columns: tuple[str, ...],
+        keys: tuple[str, ...],
+        updates: dict[str, str],
+        source: str | None = None,
+    ) -> str:
+        if source is None:
+            source = f"SELECT {', '.join(f':{column} AS {column}' for column in columns)} FROM dual"
+        on = " AND ".join(f"{alias}.{key} = s.{key}" for key in keys)
+        assignments = ",\n            ".join(
+            f"{alias}.{column} = {expression.format(target=alias, source='s')}"
+            for column, expression in updates.items()
+        )
+
+        return f"""
+        MERGE INTO {table} {alias}
+        USING ({source}) s
+        ON ({on})
+        WHEN MATCHED THEN UPDATE SET
+            {assignments}
+        WHEN NOT MATCHED THEN INSERT ({', '.join(columns)})
+            VALUES ({', '.join(f's.{column}' for column in columns)})
+        """
+
+
+class PostgresDialect(Dialect):
+
+    name = "postgresql"
+
+
+class SqliteDialect(Dialect):
+
+    name = "sqlite"
+
+    def year(self, expression: str) -> str:
+        return f"CAST(strftime('%Y', {expression}) AS INTEGER)"
+
+    def month(self, expression: str) -> str:
+        return f"CAST(strftime('%m', {expression}) AS INTEGER)"
+
+    def month_start(self, expression: str) -> str:
+        return f"datetime({expression}, 'start of month')"
+
+    # MIN/MAX com mais de um argumento são as versões escalares do SQLite
+    def least(self, *expressions: str) -> str:
+        return f"MIN({', '.join(expressions)})"
+
+    def greatest(self, *expressions: str) -> str:
+        return f"MAX({', '.join(expressions)})"
+
+    def for_update(self) -> str:
+        # O SQLite não tem lock de linha: a escrita já bloqueia o banco inteiro até o commit
+        return ""
+
+
+DIALECTS: dict[str, Dialect] = {
+    dialect.name: dialect for dialect in (OracleDialect(), PostgresDialect(), SqliteDialect())
+}
+
+
+def current_dialect() -> Dialect:
+    return DIALECTS[config.DB_BACKEND]
@@ -1,15 +1,139 @@
+from typing import Any
+
 from sqlalchemy import text
 
+from app.core.exceptions import ValidationException
+from app.domain.builders.helpers.dialect_helper import current_dialect
+
 
 class SqlHelper:
 
     @staticmethod
-    def paginate(query: str, order_by: str) -> text:
+    def project(
+        columns: dict[str, str],
+        campos: set[str] | None,
+        required: tuple[str, ...] = (),
+        joins: dict[str, str] | None = None,
+    ) -> tuple[str, str]:
+        """
+        Projeção das colunas pedidas (`campos`) mais as obrigatórias (`required`).
+        Um join de `joins` (indexado pelo alias da tabela) só entra se alguma coluna projetada usar o alias
+        """
+        selected = [columns[name] for name in SqlHelper.projected(columns=columns, campos=campos, required=required)]
+        used = [
+            join
+            for alias, join in (joins or {}).items()
+            if any(expression.startswith(f"{alias}.") for expression in selected)
+        ]
+
+        return ",\n            ".join(selected), "\n        ".join(used)
+
+    @staticmethod
+    def projected(columns: dict[str, str], campos: set[str] | None, required: tuple[str, ...] = ()) -> list[str]:
+        """
+        Nomes das colunas que `project` seleciona, na ordem do SELECT
+        """
+        return [name for name in columns if campos is None or name in campos or name in required]
+
+    @staticmethod
+    def paginate(query: str, order_by: tuple[str, ...], after: dict[str, Any] | None = None) -> text:
+        """
+        Paginação keyset: a próxima página começa logo após a chave da última linha (seek),
+        com custo independente da profundidade da página
+        """
+        where = f"WHERE {SqlHelper._seek_predicate(order_by)}" if after else ""
+
+        return text(f"""
+        SELECT *
+        FROM (
+            {query}
+        ) q
+        {where}
+        ORDER BY {", ".join(order_by)}
+        {current_dialect().limit()}
+        """)
+
+    @staticmethod
+    def order(query: str, order_by: tuple[str, ...]) -> text:
+        """
+        Consulta completa, sem paginação, na mesma ordenação das páginas (exportações)
+        """
         return text(f"""
         SELECT *
         FROM (
             {query}
-        )
-        ORDER BY {order_by}
-        OFFSET :offset ROWS FETCH NEXT :limit ROWS ONLY
+        ) q
+        ORDER BY {", ".join(order_by)}
         """)
+
+    @staticmethod
+    def count(query: str) -> text:
+        return text(f"""
+        SELECT COUNT(*)
+        FROM (
+            {query}
+        ) q
+        """)
+
+    @staticmethod
+    def paginate_partitioned(
+        query: str,
+        partition_by: str,
+        order_by: tuple[str, ...],
+        after: dict[str, Any] | None = None,
+    ) -> text:
+        """
+        Paginação keyset aplicada a cada grupo de `partition_by` em uma única consulta,
+        usada para carregar em lote a mesma página de vários pais
+        """
+        where = f"WHERE {SqlHelper._seek_predicate(order_by)}" if after else ""
+        order = ", ".join(order_by)
+
+        return text(f"""
+        SELECT *
+        FROM (
+            SELECT q.*,
+                ROW_NUMBER() OVER (PARTITION BY {partition_by} ORDER BY {order}) AS rn
+            FROM (
+                {query}
+            ) q
+            {where}
+        ) p
+        WHERE rn <= :limit
+        ORDER BY {partition_by}, {order}
+        """)
+
+    @staticmethod
+    def seek_parameters(order_by: tuple[str, ...], after: dict[str, Any] | None) -> dict[str, Any]:
+        if not after:
+            return {}
+
+        columns = [column for column, _ in SqlHelper._order_columns(order_by)]
+        if any(after.get(column) is None for column in columns):
+            raise ValidationException("Cursor incompatível com a ordenação da consulta")
+
+        return {f"after_{column}": after[column] for column in columns}
+
+    @staticmethod
+    def _seek_predicate(order_by: tuple[str, ...]) -> str:
+        # Oracle não compara tuplas com ">", então (a, b) > (:a, :b) é expandido em
+        # (a > :a) OR (a = :a AND b > :b); colunas DESC usam "<"
+        columns = SqlHelper._order_columns(order_by)
+
+        conditions = []
+        for i, (column, descending) in enumerate(columns):
+            equals = [f"{previous} = :after_{previous}" for previous, _ in columns[:i]]
+            operator = "<" if descending else ">"
+            conditions.append(" AND ".join([*equals, f"{column} {operator} :after_{column}"]))
+
+        return "(" + " OR ".join(f"({condition})" for condition in conditions) + ")"
+
+    @staticmethod
+    def _order_columns(order_by: tuple[str, ...]) -> list[tuple[str, bool]]:
+        # "coluna" ou "coluna DESC" -> (coluna, descendente)
+        columns = []
+        for item in order_by:
+            column, _, direction = item.partition(" ")
+            columns.append((column, direction.strip().upper() == "DESC"))
+
+        return columns
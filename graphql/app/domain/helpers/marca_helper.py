@@ -0,0 +1,49 @@
+import time
+from collections.abc import Iterable
+
+# Limite de ids pendentes acompanhados (e do IN da consulta deles)
+MAX_PENDENTES = 1000
+
+
+class MarcaHelper:
+    """
+    Marca d'água sobre um id crescente (identity) e os ids que ela pulou: uma transação que recebeu um id
+    menor pode confirmar depois de outra com id maior, e quando a marca passa por ele o id ainda não aparece.
+    Cada id pulado é procurado de novo por `espera` segundos; saltos maiores que `salto_maximo` são tratados
+    como ids descartados pela sequência (rollback, cache de ids) e não são acompanhados
+    """
+
+    def __init__(self, espera: float, salto_maximo: int):
+        self.espera = espera
+        self.salto_maximo = salto_maximo
+        self.marca: int | None = None
+        self._pendentes: dict[int, float] = {}
+
+    @property
+    def pendentes(self) -> list[int]:
+        # Descarta os que passaram da espera
+        agora = time.monotonic()
+        self._pendentes = {id_: prazo for id_, prazo in self._pendentes.items() if prazo > agora}
+        return list(self._pendentes)
+
+    def encontrados(self, ids: Iterable[int]) -> None:
+        for id_ in ids:
+            self._pendentes.pop(id_, None)
+
+    def avancar(self, ids: Iterable[int]) -> None:
+        # `ids` lidos acima da marca, em ordem crescente
+        prazo = time.monotonic() + self.espera
+        anterior = self.marca
+        for id_ in ids:
+            salto = id_ - anterior - 1
+            if 0 < salto <= self.salto_maximo:
+                for pulado in range(anterior + 1, id_):
+                    if len(self._pendentes) >= MAX_PENDENTES:
+                        break
+                    self._pendentes[pulado] = prazo
+            anterior = id_
+        self.marca = anterior
+
+    def reiniciar(self, marca: int | None = None) -> None:
+        self.marca = marca
+        self._pendentes.clear()
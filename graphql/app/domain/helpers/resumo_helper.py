@@ -0,0 +1,11 @@
+class ResumoHelper:
+    """
+    Estado do resumo mensal neste processo: `pronto` depois que o DanfeResumoJob encontra o resumo já construído
+    (marca gravada em danfe_resumo_controle) ou o constrói. Até lá, a agregação lê a danfe em vez do resumo vazio
+    """
+
+    def __init__(self):
+        self.pronto = False
+
+
+resumo_mensal = ResumoHelper()
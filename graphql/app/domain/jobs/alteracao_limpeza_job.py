@@ -0,0 +1,51 @@
+import asyncio
+import logging
+
+from app.database.core.db import get_db_session
+from app.domain.services.alteracao_service import AlteracaoService
+
+logger = logging.getLogger(__name__)
+
+
+class AlteracaoLimpezaJob:
+    """
+    Limpa o log nota_fiscal.alteracao, preenchido pelos triggers em toda escrita, haja ou não quem o leia
+    (TabelaAlteracaoNotifier, DanfeResumoJob). A cada `retencao` segundos, apaga o log até o último id visto na
+    limpeza anterior: os leitores, que o acompanham a cada poucos segundos, já passaram dele.
+    Com o resumo mensal ativo, nunca apaga além da marca do resumo (ver AlteracaoBuilder.Limpeza)
+    """
+
+    def __init__(self, retencao: float):
+        self.retencao = retencao
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="alteracao-limpeza")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        marca: int | None = None
+
+        while True:
+            try:
+                async with get_db_session() as session:
+                    service = AlteracaoService(session=session)
+                    if marca:
+                        await service.delete_alteracoes(id_fim=marca)
+                    marca = await service.get_ultimo_id()
+            except Exception:
+                # Falhas (ex.: banco indisponível) não derrubam o job: a próxima execução tenta de novo da mesma marca
+                logger.exception("Falha ao limpar o log de alterações")
+
+            await asyncio.sleep(self.retencao)
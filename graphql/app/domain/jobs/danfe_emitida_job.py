@@ -0,0 +1,154 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from app.core import config
+from app.core.exceptions import CustomException
+from app.database.core.db import get_read_session
+from app.domain.helpers.marca_helper import MarcaHelper
+from app.domain.services.danfe_service import DanfeService
+from app.presentation.dtos.danfe_dto import DanfeRow
+
+logger = logging.getLogger(__name__)
+
+# Marca o fim de uma assinatura que não acompanhou o volume de danfes
+_ATRASADA = object()
+
+
+class Assinatura:
+    """
+    Fila de um assinante de danfeEmitida. A fila é limitada: quando enche, a assinatura é encerrada
+    em vez de descartar danfes em silêncio, e o cliente reassina e relê o intervalo por `danfes`
+    """
+
+    def __init__(self, cnpj: str | None, uf: str | None, tamanho: int):
+        self.cnpj = cnpj
+        self.uf = uf
+        self.fila: asyncio.Queue = asyncio.Queue(maxsize=tamanho)
+        self.atrasada = False
+
+    def publicar(self, item: DanfeRow) -> None:
+        if self.atrasada or (self.uf is not None and item.uf != self.uf):
+            return
+
+        try:
+            self.fila.put_nowait(item)
+        except asyncio.QueueFull:
+            # Libera a fila para o aviso de encerramento: o que estava nela já não será entregue
+            self.atrasada = True
+            while not self.fila.empty():
+                self.fila.get_nowait()
+            self.fila.put_nowait(_ATRASADA)
+
+    async def __aiter__(self) -> AsyncIterator[DanfeRow]:
+        while True:
+            item = await self.fila.get()
+            if item is _ATRASADA:
+                raise CustomException("Assinatura encerrada: o cliente não acompanhou o volume de danfes")
+            yield item
+
+
+class DanfeEmitidaJob:
+    """
+    Leitor único, por processo, das danfes inseridas (id_danfe acima da marca d'água), repassadas às
+    assinaturas de danfeEmitida em memória: muitos assinantes custam uma só consulta a cada `intervalo`.
+    Sem assinantes, o banco não é lido e a marca é descartada; a próxima assinatura começa do id atual.
+    Ids que ficam visíveis depois de a marca passar por eles (transações concorrentes) são procurados de novo
+    por `espera` segundos e entregues quando aparecem, fora da ordem de id_danfe
+    """
+
+    def __init__(self, intervalo: float, lote: int, fila: int, espera: float):
+        self.intervalo = intervalo
+        self.lote = lote
+        self.fila = fila
+        self._assinaturas: dict[str | None, set[Assinatura]] = {}
+        self._marca = MarcaHelper(espera=espera, salto_maximo=lote)
+        self._task: asyncio.Task | None = None
+
+    @property
+    def assinantes(self) -> int:
+        return sum(len(assinaturas) for assinaturas in self._assinaturas.values())
+
+    @asynccontextmanager
+    async def assinar(self, cnpj: str | None = None, uf: str | None = None):
+        assinatura = Assinatura(cnpj=cnpj, uf=uf, tamanho=self.fila)
+        # Indexadas por cnpj: cada danfe só passa pelas assinaturas do seu cnpj e pelas sem cnpj
+        self._assinaturas.setdefault(cnpj, set()).add(assinatura)
+        try:
+            yield assinatura
+        finally:
+            assinaturas = self._assinaturas[cnpj]
+            assinaturas.discard(assinatura)
+            if not assinaturas:
+                del self._assinaturas[cnpj]
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="danfe-emitida")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._poll()
+            except Exception:
+                # Falhas (ex.: banco indisponível) não derrubam o job: a próxima leitura tenta de novo da mesma marca
+                logger.exception("Falha ao ler as danfes emitidas")
+
+            await asyncio.sleep(self.intervalo)
+
+    async def _poll(self) -> None:
+        if not self._assinaturas:
+            self._marca.reiniciar()
+            return
+
+        async with get_read_session() as session:
+            service = DanfeService(session=session)
+
+            if self._marca.marca is None:
+                self._marca.reiniciar(marca=await service.get_ultimo_id())
+                return
+
+            pendentes = self._marca.pendentes
+            if pendentes:
+                encontradas = await service.get_danfes_emitidas_pendentes(ids=pendentes)
+                self._marca.encontrados(id_danfe for id_danfe, _ in encontradas)
+                for _, item in encontradas:
+                    self._publicar(item)
+
+            # Lotes seguidos até alcançar o fim: uma rajada de inserções não espera vários intervalos
+            while self._assinaturas:
+                emitidas = await service.get_danfes_emitidas(id_inicio=self._marca.marca, limit=self.lote)
+                for _, item in emitidas:
+                    self._publicar(item)
+                self._marca.avancar(id_danfe for id_danfe, _ in emitidas)
+
+                if len(emitidas) < self.lote:
+                    return
+
+                # Cede o loop para os assinantes consumirem entre os lotes
+                await asyncio.sleep(0)
+
+    def _publicar(self, item: DanfeRow) -> None:
+        for cnpj in (item.cnpj_contribuinte, None):
+            for assinatura in self._assinaturas.get(cnpj, ()):
+                assinatura.publicar(item)
+
+
+danfe_emitida_job = DanfeEmitidaJob(
+    intervalo=config.DANFE_EMITIDA_INTERVALO,
+    lote=config.DANFE_EMITIDA_LOTE,
+    fila=config.DANFE_EMITIDA_FILA,
+    espera=config.DANFE_EMITIDA_ESPERA,
+)
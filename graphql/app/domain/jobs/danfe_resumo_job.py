@@ -0,0 +1,61 @@
+import asyncio
+import logging
+import time
+
+from app.database.core.db import get_db_session
+from app.domain.helpers.marca_helper import MarcaHelper
+from app.domain.helpers.resumo_helper import resumo_mensal
+from app.domain.services.danfe_resumo_service import DanfeResumoService
+
+logger = logging.getLogger(__name__)
+
+
+class DanfeResumoJob:
+    """
+    Mantém o resumo mensal em segundo plano: atualização incremental a cada `intervalo` segundos, pelo log de
+    alterações (até `lote` linhas por leitura; ids pulados procurados de novo por `espera` segundos),
+    e reconstrução completa a cada `reconstrucao` segundos (0 desliga a reconstrução periódica).
+    O primeiro ciclo constrói o resumo se ele nunca foi construído; só então a agregação passa a lê-lo
+    """
+
+    def __init__(self, intervalo: float, reconstrucao: float, lote: int, espera: float):
+        self.intervalo = intervalo
+        self.reconstrucao = reconstrucao
+        self.lote = lote
+        self._marca = MarcaHelper(espera=espera, salto_maximo=lote)
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="danfe-resumo-mensal")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        ultima_reconstrucao = time.monotonic()
+
+        while True:
+            try:
+                async with get_db_session() as session:
+                    service = DanfeResumoService(session=session)
+
+                    if self.reconstrucao and time.monotonic() - ultima_reconstrucao >= self.reconstrucao:
+                        await service.rebuild_resumo()
+                        ultima_reconstrucao = time.monotonic()
+                    else:
+                        await service.update_resumo(marca=self._marca, lote=self.lote)
+                resumo_mensal.pronto = True
+            except Exception:
+                # Falhas (ex.: banco indisponível) não derrubam o job: a próxima execução tenta de novo
+                logger.exception("Falha ao atualizar o resumo mensal de danfes")
+
+            await asyncio.sleep(self.intervalo)
@@ -0,0 +1,55 @@
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Alteracao:
+    """
+    Linha inserida, alterada ou excluída: a entidade (contribuinte, endereco, danfe) e o cnpj do contribuinte
+    """
+
+    entidade: str
+    cnpj: str
+
+
+Assinante = Callable[[list[Alteracao]], Awaitable[None]]
+
+
+class AlteracaoNotifier(ABC):
+    """
+    Origem das notificações de alteração nos dados, repassadas aos assinantes (ex.: invalidação do cache).
+    `notificar` publica as escritas feitas por este processo assim que são confirmadas; as implementações
+    que enxergam o banco (ex.: log preenchido por triggers) publicam também as escritas dos demais processos
+    """
+
+    def __init__(self):
+        self._assinantes: list[Assinante] = []
+
+    def assinar(self, assinante: Assinante) -> None:
+        self._assinantes.append(assinante)
+
+    async def notificar(self, alteracoes: Iterable[Alteracao]) -> None:
+        # Chamado depois do commit; uma falha aqui não desfaz a escrita, então só é registrada
+        try:
+            await self._publicar(alteracoes)
+        except Exception:
+            logger.exception("Falha ao publicar alterações")
+
+    @abstractmethod
+    def start(self) -> None: ...
+
+    @abstractmethod
+    async def stop(self) -> None: ...
+
+    async def _publicar(self, alteracoes: Iterable[Alteracao]) -> None:
+        # Sem repetições: um lote de ingestão altera muitas linhas do mesmo contribuinte
+        unicas = list(dict.fromkeys(alteracoes))
+        if not unicas:
+            return
+
+        for assinante in self._assinantes:
+            await assinante(unicas)
@@ -0,0 +1,25 @@
+from app.core import config
+from app.core.cache.cache_tags import CacheTags
+from app.core.cache.read_through_cache import cache
+from app.domain.notifiers.alteracao_notifier import Alteracao, AlteracaoNotifier
+from app.domain.notifiers.local_alteracao_notifier import LocalAlteracaoNotifier
+from app.domain.notifiers.tabela_alteracao_notifier import TabelaAlteracaoNotifier
+
+
+async def _invalidar_cache(alteracoes: list[Alteracao]) -> None:
+    tags = {tag for alteracao in alteracoes for tag in CacheTags.alteracao(alteracao.entidade, alteracao.cnpj)}
+    await cache.invalidate(tags)
+
+
+def _build_notifier() -> AlteracaoNotifier:
+    if config.CACHE_INVALIDACAO == "tabela":
+        return TabelaAlteracaoNotifier(
+            intervalo=config.CACHE_INVALIDACAO_INTERVALO,
+            lote=config.CACHE_INVALIDACAO_LOTE,
+            espera=config.CACHE_INVALIDACAO_ESPERA,
+        )
+    return LocalAlteracaoNotifier()
+
+
+alteracao_notifier = _build_notifier()
+alteracao_notifier.assinar(_invalidar_cache)
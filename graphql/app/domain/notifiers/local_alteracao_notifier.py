@@ -0,0 +1,14 @@
+from app.domain.notifiers.alteracao_notifier import AlteracaoNotifier
+
+
+class LocalAlteracaoNotifier(AlteracaoNotifier):
+    """
+    Só as escritas deste processo (`notificar`), sem ler o banco. Atende um único processo com o cache em memória
+    (desenvolvimento, testes); com vários workers, réplicas ou escritas fora da API, use o log de alterações
+    """
+
+    def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
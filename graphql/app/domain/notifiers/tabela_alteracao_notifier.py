@@ -0,0 +1,76 @@
+import asyncio
+import logging
+
+from app.database.core.db import get_read_session
+from app.domain.helpers.marca_helper import MarcaHelper
+from app.domain.notifiers.alteracao_notifier import AlteracaoNotifier
+from app.domain.services.alteracao_service import AlteracaoService
+
+logger = logging.getLogger(__name__)
+
+
+class TabelaAlteracaoNotifier(AlteracaoNotifier):
+    """
+    Lê, a cada `intervalo`, o log nota_fiscal.alteracao (preenchido por triggers na mesma transação da escrita)
+    acima da marca d'água e publica as alterações: cada processo enxerga as escritas de todos, inclusive as feitas
+    fora da API. O log é lido na réplica, que só o recebe junto com os dados alterados.
+    Ids pulados pela marca (transação confirmada depois de um id maior) são procurados de novo por `espera`
+    segundos; saltos maiores que `lote` são tratados como ids descartados pela sequência.
+    O log é apagado pelo AlteracaoLimpezaJob
+    """
+
+    def __init__(self, intervalo: float, lote: int, espera: float):
+        super().__init__()
+        self.intervalo = intervalo
+        self.lote = lote
+        self._marca = MarcaHelper(espera=espera, salto_maximo=lote)
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="alteracoes")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._poll()
+            except Exception:
+                # Falhas (ex.: banco indisponível) não derrubam o leitor: a próxima leitura tenta de novo da mesma marca
+                logger.exception("Falha ao ler o log de alterações")
+
+            await asyncio.sleep(self.intervalo)
+
+    async def _poll(self) -> None:
+        async with get_read_session() as session:
+            service = AlteracaoService(session=session)
+
+            # Começa do fim do log: o que mudou antes da partida já estava no banco quando o cache foi preenchido
+            if self._marca.marca is None:
+                self._marca.reiniciar(marca=await service.get_ultimo_id())
+                return
+
+            pendentes = self._marca.pendentes
+            if pendentes:
+                encontradas = await service.get_alteracoes_pendentes(ids=pendentes)
+                self._marca.encontrados(id_alteracao for id_alteracao, _ in encontradas)
+                await self._publicar(alteracao for _, alteracao in encontradas)
+
+            # Lotes seguidos até alcançar o fim: uma rajada de escritas não espera vários intervalos
+            while True:
+                alteracoes = await service.get_alteracoes(id_inicio=self._marca.marca, limit=self.lote)
+                await self._publicar(alteracao for _, alteracao in alteracoes)
+                self._marca.avancar(id_alteracao for id_alteracao, _ in alteracoes)
+
+                if len(alteracoes) < self.lote:
+                    return
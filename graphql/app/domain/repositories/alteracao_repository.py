@@ -0,0 +1,38 @@
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import metrics
+from app.domain.builders.alteracao_builder import AlteracaoBuilder
+
+
+class AlteracaoRepository:
+    """
+    Log de alterações (nota_fiscal.alteracao) lido pela invalidação do cache: sempre no banco, sem cache
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_alteracoes(self, id_inicio: int, limit: int) -> list[dict[str, Any]]:
+        statement, parameters = AlteracaoBuilder.Alteracoes.build_statement(id_inicio=id_inicio, limit=limit)
+        return await self._all(statement=statement, parameters=parameters)
+
+    async def get_alteracoes_pendentes(self, ids: list[int]) -> list[dict[str, Any]]:
+        statement, parameters = AlteracaoBuilder.Pendentes.build_statement(ids=ids)
+        return await self._all(statement=statement, parameters=parameters)
+
+    async def get_ultimo_id(self) -> int | None:
+        statement, parameters = AlteracaoBuilder.UltimoId.build_statement()
+        result = await self.session.execute(statement=statement, params=parameters)
+        return result.scalar_one()
+
+    async def delete_alteracoes(self, id_fim: int) -> None:
+        statement, parameters = AlteracaoBuilder.Limpeza.build_statement(id_fim=id_fim)
+        await self.session.execute(statement=statement, params=parameters)
+
+    async def _all(self, statement: Any, parameters: dict[str, Any]) -> list[dict[str, Any]]:
+        result = await self.session.execute(statement=statement, params=parameters)
+        rows = [dict(row) for row in result.mappings().all()]
+        metrics.rows(statement, len(rows))
+        return rows
@@ -2,8 +2,12 @@ from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache.cache_tags import CacheTags
+from app.core.cache.read_through_cache import cache
+from app.core.metrics import metrics
 from app.domain.builders.contribuinte_builder import ContribuinteBuilder
-from app.presentation.filters.contribuinte_filter import ContribuinteFilter, ContribuintesFilter
+from app.domain.repositories.helpers.batch_helper import BatchHelper
+from app.presentation.filters.contribuinte_filter import ContribuintesFilter
 
 
 class ContribuinteRepository:
@@ -11,24 +15,62 @@ class ContribuinteRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_contribuinte(self, filtro: ContribuinteFilter) -> dict[str, Any] | None:
-        statement, parameters = ContribuinteBuilder.Contribuinte.build_statement(filtro=filtro)
+    async def get_contribuintes_lote(self, cnpjs: list[str]) -> list[dict[str, Any]]:
+        statement, parameters = ContribuinteBuilder.ContribuinteLote.build_statement(cnpjs=cnpjs)
 
-        result = await self.session.execute(statement=statement, params=parameters)
-        return result.mappings().first()
+        return await cache.get_or_load(
+            entity="contribuinte",
+            statement=statement,
+            parameters=parameters,
+            loader=lambda: self._all(statement=statement, parameters=parameters),
+            tags=lambda _: CacheTags.cnpjs(cnpjs),
+        )
 
     async def get_contribuintes(
         self,
         *,
         filtro: ContribuintesFilter,
-        offset: int,
+        after: dict[str, Any] | None,
         limit: int,
+        campos: set[str] | None = None,
     ) -> list[dict[str, Any]] | None:
         statement, parameters = ContribuinteBuilder.Contribuintes.build_statement(
             filtro=filtro,
-            offset=offset,
+            after=after,
             limit=limit,
+            campos=campos,
+        )
+
+        return await cache.get_or_load(
+            entity="contribuinte",
+            statement=statement,
+            parameters=parameters,
+            loader=lambda: self._all(statement=statement, parameters=parameters),
+            tags=lambda _: {CacheTags.entidade("contribuinte")},
         )
 
+    async def count_contribuintes(self, filtro: ContribuintesFilter) -> int:
+        statement, parameters = ContribuinteBuilder.Contribuintes.build_count_statement(filtro=filtro)
+
+        return await cache.get_or_load(
+            entity="contagem",
+            statement=statement,
+            parameters=parameters,
+            loader=lambda: self._scalar(statement=statement, parameters=parameters),
+            tags=lambda _: {CacheTags.entidade("contribuinte")},
+        )
+
+    async def merge_contribuintes(self, rows: list[dict[str, Any]]) -> list[tuple[int, str]]:
+        statement, parameters = ContribuinteBuilder.Merge.build_statement(rows=rows)
+
+        return await BatchHelper.execute_many(session=self.session, statement=statement, parameters=parameters)
+
+    async def _all(self, statement: Any, parameters: dict[str, Any]) -> list[dict[str, Any]]:
+        result = await self.session.execute(statement=statement, params=parameters)
+        rows = [dict(row) for row in result.mappings().all()]
+        metrics.rows(statement, len(rows))
+        return rows
+
+    async def _scalar(self, statement: Any, parameters: dict[str, Any]) -> Any:
         result = await self.session.execute(statement=statement, params=parameters)
-        return result.mappings().all()
+        return result.scalar_one()
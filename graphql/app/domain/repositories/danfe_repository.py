@@ -1,9 +1,15 @@
+from collections.abc import AsyncIterator
 from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache.cache_tags import CacheTags
+from app.core.cache.read_through_cache import cache
+from app.core.metrics import metrics
+from app.domain.builders.danfe_agregado_builder import DanfeAgregadoBuilder
 from app.domain.builders.danfe_builder import DanfeBuilder
-from app.presentation.filters.danfe_filter import DanfeFilter, DanfesFilter
+from app.domain.repositories.helpers.batch_helper import BatchHelper
+from app.presentation.filters.danfe_filter import DanfeAgregadoFilter, DanfesFilter
 
 
 class DanfeRepository:
@@ -11,24 +17,158 @@ class DanfeRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_danfe(self, filtro: DanfeFilter) -> dict[str, Any] | None:
-        statement, parameters = DanfeBuilder.Danfe.build_statement(filtro=filtro)
+    async def get_danfes_lote(self, numeros: list[str]) -> list[dict[str, Any]]:
+        statement, parameters = DanfeBuilder.DanfeLote.build_statement(numeros=numeros)
 
-        result = await self.session.execute(statement=statement, params=parameters)
-        return result.mappings().first()
+        return await cache.get_or_load(
+            entity="danfe",
+            statement=statement,
+            parameters=parameters,
+            loader=lambda: self._all(statement=statement, parameters=parameters),
+            tags=lambda rows: _tags_numeros(rows),
+        )
+
+    async def get_danfes_contribuintes(
+        self,
+        *,
+        cnpjs: list[str],
+        after: dict[str, Any] | None,
+        limit: int,
+        campos: set[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        statement, parameters = DanfeBuilder.DanfesContribuinte.build_statement(
+            cnpjs=cnpjs,
+            after=after,
+            limit=limit,
+            campos=campos,
+        )
+
+        return await cache.get_or_load(
+            entity="danfe",
+            statement=statement,
+            parameters=parameters,
+            loader=lambda: self._all(statement=statement, parameters=parameters),
+            tags=lambda _: CacheTags.cnpjs(cnpjs),
+        )
 
     async def get_danfes(
         self,
         *,
         filtro: DanfesFilter,
-        offset: int,
+        after: dict[str, Any] | None,
         limit: int,
+        campos: set[str] | None = None,
     ) -> list[dict[str, Any]] | None:
         statement, parameters = DanfeBuilder.Danfes.build_statement(
             filtro=filtro,
-            offset=offset,
+            after=after,
             limit=limit,
+            campos=campos,
+        )
+
+        return await cache.get_or_load(
+            entity="danfe",
+            statement=statement,
+            parameters=parameters,
+            loader=lambda: self._all(statement=statement, parameters=parameters),
+            tags=lambda _: {CacheTags.cnpj(filtro.cnpj)},
+        )
+
+    async def stream_danfes_page(
+        self,
+        *,
+        filtro: DanfesFilter,
+        after: dict[str, Any] | None,
+        limit: int,
+        campos: set[str] | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        # Entrega incremental (@stream): linha a linha, conforme chegam do cursor no servidor, sem cache
+        statement, parameters = DanfeBuilder.Danfes.build_stream_statement(
+            filtro=filtro,
+            after=after,
+            limit=limit,
+            campos=campos,
+        )
+
+        result = await self.session.stream(statement, parameters)
+        count = 0
+        try:
+            async for row in result.mappings():
+                count += 1
+                yield dict(row)
+        finally:
+            await result.close()
+            metrics.rows(statement, count)
+
+    async def count_danfes(self, filtro: DanfesFilter) -> int:
+        statement, parameters = DanfeBuilder.Danfes.build_count_statement(filtro=filtro)
+
+        return await cache.get_or_load(
+            entity="contagem",
+            statement=statement,
+            parameters=parameters,
+            loader=lambda: self._scalar(statement=statement, parameters=parameters),
+            tags=lambda _: {CacheTags.cnpj(filtro.cnpj)},
+        )
+
+    async def get_danfe_agregado(self, filtro: DanfeAgregadoFilter, limit: int) -> list[dict[str, Any]]:
+        statement, parameters = DanfeAgregadoBuilder.Agregado.build_statement(filtro=filtro, limit=limit)
+
+        return await cache.get_or_load(
+            entity="contagem",
+            statement=statement,
+            parameters=parameters,
+            loader=lambda: self._all(statement=statement, parameters=parameters),
+            tags=lambda _: _tags_agregado(filtro),
         )
 
+    async def stream_danfes(self, *, statement: Any, parameters: dict[str, Any]) -> AsyncIterator[list[dict[str, Any]]]:
+        # Exportação: cursor no servidor, sem cache; cada lote tem até EXPORT_FETCH_SIZE linhas.
+        # O statement (DanfeBuilder.Danfes.build_export_statement) vem montado: o router o monta antes da resposta
+        result = await self.session.stream(statement, parameters)
+        async for partition in result.mappings().partitions():
+            rows = [dict(row) for row in partition]
+            metrics.rows(statement, len(rows))
+            yield rows
+
+    async def get_danfes_emitidas(self, id_inicio: int, limit: int) -> list[dict[str, Any]]:
+        # Leitura da assinatura danfeEmitida: sempre no banco, sem cache
+        statement, parameters = DanfeBuilder.Emitidas.build_statement(id_inicio=id_inicio, limit=limit)
+
+        return await self._all(statement=statement, parameters=parameters)
+
+    async def get_danfes_emitidas_pendentes(self, ids: list[int]) -> list[dict[str, Any]]:
+        statement, parameters = DanfeBuilder.Emitidas.build_pendentes_statement(ids=ids)
+
+        return await self._all(statement=statement, parameters=parameters)
+
+    async def get_ultimo_id(self) -> int | None:
+        statement, parameters = DanfeBuilder.UltimoId.build_statement()
+
+        return await self._scalar(statement=statement, parameters=parameters)
+
+    async def merge_danfes(self, rows: list[dict[str, Any]]) -> list[tuple[int, str]]:
+        statement, parameters = DanfeBuilder.Merge.build_statement(rows=rows)
+
+        return await BatchHelper.execute_many(session=self.session, statement=statement, parameters=parameters)
+
+    async def _all(self, statement: Any, parameters: dict[str, Any]) -> list[dict[str, Any]]:
+        result = await self.session.execute(statement=statement, params=parameters)
+        rows = [dict(row) for row in result.mappings().all()]
+        metrics.rows(statement, len(rows))
+        return rows
+
+    async def _scalar(self, statement: Any, parameters: dict[str, Any]) -> Any:
         result = await self.session.execute(statement=statement, params=parameters)
-        return result.mappings().all()
+        return result.scalar_one()
+
+
+def _tags_numeros(rows: list[dict[str, Any]]) -> set[str]:
+    # Busca por número: uma danfe nova pode aparecer a qualquer momento
+    return CacheTags.linhas(rows) | {CacheTags.entidade("danfe")}
+
+
+def _tags_agregado(filtro: DanfeAgregadoFilter) -> set[str]:
+    if filtro.cnpj:
+        return {CacheTags.cnpj(filtro.cnpj)}
+    return {CacheTags.entidade("danfe"), CacheTags.entidade("endereco")}
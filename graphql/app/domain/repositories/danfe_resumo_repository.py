@@ -0,0 +1,35 @@
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.builders.danfe_resumo_builder import DanfeResumoBuilder
+
+
+class DanfeResumoRepository:
+    """
+    Manutenção do resumo mensal: sem cache, sempre na sessão (e transação) do chamador
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def lock_marca(self) -> int | None:
+        # None: resumo ainda não construído
+        statement, parameters = DanfeResumoBuilder.Marca.build_statement()
+        return await self._scalar(statement=statement, parameters=parameters)
+
+    async def rebuild(self, cnpjs: list[str] | None = None) -> None:
+        # Sem `cnpjs`, o resumo inteiro
+        statement, parameters = DanfeResumoBuilder.Limpeza.build_statement(cnpjs=cnpjs)
+        await self.session.execute(statement=statement, params=parameters)
+
+        statement, parameters = DanfeResumoBuilder.Reconstrucao.build_statement(cnpjs=cnpjs)
+        await self.session.execute(statement=statement, params=parameters)
+
+    async def update_marca(self, ultimo_id: int) -> None:
+        statement, parameters = DanfeResumoBuilder.AtualizaMarca.build_statement(ultimo_id=ultimo_id)
+        await self.session.execute(statement=statement, params=parameters)
+
+    async def _scalar(self, statement: Any, parameters: dict[str, Any]) -> Any:
+        result = await self.session.execute(statement=statement, params=parameters)
+        return result.scalar_one()
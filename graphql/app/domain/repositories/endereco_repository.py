@@ -2,8 +2,12 @@ from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache.cache_tags import CacheTags
+from app.core.cache.read_through_cache import cache
+from app.core.metrics import metrics
 from app.domain.builders.endereco_builder import EnderecoBuilder
-from app.presentation.filters.endereco_filter import EnderecoFilter, EnderecosFilter
+from app.domain.repositories.helpers.batch_helper import BatchHelper
+from app.presentation.filters.endereco_filter import EnderecosFilter
 
 
 class EnderecoRepository:
@@ -11,24 +15,62 @@ class EnderecoRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_endereco(self, filtro: EnderecoFilter) -> dict[str, Any] | None:
-        statement, parameters = EnderecoBuilder.Endereco.build_statement(filtro=filtro)
+    async def get_enderecos_lote(self, cnpjs: list[str]) -> list[dict[str, Any]]:
+        statement, parameters = EnderecoBuilder.EnderecoLote.build_statement(cnpjs=cnpjs)
 
-        result = await self.session.execute(statement=statement, params=parameters)
-        return result.mappings().first()
+        return await cache.get_or_load(
+            entity="endereco",
+            statement=statement,
+            parameters=parameters,
+            loader=lambda: self._all(statement=statement, parameters=parameters),
+            tags=lambda _: CacheTags.cnpjs(cnpjs),
+        )
 
     async def get_enderecos(
         self,
         *,
         filtro: EnderecosFilter,
-        offset: int,
+        after: dict[str, Any] | None,
         limit: int,
+        campos: set[str] | None = None,
     ) -> list[dict[str, Any]] | None:
         statement, parameters = EnderecoBuilder.Enderecos.build_statement(
             filtro=filtro,
-            offset=offset,
+            after=after,
             limit=limit,
+            campos=campos,
+        )
+
+        return await cache.get_or_load(
+            entity="endereco",
+            statement=statement,
+            parameters=parameters,
+            loader=lambda: self._all(statement=statement, parameters=parameters),
+            tags=lambda _: {CacheTags.entidade("endereco")},
         )
 
+    async def count_enderecos(self, filtro: EnderecosFilter) -> int:
+        statement, parameters = EnderecoBuilder.Enderecos.build_count_statement(filtro=filtro)
+
+        return await cache.get_or_load(
+            entity="contagem",
+            statement=statement,
+            parameters=parameters,
+            loader=lambda: self._scalar(statement=statement, parameters=parameters),
+            tags=lambda _: {CacheTags.entidade("endereco")},
+        )
+
+    async def merge_enderecos(self, rows: list[dict[str, Any]]) -> list[tuple[int, str]]:
+        statement, parameters = EnderecoBuilder.Merge.build_statement(rows=rows)
+
+        return await BatchHelper.execute_many(session=self.session, statement=statement, parameters=parameters)
+
+    async def _all(self, statement: Any, parameters: dict[str, Any]) -> list[dict[str, Any]]:
+        result = await self.session.execute(statement=statement, params=parameters)
+        rows = [dict(row) for row in result.mappings().all()]
+        metrics.rows(statement, len(rows))
+        return rows
+
+    async def _scalar(self, statement: Any, parameters: dict[str, Any]) -> Any:
         result = await self.session.execute(statement=statement, params=parameters)
-        return result.mappings().all()
+        return result.scalar_one()
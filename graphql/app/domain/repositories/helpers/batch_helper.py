@@ -0,0 +1,38 @@
+from typing import Any
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class BatchHelper:
+
+    @staticmethod
+    async def execute_many(
+        session: AsyncSession,
+        statement: Any,
+        parameters: list[dict[str, Any]],
+    ) -> list[tuple[int, str]]:
+        """
+        Executa o lote inteiro com executemany (array binding: um round-trip para todas as linhas).
+        Se o lote falhar, ele é refeito linha a linha, cada uma em um savepoint, para que as linhas
+        válidas sejam gravadas e só as inválidas voltem como erro (posição no lote, mensagem)
+        """
+        if not parameters:
+            return []
+
+        try:
+            async with session.begin_nested():
+                await session.execute(statement, parameters)
+            return []
+        except DBAPIError:
+            pass
+
+        errors = []
+        for position, row in enumerate(parameters):
+            try:
+                async with session.begin_nested():
+                    await session.execute(statement, row)
+            except DBAPIError as e:
+                errors.append((position, str(e.orig).strip()))
+
+        return errors
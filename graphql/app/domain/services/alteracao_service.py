@@ -0,0 +1,39 @@
+from typing import Any
+
+from app.domain.notifiers.alteracao_notifier import Alteracao
+from app.domain.repositories.alteracao_repository import AlteracaoRepository
+
+
+class AlteracaoService:
+
+    def __init__(self, session):
+        self.session = session
+        self.repo: AlteracaoRepository = AlteracaoRepository(session=session)
+
+    async def get_alteracoes(self, id_inicio: int, limit: int) -> list[tuple[int, Alteracao]]:
+        """
+        Alterações registradas depois de `id_inicio`, com o id_alteracao de cada uma (a marca d'água de quem lê)
+        """
+        rows = await self.repo.get_alteracoes(id_inicio=id_inicio, limit=limit)
+
+        return _alteracoes(rows)
+
+    async def get_alteracoes_pendentes(self, ids: list[int]) -> list[tuple[int, Alteracao]]:
+        rows = await self.repo.get_alteracoes_pendentes(ids=ids)
+
+        return _alteracoes(rows)
+
+    async def get_ultimo_id(self) -> int:
+        return await self.repo.get_ultimo_id() or 0
+
+    async def delete_alteracoes(self, id_fim: int) -> None:
+        try:
+            await self.repo.delete_alteracoes(id_fim=id_fim)
+            await self.session.commit()
+        except BaseException:
+            await self.session.rollback()
+            raise
+
+
+def _alteracoes(rows: list[dict[str, Any]]) -> list[tuple[int, Alteracao]]:
+    return [(row["id_alteracao"], Alteracao(entidade=row["entidade"], cnpj=row["cnpj_contribuinte"])) for row in rows]
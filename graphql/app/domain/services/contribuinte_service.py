@@ -1,8 +1,10 @@
 import logging
+from typing import Any
 
 from app.domain.repositories.contribuinte_repository import ContribuinteRepository
-from app.presentation.dtos.contribuinte_dto import ContribuinteDTO
-from app.presentation.filters.contribuinte_filter import ContribuinteFilter, ContribuintesFilter
+from app.presentation.dtos.contribuinte_dto import ContribuinteBuscaTextoRow, ContribuinteRow
+from app.presentation.enums.contribuinte_enum import ModoBusca
+from app.presentation.filters.contribuinte_filter import ContribuintesFilter
 
 logger = logging.getLogger(__name__)
 
@@ -12,28 +14,34 @@ class ContribuinteService:
     def __init__(self, session):
         self.repo: ContribuinteRepository = ContribuinteRepository(session=session)
 
-    async def get_contribuinte(self, filtro: ContribuinteFilter) -> ContribuinteDTO | None:
-        row = await self.repo.get_contribuinte(filtro=filtro)
-        if not row:
-            return None
+    async def get_contribuintes_lote(self, cnpjs: list[str]) -> list[ContribuinteRow | None]:
+        rows = await self.repo.get_contribuintes_lote(cnpjs=cnpjs)
 
-        item = ContribuinteDTO.model_validate(row)
+        items = {row["cnpj_contribuinte"]: ContribuinteRow.from_row(row) for row in rows}
 
-        return item
+        # Mantém a ordem e a quantidade das chaves pedidas, como exige o DataLoader
+        return [items.get(key) for key in cnpjs]
 
     async def get_contribuintes(
         self,
         *,
         filtro: ContribuintesFilter,
-        offset: int,
+        after: dict[str, Any] | None,
         limit: int,
-    ) -> list[ContribuinteDTO]:
+        campos: set[str] | None = None,
+    ) -> list[ContribuinteRow | ContribuinteBuscaTextoRow]:
         rows = await self.repo.get_contribuintes(
             filtro=filtro,
-            offset=offset,
+            after=after,
             limit=limit,
+            campos=campos,
         )
 
-        items = [ContribuinteDTO.model_validate(row) for row in rows]
+        # Na busca por texto a linha leva também a relevância, usada no cursor
+        row_class = ContribuinteBuscaTextoRow if ModoBusca(filtro.modo) is ModoBusca.TEXTO else ContribuinteRow
+        items = row_class.from_rows(rows)
 
         return items
+
+    async def count_contribuintes(self, filtro: ContribuintesFilter) -> int:
+        return await self.repo.count_contribuintes(filtro=filtro)
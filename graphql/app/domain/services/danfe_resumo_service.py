@@ -0,0 +1,98 @@
+import logging
+
+from app.domain.helpers.marca_helper import MarcaHelper
+from app.domain.repositories.danfe_resumo_repository import DanfeResumoRepository
+from app.domain.services.alteracao_service import AlteracaoService
+
+logger = logging.getLogger(__name__)
+
+# Contribuintes por recálculo (limite do IN no Oracle)
+_CNPJS_POR_RECALCULO = 1000
+
+
+class DanfeResumoService:
+
+    def __init__(self, session):
+        self.session = session
+        self.repo: DanfeResumoRepository = DanfeResumoRepository(session=session)
+        self.alteracoes: AlteracaoService = AlteracaoService(session=session)
+
+    async def update_resumo(self, marca: MarcaHelper, lote: int) -> int:
+        """
+        Recalcula no resumo mensal os contribuintes com danfes inseridas, alteradas ou excluídas desde a marca
+        d'água (id_alteracao do log nota_fiscal.alteracao) e avança a marca, na mesma transação.
+        Os ids que a marca pulou (transações confirmadas fora de ordem) ficam em `marca` e são procurados de
+        novo nas execuções seguintes. Devolve quantos contribuintes foram recalculados.
+        Se o resumo ainda não foi construído (marca nula, como sai do setup), reconstrói o resumo inteiro
+        """
+        try:
+            # A marca gravada prevalece: outro processo pode tê-la avançado
+            inicio = await self.repo.lock_marca()
+            if inicio is None:
+                ultimo_id = await self._rebuild()
+                await self.session.commit()
+                marca.reiniciar(marca=ultimo_id)
+                logger.info("Resumo mensal de danfes construído; log lido até o id %d", ultimo_id)
+                return 0
+
+            marca.marca = inicio
+
+            pendentes = marca.pendentes
+            encontradas = await self.alteracoes.get_alteracoes_pendentes(ids=pendentes) if pendentes else []
+            cnpjs = {alteracao.cnpj for _, alteracao in encontradas if alteracao.entidade == "danfe"}
+
+            while True:
+                alteracoes = await self.alteracoes.get_alteracoes(id_inicio=marca.marca, limit=lote)
+                cnpjs.update(alteracao.cnpj for _, alteracao in alteracoes if alteracao.entidade == "danfe")
+                marca.avancar(id_alteracao for id_alteracao, _ in alteracoes)
+
+                if len(alteracoes) < lote:
+                    break
+
+            if not cnpjs and marca.marca == inicio:
+                await self.session.rollback()
+                marca.encontrados(id_alteracao for id_alteracao, _ in encontradas)
+                return 0
+
+            ordenados = sorted(cnpjs)
+            for posicao in range(0, len(ordenados), _CNPJS_POR_RECALCULO):
+                await self.repo.rebuild(cnpjs=ordenados[posicao : posicao + _CNPJS_POR_RECALCULO])
+            await self.repo.update_marca(ultimo_id=marca.marca)
+            await self.session.commit()
+        except BaseException:
+            await self.session.rollback()
+            raise
+
+        marca.encontrados(id_alteracao for id_alteracao, _ in encontradas)
+        logger.info(
+            "Resumo mensal de danfes atualizado: %d contribuintes recalculados, log lido até o id %d",
+            len(cnpjs),
+            marca.marca,
+        )
+
+        return len(cnpjs)
+
+    async def rebuild_resumo(self) -> None:
+        """
+        Recalcula o resumo inteiro e leva a marca ao fim do log. Corrige o que o incremental não viu
+        (ex.: id pulado que só apareceu depois da espera)
+        """
+        try:
+            await self.repo.lock_marca()
+            ultimo_id = await self._rebuild()
+            await self.session.commit()
+        except BaseException:
+            await self.session.rollback()
+            raise
+
+        logger.info("Resumo mensal de danfes reconstruído; log lido até o id %d", ultimo_id)
+
+    async def _rebuild(self) -> int:
+        # Na transação do chamador, com a marca já travada; devolve a nova marca
+        # Lida antes da reconstrução: o que for registrado depois é recalculado de novo pelo incremental
+        ultimo_id = await self.alteracoes.get_ultimo_id()
+
+        await self.repo.rebuild()
+        await self.repo.update_marca(ultimo_id=ultimo_id)
+
+        return ultimo_id
@@ -1,8 +1,12 @@
 import logging
+from collections.abc import AsyncIterator
+from typing import Any
 
+from app.core import config
+from app.core.exceptions import ValidationException
 from app.domain.repositories.danfe_repository import DanfeRepository
-from app.presentation.dtos.danfe_dto import DanfeDTO
-from app.presentation.filters.danfe_filter import DanfeFilter, DanfesFilter
+from app.presentation.dtos.danfe_dto import DanfeAgregadoRow, DanfeRow
+from app.presentation.filters.danfe_filter import DanfeAgregadoFilter, DanfesFilter
 
 logger = logging.getLogger(__name__)
 
@@ -12,28 +16,98 @@ class DanfeService:
     def __init__(self, session):
         self.repo: DanfeRepository = DanfeRepository(session=session)
 
-    async def get_danfe(self, filtro: DanfeFilter) -> DanfeDTO | None:
-        row = await self.repo.get_danfe(filtro=filtro)
-        if not row:
-            return None
+    async def get_danfes_lote(self, numeros: list[str]) -> list[DanfeRow | None]:
+        rows = await self.repo.get_danfes_lote(numeros=numeros)
 
-        item = DanfeDTO.model_validate(row)
+        items = {row["numero"]: DanfeRow.from_row(row) for row in rows}
 
-        return item
+        # Mantém a ordem e a quantidade das chaves pedidas, como exige o DataLoader
+        return [items.get(key) for key in numeros]
+
+    async def get_danfes_contribuintes(
+        self,
+        *,
+        cnpjs: list[str],
+        after: dict[str, Any] | None,
+        limit: int,
+        campos: set[str] | None = None,
+    ) -> dict[str, list[DanfeRow]]:
+        rows = await self.repo.get_danfes_contribuintes(
+            cnpjs=cnpjs,
+            after=after,
+            limit=limit,
+            campos=campos,
+        )
+
+        items: dict[str, list[DanfeRow]] = {cnpj: [] for cnpj in cnpjs}
+        for row in rows:
+            items[row["cnpj_contribuinte"]].append(DanfeRow.from_row(row))
+
+        return items
 
     async def get_danfes(
         self,
         *,
         filtro: DanfesFilter,
-        offset: int,
+        after: dict[str, Any] | None,
         limit: int,
-    ) -> list[DanfeDTO]:
+        campos: set[str] | None = None,
+    ) -> list[DanfeRow]:
         rows = await self.repo.get_danfes(
             filtro=filtro,
-            offset=offset,
+            after=after,
             limit=limit,
+            campos=campos,
         )
 
-        items = [DanfeDTO.model_validate(row) for row in rows]
+        items = DanfeRow.from_rows(rows)
 
         return items
+
+    async def stream_danfes_page(
+        self,
+        *,
+        filtro: DanfesFilter,
+        after: dict[str, Any] | None,
+        limit: int,
+        campos: set[str] | None = None,
+    ) -> AsyncIterator[DanfeRow]:
+        rows = self.repo.stream_danfes_page(filtro=filtro, after=after, limit=limit, campos=campos)
+        async for row in rows:
+            yield DanfeRow.from_row(row)
+
+    async def count_danfes(self, filtro: DanfesFilter) -> int:
+        return await self.repo.count_danfes(filtro=filtro)
+
+    async def get_danfe_agregado(self, filtro: DanfeAgregadoFilter) -> list[DanfeAgregadoRow]:
+        # Um grupo a mais que o limite indica que o resultado seria truncado
+        rows = await self.repo.get_danfe_agregado(filtro=filtro, limit=config.AGREGADO_MAX_GRUPOS + 1)
+        if len(rows) > config.AGREGADO_MAX_GRUPOS:
+            raise ValidationException(
+                f"A agregação gera mais de {config.AGREGADO_MAX_GRUPOS} grupos; restrinja o filtro ou o agrupamento"
+            )
+
+        items = DanfeAgregadoRow.from_rows(rows)
+
+        return items
+
+    async def get_danfes_emitidas(self, id_inicio: int, limit: int) -> list[tuple[int, DanfeRow]]:
+        """
+        Danfes inseridas depois de `id_inicio`, com o id_danfe de cada uma (a marca d'água de quem lê)
+        """
+        rows = await self.repo.get_danfes_emitidas(id_inicio=id_inicio, limit=limit)
+
+        return [(row["id_danfe"], DanfeRow.from_row(row)) for row in rows]
+
+    async def get_danfes_emitidas_pendentes(self, ids: list[int]) -> list[tuple[int, DanfeRow]]:
+        rows = await self.repo.get_danfes_emitidas_pendentes(ids=ids)
+
+        return [(row["id_danfe"], DanfeRow.from_row(row)) for row in rows]
+
+    async def get_ultimo_id(self) -> int:
+        return await self.repo.get_ultimo_id() or 0
+
+    async def stream_danfes(self, *, statement: Any, parameters: dict[str, Any]) -> AsyncIterator[list[dict[str, Any]]]:
+        # Lotes de linhas como vêm do banco: a exportação não passa cada linha pelo DTO
+        async for rows in self.repo.stream_danfes(statement=statement, parameters=parameters):
+            yield rows
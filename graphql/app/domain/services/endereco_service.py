@@ -1,8 +1,9 @@
 import logging
+from typing import Any
 
 from app.domain.repositories.endereco_repository import EnderecoRepository
-from app.presentation.dtos.endereco_dto import EnderecoDTO
-from app.presentation.filters.endereco_filter import EnderecoFilter, EnderecosFilter
+from app.presentation.dtos.endereco_dto import EnderecoRow
+from app.presentation.filters.endereco_filter import EnderecosFilter
 
 logger = logging.getLogger(__name__)
 
@@ -12,28 +13,32 @@ class EnderecoService:
     def __init__(self, session):
         self.repo: EnderecoRepository = EnderecoRepository(session=session)
 
-    async def get_endereco(self, filtro: EnderecoFilter) -> EnderecoDTO | None:
-        row = await self.repo.get_endereco(filtro=filtro)
-        if not row:
-            return None
+    async def get_enderecos_lote(self, cnpjs: list[str]) -> list[EnderecoRow | None]:
+        rows = await self.repo.get_enderecos_lote(cnpjs=cnpjs)
 
-        item = EnderecoDTO.model_validate(row)
+        items = {row["cnpj_contribuinte"]: EnderecoRow.from_row(row) for row in rows}
 
-        return item
+        # Mantém a ordem e a quantidade das chaves pedidas, como exige o DataLoader
+        return [items.get(key) for key in cnpjs]
 
     async def get_enderecos(
         self,
         *,
         filtro: EnderecosFilter,
-        offset: int,
+        after: dict[str, Any] | None,
         limit: int,
-    ) -> list[EnderecoDTO]:
+        campos: set[str] | None = None,
+    ) -> list[EnderecoRow]:
         rows = await self.repo.get_enderecos(
             filtro=filtro,
-            offset=offset,
+            after=after,
             limit=limit,
+            campos=campos,
         )
 
-        items = [EnderecoDTO.model_validate(row) for row in rows]
+        items = EnderecoRow.from_rows(rows)
 
         return items
+
+    async def count_enderecos(self, filtro: EnderecosFilter) -> int:
+        return await self.repo.count_enderecos(filtro=filtro)
@@ -0,0 +1,94 @@
+import logging
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+
+from app.core import config
+from app.domain.notifiers.alteracao_notifier import Alteracao
+from app.domain.notifiers.invalidacao_cache import alteracao_notifier
+from app.domain.repositories.contribuinte_repository import ContribuinteRepository
+from app.domain.repositories.danfe_repository import DanfeRepository
+from app.domain.repositories.endereco_repository import EnderecoRepository
+from app.presentation.dtos.ingestao_dto import (
+    ContribuinteIngestaoDTO,
+    DanfeIngestaoDTO,
+    EnderecoIngestaoDTO,
+    ErroIngestaoDTO,
+    ResultadoIngestaoDTO,
+)
+
+logger = logging.getLogger(__name__)
+
+# (índice do registro na entrada, campos)
+Registro = tuple[int, dict[str, Any]]
+
+# Entidade -> (DTO de entrada, chave natural).
+# A ordem é a das chaves estrangeiras: contribuinte é gravado antes de endereço e danfe
+ENTIDADES: dict[str, tuple[type[BaseModel], str]] = {
+    "contribuinte": (ContribuinteIngestaoDTO, "cnpj_contribuinte"),
+    "endereco": (EnderecoIngestaoDTO, "cnpj_contribuinte"),
+    "danfe": (DanfeIngestaoDTO, "numero"),
+}
+
+
+class IngestaoService:
+
+    def __init__(self, session):
+        self.session = session
+        self._merges = {
+            "contribuinte": ContribuinteRepository(session=session).merge_contribuintes,
+            "endereco": EnderecoRepository(session=session).merge_enderecos,
+            "danfe": DanfeRepository(session=session).merge_danfes,
+        }
+
+    async def ingerir(self, lote: dict[str, list[Registro]]) -> ResultadoIngestaoDTO:
+        """
+        Valida os registros com os DTOs de entrada (campos obrigatórios, UF do enum) e grava por MERGE
+        em lotes de INGESTAO_BATCH_SIZE, com commit por lote.
+        Registros inválidos ou recusados pelo banco viram erros sem abortar o lote
+        """
+        resultado = ResultadoIngestaoDTO()
+
+        for entidade, (dto, chave) in ENTIDADES.items():
+            registros = lote.get(entidade) or []
+            resultado.recebidos += len(registros)
+
+            validos: list[Registro] = []
+            for indice, campos in registros:
+                try:
+                    item = dto.model_validate(campos)
+                except ValidationError as e:
+                    mensagem = "; ".join(f"{'.'.join(map(str, erro['loc']))}: {erro['msg']}" for erro in e.errors())
+                    resultado.erros.append(
+                        ErroIngestaoDTO(entidade=entidade, indice=indice, chave=campos.get(chave), mensagem=mensagem)
+                    )
+                    continue
+
+                validos.append((indice, item.model_dump()))
+
+            for inicio in range(0, len(validos), config.INGESTAO_BATCH_SIZE):
+                parte = validos[inicio : inicio + config.INGESTAO_BATCH_SIZE]
+
+                erros = await self._merges[entidade]([campos for _, campos in parte])
+                await self.session.commit()
+
+                # Invalida o cache dos contribuintes do lote (as linhas recusadas também: a notificação é conservadora)
+                await alteracao_notifier.notificar(
+                    Alteracao(entidade=entidade, cnpj=campos["cnpj_contribuinte"]) for _, campos in parte
+                )
+
+                resultado.gravados += len(parte) - len(erros)
+                for posicao, mensagem in erros:
+                    indice, campos = parte[posicao]
+                    resultado.erros.append(
+                        ErroIngestaoDTO(entidade=entidade, indice=indice, chave=campos[chave], mensagem=mensagem)
+                    )
+
+        logger.info(
+            "Ingestão: %d recebidos, %d gravados, %d erros",
+            resultado.recebidos,
+            resultado.gravados,
+            len(resultado.erros),
+        )
+
+        return resultado
@@ -1,60 +1,171 @@
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
 from functools import wraps
-from typing import TypeVar
+from typing import Any, Awaitable, Callable, TypeVar
 
 from strawberry.relay import Connection, Edge, PageInfo
+from strawberry.types import Info
 
 from app.core.exceptions import ValidationException
+from app.presentation.types.connection_type import CountableConnection
 from app.presentation.utils.cursor_util import Cursor
+from app.presentation.utils.selection_util import Selection
 
 T = TypeVar("T")
 
 MAX_PAGE_SIZE = 5
 
 
-def relay_connection(resolver) -> Connection[T]:
-    @wraps(resolver)
-    async def wrapper(*args, **kwargs):
-        # Normalização do first
-        first = kwargs.get("first")
-        if first is None:
-            first = MAX_PAGE_SIZE
-        elif first <= 0:
-            raise ValidationException("'first' deve ser maior que zero")
-        else:
-            first = min(first, MAX_PAGE_SIZE)
-
-        # Importante: pedimos +1 para detectar próxima página
-        kwargs["first"] = first + 1
-
-        # Decodificação do cursor
-        after = kwargs.get("after")
-        after_decoded = 0
-        if after is not None:
-            after_decoded = Cursor.decode(after)
-
-        # Chama o resolver
-        items = await resolver(*args, **kwargs)
-
-        # Detecta a próxima página
-        has_next_page = len(items) > first
-
-        # Remove o item extra e monta edges
-        items = items[:first]
-
-        edges = [Edge(node=item, cursor=Cursor.encode(after_decoded + i + 1)) for i, item in enumerate(items)]
-
-        # Monta pageInfo
-        page_info = PageInfo(
-            has_next_page=has_next_page,
-            has_previous_page=after_decoded > 0,
-            start_cursor=edges[0].cursor if edges else None,
-            end_cursor=edges[-1].cursor if edges else None,
-        )
+def relay_connection(
+    order_by: tuple[str, ...] | Callable[[dict[str, Any]], tuple[str, ...]],
+    count: Callable[[Info, Any], Awaitable[int]] | None = None,
+):
+    """
+    Monta a Connection a partir da lista devolvida pelo resolver.
+    O cursor de cada edge guarda os valores de `order_by` do item (paginação keyset); quando a ordenação
+    depende dos argumentos (ex.: modo de busca), `order_by` é uma função que os recebe e devolve as chaves.
+    Se `totalCount` for pedido, `count(info, filtro)` roda em paralelo com a consulta da página.
+    Se o resolver devolver um iterador assíncrono (edges com @stream), os edges são entregues conforme
+    os itens chegam; pageInfo só é conhecido no fim da página (ver StreamedEdges)
+    """
+
+    def decorator(resolver) -> Connection[T]:
+        @wraps(resolver)
+        async def wrapper(*args, **kwargs):
+            # Normalização do first
+            first = kwargs.get("first")
+            if first is None:
+                first = MAX_PAGE_SIZE
+            elif first <= 0:
+                raise ValidationException("'first' deve ser maior que zero")
+            else:
+                first = min(first, MAX_PAGE_SIZE)
+
+            # Importante: pedimos +1 para detectar próxima página
+            kwargs["first"] = first + 1
+
+            # Validação do cursor (o resolver o repassa decodificado ao builder)
+            after = kwargs.get("after")
+            Cursor.decode(after)
+            keys = order_by(kwargs) if callable(order_by) else order_by
+
+            # Dispara a contagem em paralelo (ela usa outra conexão do pool)
+            count_task = None
+            if count is not None and "total_count" in Selection.fields(kwargs["info"]):
+                count_task = asyncio.create_task(count(kwargs["info"], kwargs["filtro"]))
+
+            # Chama o resolver
+            try:
+                items = await resolver(*args, **kwargs)
+            except BaseException:
+                if count_task is not None:
+                    count_task.cancel()
+                raise
+
+            if isinstance(items, AsyncIterator):
+                edges = StreamedEdges(items=items, first=first, after=after, order_by=keys)
+                return CountableConnection(
+                    edges=edges,
+                    # Aguardados só quando resolvidos: a contagem e o fim do stream não atrasam os primeiros edges
+                    page_info=edges.page_info() if "page_info" in Selection.fields(kwargs["info"]) else None,
+                    total_count=count_task,
+                )
+
+            total_count = await count_task if count_task is not None else None
+
+            # Detecta a próxima página
+            has_next_page = len(items) > first
+
+            # Remove o item extra e monta edges
+            items = items[:first]
+
+            edges = [Edge(node=item, cursor=Cursor.encode({key: getattr(item, key) for key in keys})) for item in items]
+
+            # Monta pageInfo
+            page_info = PageInfo(
+                has_next_page=has_next_page,
+                has_previous_page=bool(after),
+                start_cursor=edges[0].cursor if edges else None,
+                end_cursor=edges[-1].cursor if edges else None,
+            )
 
-        # Retorna Connection
-        return Connection(
-            edges=edges,
-            page_info=page_info,
+            # Retorna Connection
+            return CountableConnection(
+                edges=edges,
+                page_info=page_info,
+                total_count=total_count,
+            )
+
+        return wrapper
+
+    return decorator
+
+
+class StreamedEdges:
+    """
+    Edges de uma página entregues conforme os itens chegam do iterador (@stream em `edges`).
+    Lê até `first` + 1 itens: o extra só indica a próxima página e não vira edge.
+    `page_info()` termina de ler a página (os edges restantes ficam em buffer para o stream),
+    então, para não atrasar o payload inicial, o cliente deve pedir pageInfo em um fragmento com @defer
+    """
+
+    def __init__(self, items: AsyncIterator[Any], first: int, after: str | None, order_by: tuple[str, ...]):
+        self._items = items
+        self._first = first
+        self._after = after
+        self._order_by = order_by
+        self._buffer: deque[Edge] = deque()
+        self._lock = asyncio.Lock()
+        self._read = 0
+        self._done = False
+        self._has_next_page = False
+        self._start_cursor: str | None = None
+        self._end_cursor: str | None = None
+
+    async def __aiter__(self) -> AsyncIterator[Edge]:
+        try:
+            while True:
+                if not self._buffer:
+                    async with self._lock:
+                        if not self._buffer and not await self._fetch():
+                            return
+                yield self._buffer.popleft()
+        finally:
+            await self._close()
+
+    async def page_info(self) -> PageInfo:
+        async with self._lock:
+            while await self._fetch():
+                pass
+
+        return PageInfo(
+            has_next_page=self._has_next_page,
+            has_previous_page=bool(self._after),
+            start_cursor=self._start_cursor,
+            end_cursor=self._end_cursor,
         )
 
-    return wrapper
+    async def _fetch(self) -> bool:
+        # Lê o próximo item para o buffer; False no fim da página (chamado com o lock)
+        if self._done:
+            return False
+
+        item = await anext(self._items, None)
+        if item is None or self._read == self._first:
+            self._has_next_page = item is not None
+            await self._close()
+            return False
+
+        self._read += 1
+        edge = Edge(node=item, cursor=Cursor.encode({key: getattr(item, key) for key in self._order_by}))
+        self._start_cursor = self._start_cursor or edge.cursor
+        self._end_cursor = edge.cursor
+        self._buffer.append(edge)
+        return True
+
+    async def _close(self) -> None:
+        # Fecha o iterador (e o cursor no servidor) assim que a página termina ou o stream é abandonado
+        if not self._done:
+            self._done = True
+            await self._items.aclose()
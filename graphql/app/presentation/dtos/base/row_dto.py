@@ -0,0 +1,75 @@
+from collections.abc import Callable, Mapping
+from datetime import date, datetime
+from operator import itemgetter
+from types import NoneType, UnionType
+from typing import Any, Self, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+# Tipos que nem todo driver devolve nativamente (o SQLite guarda datas como texto)
+_CONVERTERS: dict[type, Callable[[str], Any]] = {
+    datetime: datetime.fromisoformat,
+    date: date.fromisoformat,
+}
+
+
+class RowDTO(tuple):
+    """
+    Linha do banco como tupla imutável com os campos do DTO de `model`, lidos por atributo.
+    Montada direto do mapping do repositório, sem validação: a linha já vem tipada pelo banco e
+    o DTO Pydantic continua sendo o schema (tipos Strawberry, exportação) e a validação das entradas.
+    Cada tipo Strawberry declara a sua classe de linha com strawberry.cast para aceitá-la no lugar do DTO
+    """
+
+    __slots__ = ()
+
+    _fields: tuple[str, ...] = ()
+    _converters: tuple[tuple[int, Callable[[str], Any]], ...] = ()
+
+    def __init_subclass__(cls, model: type[BaseModel], **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        cls._fields = tuple(model.model_fields)
+        for index, name in enumerate(cls._fields):
+            if hasattr(tuple, name):
+                raise TypeError(f"O campo {model.__name__}.{name} conflita com um atributo de tuple")
+            setattr(cls, name, property(itemgetter(index), doc=name))
+
+        cls._converters = tuple(
+            (index, _CONVERTERS[kind])
+            for index, field in enumerate(model.model_fields.values())
+            if (kind := _base_type(field.annotation)) in _CONVERTERS
+        )
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> Self:
+        # Campos fora da projeção (ver `campos` nos builders) ficam None, como no DTO
+        values = tuple(map(row.get, cls._fields))
+        for index, _ in cls._converters:
+            if isinstance(values[index], str):
+                return tuple.__new__(cls, cls._convert(values))
+        return tuple.__new__(cls, values)
+
+    @classmethod
+    def _convert(cls, values: tuple[Any, ...]) -> list[Any]:
+        converted = list(values)
+        for index, converter in cls._converters:
+            if isinstance(converted[index], str):
+                converted[index] = converter(converted[index])
+        return converted
+
+    @classmethod
+    def from_rows(cls, rows: list[Mapping[str, Any]]) -> list[Self]:
+        return [cls.from_row(row) for row in rows]
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value in zip(self._fields, self))
+        return f"{type(self).__name__}({fields})"
+
+
+def _base_type(annotation: Any) -> Any:
+    # `datetime | None` -> datetime
+    if get_origin(annotation) in (Union, UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not NoneType]
+        return args[0] if len(args) == 1 else annotation
+    return annotation
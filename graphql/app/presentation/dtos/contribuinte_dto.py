@@ -1,6 +1,21 @@
 from pydantic import BaseModel
 
+from app.presentation.dtos.base.row_dto import RowDTO
+
 
 class ContribuinteDTO(BaseModel):
-    cnpj_contribuinte: str | None
-    nm_fantasia: str | None
+    cnpj_contribuinte: str | None = None
+    nm_fantasia: str | None = None
+
+
+class ContribuinteBuscaTextoDTO(ContribuinteDTO):
+    # Só na busca por texto (modo TEXTO): a nota do Oracle Text ordena a página e vai para o cursor, fora do schema
+    relevancia: float | None = None
+
+
+class ContribuinteRow(RowDTO, model=ContribuinteDTO):
+    __slots__ = ()
+
+
+class ContribuinteBuscaTextoRow(RowDTO, model=ContribuinteBuscaTextoDTO):
+    __slots__ = ()
@@ -2,13 +2,39 @@ from datetime import datetime
 
 from pydantic import BaseModel
 
+from app.presentation.dtos.base.row_dto import RowDTO
+
 
 class DanfeDTO(BaseModel):
-    cnpj_contribuinte: str | None
-    nm_fantasia: str | None
-    numero: str | None
-    valor_total: float | None
-    data_emissao: datetime | None
-    logradouro: str | None
-    municipio: str | None
-    uf: str | None
+    cnpj_contribuinte: str | None = None
+    nm_fantasia: str | None = None
+    numero: str | None = None
+    valor_total: float | None = None
+    data_emissao: datetime | None = None
+    logradouro: str | None = None
+    municipio: str | None = None
+    uf: str | None = None
+
+
+class DanfeRow(RowDTO, model=DanfeDTO):
+    __slots__ = ()
+
+
+class DanfeAgregadoDTO(BaseModel):
+    # Dimensões: preenchidas apenas as pedidas em agruparPor
+    cnpj_contribuinte: str | None = None
+    ano: int | None = None
+    mes: int | None = None
+    uf: str | None = None
+    municipio: str | None = None
+
+    # Métricas de valor_total no grupo
+    quantidade: int
+    soma: float | None = None
+    media: float | None = None
+    minimo: float | None = None
+    maximo: float | None = None
+
+
+class DanfeAgregadoRow(RowDTO, model=DanfeAgregadoDTO):
+    __slots__ = ()
@@ -1,8 +1,14 @@
 from pydantic import BaseModel
 
+from app.presentation.dtos.base.row_dto import RowDTO
+
 
 class EnderecoDTO(BaseModel):
-    cnpj_contribuinte: str | None
-    logradouro: str | None
-    municipio: str | None
-    uf: str | None
+    cnpj_contribuinte: str | None = None
+    logradouro: str | None = None
+    municipio: str | None = None
+    uf: str | None = None
+
+
+class EnderecoRow(RowDTO, model=EnderecoDTO):
+    __slots__ = ()
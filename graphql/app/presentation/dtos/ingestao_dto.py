@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+from app.presentation.enums.endereco_enum import UF
+
+
+class ErroIngestaoDTO(BaseModel):
+    entidade: str | None = None
+    indice: int
+    chave: str | None = None
+    mensagem: str
+
+
+class ResultadoIngestaoDTO(BaseModel):
+    recebidos: int = 0
+    gravados: int = 0
+    erros: list[ErroIngestaoDTO] = []
+
+
+# Registros de entrada da ingestão: só as colunas gravadas, todas obrigatórias (NOT NULL nas tabelas)
+class ContribuinteIngestaoDTO(BaseModel):
+    cnpj_contribuinte: str
+    nm_fantasia: str
+
+
+class EnderecoIngestaoDTO(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+
+    cnpj_contribuinte: str
+    logradouro: str
+    municipio: str
+    uf: UF
+
+
+class DanfeIngestaoDTO(BaseModel):
+    cnpj_contribuinte: str
+    numero: str
+    valor_total: float
+    data_emissao: datetime
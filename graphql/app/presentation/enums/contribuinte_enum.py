@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class ModoBusca(Enum):
+    PREFIXO = "PREFIXO"  # Início do nome, sem acentos e sem diferenciar maiúsculas (índice na coluna normalizada)
+    CONTEM = "CONTEM"  # Trecho em qualquer posição do nome (LIKE com curinga inicial)
+    TEXTO = "TEXTO"  # Palavras do nome, ordenadas por relevância (índice Oracle Text)
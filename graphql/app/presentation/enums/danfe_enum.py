@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class AgrupamentoDanfe(Enum):
+    CNPJ = "CNPJ"  # Contribuinte emitente
+    ANO = "ANO"  # Ano de emissão
+    MES = "MES"  # Mês de emissão (1 a 12); combinado com ANO forma a série mensal
+    UF = "UF"  # UF do endereço do contribuinte
+    MUNICIPIO = "MUNICIPIO"  # Município do endereço do contribuinte
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class FormatoExportacao(Enum):
+    NDJSON = "ndjson"  # Um objeto JSON por linha
+    CSV = "csv"  # Cabeçalho com os nomes das colunas na primeira linha
+    PARQUET = "parquet"  # Colunar; requer o pacote opcional `pyarrow`
@@ -0,0 +1,82 @@
+from datetime import date
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+
+from app.database.core.db import get_read_session
+from app.domain.builders.danfe_builder import DanfeBuilder
+from app.domain.services.danfe_service import DanfeService
+from app.presentation.dtos.danfe_dto import DanfeDTO
+from app.presentation.enums.export_enum import FormatoExportacao
+from app.presentation.filters.danfe_filter import DanfesFilter
+from app.presentation.utils.export_util import MEDIA_TYPES, Export
+
+
+def _campos(campos: str | None) -> set[str] | None:
+    if not campos:
+        return None
+
+    selecionados = {campo.strip() for campo in campos.split(",") if campo.strip()}
+    desconhecidos = selecionados - DanfeDTO.model_fields.keys()
+    if desconhecidos:
+        raise HTTPException(status_code=422, detail=f"Campos desconhecidos: {', '.join(sorted(desconhecidos))}")
+
+    return selecionados
+
+
+def get_export_router() -> tuple[str, APIRouter]:
+    router = APIRouter()
+
+    @router.get("/danfes")
+    async def export_danfes(
+        request: Request,
+        cnpj: str,
+        formato: FormatoExportacao = FormatoExportacao.NDJSON,
+        ano: int | None = None,
+        dataInicio: date | None = None,
+        dataFim: date | None = None,
+        valorMinimo: float | None = None,
+        valorMaximo: float | None = None,
+        campos: str | None = Query(default=None, description="Colunas separadas por vírgula (padrão: todas)"),
+    ) -> StreamingResponse:
+        """
+        Todos os danfes do filtro em uma única resposta, sem paginação, codificados à medida que são lidos.
+        O próximo lote só é buscado quando o cliente consome o anterior
+        """
+        try:
+            filtro = DanfesFilter(
+                cnpj=cnpj,
+                ano=ano,
+                dataInicio=dataInicio,
+                dataFim=dataFim,
+                valorMinimo=valorMinimo,
+                valorMaximo=valorMaximo,
+            )
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=422, detail=e.errors(include_url=False, include_context=False, include_input=False)
+            )
+
+        if not Export.available(formato):
+            raise HTTPException(status_code=501, detail=f"Formato '{formato.value}' indisponível neste servidor")
+
+        selecionados = _campos(campos)
+        colunas = DanfeBuilder.Danfes.export_columns(selecionados)
+        # Montado antes da resposta: uma falha aqui vira erro, e não um 200 com o corpo vazio
+        statement, parameters = DanfeBuilder.Danfes.build_export_statement(filtro=filtro, campos=selecionados)
+
+        async def batches():
+            # A sessão (e sua conexão) vive enquanto a resposta é transmitida
+            async with get_read_session(request) as session:
+                service = DanfeService(session=session)
+                async for rows in service.stream_danfes(statement=statement, parameters=parameters):
+                    yield rows
+
+        return StreamingResponse(
+            content=Export.encode(formato, batches(), DanfeDTO, columns=colunas),
+            media_type=MEDIA_TYPES[formato],
+            headers={"Content-Disposition": f'attachment; filename="danfes-{cnpj}.{formato.value}"'},
+        )
+
+    return "/export", router
@@ -0,0 +1,45 @@
+import time
+from collections.abc import Iterator
+from inspect import isawaitable
+from typing import Any
+
+from strawberry.extensions import SchemaExtension
+
+from app.core.metrics import metrics
+
+
+class MetricsExtension(SchemaExtension):
+    """
+    Total e duração das operações por nome (limitado, ver Metrics.operation) e latência dos resolvers assíncronos
+    por campo (Tipo.campo).
+    Campos resolvidos de forma síncrona (atributos já carregados) não são medidos: só pagam um isawaitable
+    """
+
+    def on_operation(self) -> Iterator[None]:
+        start = time.perf_counter()
+
+        yield
+
+        execution_context = self.execution_context
+        operation = metrics.operation(execution_context.operation_name)
+        operation_type = execution_context.operation_type.value if execution_context.operation_type else "invalida"
+        # Com @defer/@stream, o status é o do payload inicial
+        result = getattr(execution_context.result, "initial_result", execution_context.result)
+        status = "erro" if result is None or result.errors else "ok"
+
+        metrics.requests.labels(operation, operation_type, status).inc()
+        metrics.request_duration.labels(operation).observe(time.perf_counter() - start)
+
+    def resolve(self, _next, root, info, *args, **kwargs) -> Any:
+        result = _next(root, info, *args, **kwargs)
+        if isawaitable(result):
+            return self._timed(result, f"{info.parent_type.name}.{info.field_name}")
+        return result
+
+    @staticmethod
+    async def _timed(result, field: str) -> Any:
+        start = time.perf_counter()
+        try:
+            return await result
+        finally:
+            metrics.resolver_duration.labels(field).observe(time.perf_counter() - start)
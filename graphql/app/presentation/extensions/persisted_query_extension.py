@@ -0,0 +1,146 @@
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from graphql import DocumentNode, GraphQLError, OperationDefinitionNode, parse
+from strawberry.extensions import SchemaExtension
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PersistedQuery:
+    query: str
+    document: DocumentNode
+    validated: bool = False
+
+
+class PersistedQueryStore:
+    """
+    Documentos já parseados (e validados) indexados pelo SHA-256 do texto da consulta.
+    Entradas do manifesto ficam fixas; as demais ficam em um LRU limitado
+    """
+
+    def __init__(self, max_entries: int, allow_list_only: bool = False):
+        self.max_entries = max_entries
+        self.allow_list_only = allow_list_only
+        self._manifest: dict[str, PersistedQuery] = {}
+        self._lru: OrderedDict[str, PersistedQuery] = OrderedDict()
+
+    def load_manifest(self, path: str) -> None:
+        # Formato: {"<sha256>": "<documento GraphQL>", ...}
+        with open(path, encoding="utf-8") as file:
+            manifest: dict[str, str] = json.load(file)
+
+        for query_hash, query in manifest.items():
+            if self.hash(query) != query_hash:
+                raise RuntimeError(f"Hash do manifesto não confere com a consulta: {query_hash}")
+            self._manifest[query_hash] = PersistedQuery(query=query, document=parse(query))
+
+        logger.info("Manifesto de consultas persistidas carregado: %d documentos", len(self._manifest))
+
+    def operation_names(self) -> set[str]:
+        # Operações nomeadas dos documentos do manifesto
+        return {
+            definition.name.value
+            for persisted in self._manifest.values()
+            for definition in persisted.document.definitions
+            if isinstance(definition, OperationDefinitionNode) and definition.name is not None
+        }
+
+    def get(self, query_hash: str) -> PersistedQuery | None:
+        persisted = self._manifest.get(query_hash)
+        if persisted is not None:
+            return persisted
+
+        persisted = self._lru.get(query_hash)
+        if persisted is not None:
+            self._lru.move_to_end(query_hash)
+
+        return persisted
+
+    def put(self, query_hash: str, persisted: PersistedQuery) -> None:
+        if query_hash in self._manifest:
+            return
+
+        self._lru[query_hash] = persisted
+        self._lru.move_to_end(query_hash)
+
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def is_allowed(self, query_hash: str) -> bool:
+        return not self.allow_list_only or query_hash in self._manifest
+
+    @staticmethod
+    def hash(query: str) -> str:
+        return hashlib.sha256(query.encode()).hexdigest()
+
+
+class PersistedQueryExtension(SchemaExtension):
+    """
+    Automatic Persisted Queries: o cliente pode enviar só `extensions.persistedQuery.sha256Hash`.
+    O documento parseado e validado é reaproveitado entre requisições, pulando parse e validação
+    """
+
+    def __init__(self, store: PersistedQueryStore):
+        super().__init__()
+        self.store = store
+        self._hash: str | None = None
+        self._cached: PersistedQuery | None = None
+
+    def on_operation(self) -> Iterator[None]:
+        execution_context = self.execution_context
+        persisted_query = (execution_context.operation_extensions or {}).get("persistedQuery") or {}
+        provided_hash = persisted_query.get("sha256Hash")
+
+        if execution_context.query:
+            self._hash = self.store.hash(execution_context.query)
+            if provided_hash and provided_hash != self._hash:
+                raise GraphQLError(
+                    "provided sha does not match query",
+                    extensions={"code": "PERSISTED_QUERY_HASH_MISMATCH"},
+                )
+        elif provided_hash:
+            self._hash = provided_hash
+
+        if self._hash is not None:
+            if not self.store.is_allowed(self._hash):
+                raise GraphQLError("Consulta não permitida", extensions={"code": "PERSISTED_QUERY_NOT_ALLOWED"})
+
+            self._cached = self.store.get(self._hash)
+            if self._cached is not None:
+                execution_context.query = self._cached.query
+                execution_context.graphql_document = self._cached.document
+            elif not execution_context.query:
+                # Protocolo APQ: o cliente reenvia a consulta completa junto com o hash
+                raise GraphQLError("PersistedQueryNotFound", extensions={"code": "PERSISTED_QUERY_NOT_FOUND"})
+
+        yield
+
+    def on_validate(self) -> Iterator[None]:
+        execution_context = self.execution_context
+
+        # Documento já validado: a validação padrão é pulada quando pre_execution_errors não é None
+        if self._cached is not None and self._cached.validated:
+            execution_context.pre_execution_errors = []
+
+        yield
+
+        if self._hash is None or execution_context.pre_execution_errors:
+            return
+
+        if self._cached is not None:
+            self._cached.validated = True
+        else:
+            self.store.put(
+                self._hash,
+                PersistedQuery(
+                    query=execution_context.query,
+                    document=execution_context.graphql_document,
+                    validated=True,
+                ),
+            )
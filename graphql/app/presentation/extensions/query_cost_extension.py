@@ -0,0 +1,201 @@
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from graphql import (
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLObjectType,
+    GraphQLSchema,
+    InlineFragmentNode,
+    IntValueNode,
+    SelectionSetNode,
+    VariableNode,
+    get_named_type,
+    get_nullable_type,
+    get_operation_ast,
+    is_list_type,
+)
+from strawberry.extensions import SchemaExtension
+
+from app.presentation.decorators.relay_connection_decorator import MAX_PAGE_SIZE
+
+# Custo estático por campo. Campo que devolve objeto custa 1 (uma consulta ou uma chave de DataLoader),
+# escalar custa 0; os campos estruturais da Connection não acessam o banco e o totalCount dispara um COUNT
+FIELD_COSTS = {
+    "edges": 0,
+    "node": 0,
+    "pageInfo": 0,
+    "totalCount": 1,
+}
+OBJECT_COST = 1
+SCALAR_COST = 0
+
+# Consultas raiz resolvidas por DataLoader: os aliases de um painel viram uma única consulta em lote (IN),
+# então contam no custo, mas não no limite de aliases
+BATCHED_ROOT_FIELDS = frozenset({"contribuinte", "danfe", "endereco"})
+
+
+@dataclass
+class QueryCost:
+    cost: int = 0
+    depth: int = 0
+    aliases: int = 0
+
+
+class QueryCostExtension(SchemaExtension):
+    """
+    Análise estática do documento antes da execução: custo (listas multiplicadas por `first`),
+    profundidade e quantidade de aliases (exceto os de BATCHED_ROOT_FIELDS). Documentos acima dos limites
+    são rejeitados sem executar SQL.
+    Os valores calculados vão em `extensions.cost` da resposta
+    """
+
+    def __init__(self, max_cost: int, max_depth: int, max_aliases: int):
+        super().__init__()
+        self.max_cost = max_cost
+        self.max_depth = max_depth
+        self.max_aliases = max_aliases
+        self._query_cost: QueryCost | None = None
+
+    def on_execute(self) -> Iterator[None]:
+        execution_context = self.execution_context
+        operation = get_operation_ast(execution_context.graphql_document, execution_context.operation_name)
+
+        if operation is not None:
+            fragments = {
+                definition.name.value: definition
+                for definition in execution_context.graphql_document.definitions
+                if isinstance(definition, FragmentDefinitionNode)
+            }
+            schema: GraphQLSchema = execution_context.schema._schema
+            root_type = schema.get_root_type(operation.operation)
+
+            self._query_cost = QueryCost()
+            self._query_cost.cost = self._selection_cost(
+                schema=schema,
+                parent_type=root_type,
+                selection_set=operation.selection_set,
+                fragments=fragments,
+                variables=execution_context.variables or {},
+                depth=1,
+                page_size=1,
+            )
+            self._check_limits(self._query_cost)
+
+        yield
+
+    def get_results(self) -> dict[str, Any]:
+        if self._query_cost is None:
+            return {}
+
+        return {"cost": {**asdict(self._query_cost), "maxCost": self.max_cost}}
+
+    def _check_limits(self, query_cost: QueryCost) -> None:
+        if query_cost.depth > self.max_depth:
+            raise GraphQLError(
+                f"Profundidade da consulta ({query_cost.depth}) excede o limite de {self.max_depth}",
+                extensions={"code": "QUERY_TOO_DEEP"},
+            )
+        if query_cost.aliases > self.max_aliases:
+            raise GraphQLError(
+                f"Quantidade de aliases ({query_cost.aliases}) excede o limite de {self.max_aliases}",
+                extensions={"code": "TOO_MANY_ALIASES"},
+            )
+        if query_cost.cost > self.max_cost:
+            raise GraphQLError(
+                f"Custo da consulta ({query_cost.cost}) excede o limite de {self.max_cost}",
+                extensions={"code": "QUERY_TOO_EXPENSIVE"},
+            )
+
+    def _selection_cost(
+        self,
+        schema: GraphQLSchema,
+        parent_type: GraphQLObjectType | None,
+        selection_set: SelectionSetNode | None,
+        fragments: dict[str, FragmentDefinitionNode],
+        variables: dict[str, Any],
+        depth: int,
+        page_size: int,
+    ) -> int:
+        if selection_set is None or parent_type is None:
+            return 0
+
+        self._query_cost.depth = max(self._query_cost.depth, depth)
+
+        cost = 0
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                cost += self._field_cost(schema, parent_type, selection, fragments, variables, depth, page_size)
+            elif isinstance(selection, FragmentSpreadNode):
+                fragment = fragments.get(selection.name.value)
+                if fragment is not None:
+                    fragment_type = schema.get_type(fragment.type_condition.name.value)
+                    cost += self._selection_cost(
+                        schema, fragment_type, fragment.selection_set, fragments, variables, depth, page_size
+                    )
+            elif isinstance(selection, InlineFragmentNode):
+                fragment_type = (
+                    schema.get_type(selection.type_condition.name.value) if selection.type_condition else parent_type
+                )
+                cost += self._selection_cost(
+                    schema, fragment_type, selection.selection_set, fragments, variables, depth, page_size
+                )
+
+        return cost
+
+    def _field_cost(
+        self,
+        schema: GraphQLSchema,
+        parent_type: GraphQLObjectType,
+        field: FieldNode,
+        fragments: dict[str, FragmentDefinitionNode],
+        variables: dict[str, Any],
+        depth: int,
+        page_size: int,
+    ) -> int:
+        name = field.name.value
+        if field.alias is not None and not (parent_type is schema.query_type and name in BATCHED_ROOT_FIELDS):
+            self._query_cost.aliases += 1
+
+        definition = parent_type.fields.get(name) if isinstance(parent_type, GraphQLObjectType) else None
+        if definition is None:
+            # __typename e campos de introspecção
+            return 0
+
+        field_type = get_named_type(definition.type)
+        if not isinstance(field_type, GraphQLObjectType):
+            return FIELD_COSTS.get(name, SCALAR_COST)
+
+        # A Connection define o tamanho da página; a lista abaixo dela (edges) multiplica o custo dos filhos
+        if "first" in definition.args:
+            page_size = self._page_size(field, variables)
+        multiplier = page_size if is_list_type(get_nullable_type(definition.type)) else 1
+
+        children = self._selection_cost(
+            schema, field_type, field.selection_set, fragments, variables, depth + 1, page_size
+        )
+
+        return multiplier * (FIELD_COSTS.get(name, OBJECT_COST) + children)
+
+    @staticmethod
+    def _page_size(field: FieldNode, variables: dict[str, Any]) -> int:
+        for argument in field.arguments or ():
+            if argument.name.value != "first":
+                continue
+
+            value = argument.value
+            if isinstance(value, IntValueNode):
+                first = int(value.value)
+            elif isinstance(value, VariableNode):
+                first = variables.get(value.name.value)
+            else:
+                first = None
+
+            if first is not None:
+                # O relay_connection limita `first` a MAX_PAGE_SIZE
+                return max(0, min(first, MAX_PAGE_SIZE))
+
+        return MAX_PAGE_SIZE
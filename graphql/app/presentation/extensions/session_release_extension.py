@@ -0,0 +1,17 @@
+from collections.abc import AsyncIterator
+
+from strawberry.extensions import SchemaExtension
+
+
+class SessionReleaseExtension(SchemaExtension):
+    """
+    Devolve a conexão da sessão da requisição ao pool assim que o último resolver termina,
+    sem esperar a serialização e o envio da resposta
+    """
+
+    async def on_execute(self) -> AsyncIterator[None]:
+        yield
+
+        session = self.execution_context.context.get("session")
+        if session is not None:
+            await session.close()
@@ -1,3 +1,4 @@
+from app.presentation.enums.contribuinte_enum import ModoBusca
 from app.presentation.filters.base.base_filter import BaseFilter
 
 
@@ -7,3 +8,4 @@ class ContribuinteFilter(BaseFilter):
 
 class ContribuintesFilter(BaseFilter):
     nmFantasia: str
+    modo: ModoBusca = ModoBusca.CONTEM
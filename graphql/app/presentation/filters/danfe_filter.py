@@ -1,5 +1,18 @@
+from datetime import date
+
+from pydantic import Field, model_validator
+
+from app.presentation.enums.danfe_enum import AgrupamentoDanfe
+from app.presentation.enums.endereco_enum import UF
 from app.presentation.filters.base.base_filter import BaseFilter
 
+# Anos aceitos nos filtros: o período do ano vai até 1º de janeiro do ano seguinte, que precisa ser uma data válida.
+# O mesmo vale para as datas: dataFim (inclusiva) vira o início do dia seguinte
+ANO_MINIMO = 1900
+ANO_MAXIMO = 9998
+DATA_MINIMA = date(ANO_MINIMO, 1, 1)
+DATA_MAXIMA = date(ANO_MAXIMO, 12, 31)
+
 
 class DanfeFilter(BaseFilter):
     numero: str
@@ -7,4 +20,38 @@ class DanfeFilter(BaseFilter):
 
 class DanfesFilter(BaseFilter):
     cnpj: str
-    ano: int
+    ano: int | None = Field(default=None, ge=ANO_MINIMO, le=ANO_MAXIMO)
+    dataInicio: date | None = Field(default=None, ge=DATA_MINIMA, le=DATA_MAXIMA)
+    dataFim: date | None = Field(default=None, ge=DATA_MINIMA, le=DATA_MAXIMA)
+    valorMinimo: float | None = None
+    valorMaximo: float | None = None
+
+    @model_validator(mode="after")
+    def validar_intervalos(self) -> "DanfesFilter":
+        if self.dataInicio and self.dataFim and self.dataInicio > self.dataFim:
+            raise ValueError("'dataInicio' deve ser menor ou igual a 'dataFim'")
+        if self.valorMinimo is not None and self.valorMaximo is not None and self.valorMinimo > self.valorMaximo:
+            raise ValueError("'valorMinimo' deve ser menor ou igual a 'valorMaximo'")
+        return self
+
+
+class DanfeAgregadoFilter(BaseFilter):
+    agruparPor: list[AgrupamentoDanfe] = []
+    cnpj: str | None = None
+    ano: int | None = Field(default=None, ge=ANO_MINIMO, le=ANO_MAXIMO)
+    dataInicio: date | None = Field(default=None, ge=DATA_MINIMA, le=DATA_MAXIMA)
+    dataFim: date | None = Field(default=None, ge=DATA_MINIMA, le=DATA_MAXIMA)
+    uf: UF | None = None
+    municipio: str | None = None
+
+    @model_validator(mode="after")
+    def validar_intervalos(self) -> "DanfeAgregadoFilter":
+        if self.dataInicio and self.dataFim and self.dataInicio > self.dataFim:
+            raise ValueError("'dataInicio' deve ser menor ou igual a 'dataFim'")
+        return self
+
+
+class DanfeEmitidaFilter(BaseFilter):
+    # Sem filtros, a assinatura recebe todas as danfes inseridas
+    cnpj: str | None = None
+    uf: UF | None = None
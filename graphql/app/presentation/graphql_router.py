@@ -1,10 +1,26 @@
 import strawberry
+from fastapi import Request, Response, status
+from fastapi.requests import HTTPConnection
+from fastapi.responses import StreamingResponse
 from strawberry.fastapi import GraphQLRouter
+from strawberry.schema.config import StrawberryConfig
 
-from app.database.core.db import get_graphql_context
+from app.core import config
+from app.core.metrics import metrics
+from app.database.core.db import LazySession, SessionFactory, read_session_factory
+from app.presentation.extensions.metrics_extension import MetricsExtension
+from app.presentation.extensions.persisted_query_extension import PersistedQueryExtension, PersistedQueryStore
+from app.presentation.extensions.query_cost_extension import QueryCostExtension
+from app.presentation.extensions.session_release_extension import SessionReleaseExtension
+from app.presentation.loaders.contribuinte_loader import create_contribuinte_loader
+from app.presentation.loaders.danfe_loader import create_danfe_loader
+from app.presentation.loaders.danfes_contribuinte_loader import create_danfes_contribuinte_loader
+from app.presentation.loaders.endereco_loader import create_endereco_loader
 from app.presentation.resolvers.contribuinte_resolver import ContribuinteQuery
-from app.presentation.resolvers.danfe_resolver import DanfeQuery
+from app.presentation.resolvers.danfe_resolver import DanfeQuery, DanfeSubscription
 from app.presentation.resolvers.endereco_resolver import EnderecoQuery
+from app.presentation.resolvers.ingestao_resolver import IngestaoMutation
+from app.presentation.utils.response_util import Compression, JsonEncoder
 
 
 @strawberry.type
@@ -12,13 +28,134 @@ class Query(ContribuinteQuery, DanfeQuery, EnderecoQuery):
     pass
 
 
+@strawberry.type
+class Mutation(IngestaoMutation):
+    pass
+
+
+@strawberry.type
+class Subscription(DanfeSubscription):
+    pass
+
+
+class EncodedGraphQLRouter(GraphQLRouter):
+    """
+    GraphQLRouter com codificador JSON configurável (orjson/msgspec, biblioteca padrão como fallback)
+    e compressão das respostas negociada pelo Accept-Encoding
+    """
+
+    def __init__(self, *args, json_encoder: str = "auto", compression: Compression | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.json_encoder, self._encode = JsonEncoder.create(json_encoder)
+        self.compression = compression
+
+    def encode_json(self, data: object) -> str:
+        # Texto para as mensagens do WebSocket (os clientes graphql-ws rejeitam frames binários) e o multipart
+        return self._encode(data).decode()
+
+    def create_response(self, response_data, sub_response: Response) -> Response:
+        # Respostas HTTP comuns usam os bytes do codificador direto, sem passar por str
+        response = Response(
+            self._encode(response_data),
+            media_type="application/json",
+            status_code=sub_response.status_code or status.HTTP_200_OK,
+        )
+        response.headers.raw.extend(sub_response.headers.raw)
+
+        return response
+
+    async def run(self, request, context=strawberry.UNSET, root_value=strawberry.UNSET) -> Response:
+        response = await super().run(request=request, context=context, root_value=root_value)
+        if isinstance(request, Request) and isinstance(response, Response):
+            self._compress(request, response)
+        return response
+
+    def _compress(self, request: Request, response: Response) -> None:
+        # Streaming (multipart, subscriptions) e respostas já codificadas seguem como estão
+        if self.compression is None or isinstance(response, StreamingResponse):
+            return
+        if "content-encoding" in response.headers:
+            return
+
+        encoding = self.compression.negotiate(request.headers.get("accept-encoding"), len(response.body))
+        if encoding is None:
+            return
+
+        response.body = self.compression.compress(encoding, response.body)
+        response.headers["content-encoding"] = encoding
+        response.headers["content-length"] = str(len(response.body))
+        response.headers.append("vary", "Accept-Encoding")
+
+
+async def get_graphql_context(request: HTTPConnection):
+    # HTTPConnection: o mesmo contexto atende requisições HTTP e conexões WebSocket (assinaturas).
+    # Nenhuma conexão é obtida aqui: introspecção, documentos rejeitados e respostas vindas do cache não usam o pool
+    session = LazySession(
+        factory=read_session_factory(request),
+        short_lived=config.DB_SESSION_SHORT_LIVED,
+        root_field_sessions=config.DB_ROOT_FIELD_SESSIONS,
+        max_connections=config.DB_MAX_CONNECTIONS_PER_REQUEST,
+        primary=SessionFactory,
+    )
+
+    try:
+        # DataLoaders por requisição: consultas por chave feitas no mesmo tick viram um único IN (...)
+        loaders = {
+            "contribuinte": create_contribuinte_loader(session=session),
+            "danfe": create_danfe_loader(session=session),
+            "danfes_contribuinte": create_danfes_contribuinte_loader(session=session),
+            "endereco": create_endereco_loader(session=session),
+        }
+        yield {"session": session, "loaders": loaders}
+    finally:
+        await session.close()
+
+
+def _build_persisted_query_store() -> PersistedQueryStore:
+    store = PersistedQueryStore(
+        max_entries=config.PERSISTED_QUERIES_MAX_ENTRIES,
+        allow_list_only=config.PERSISTED_QUERIES_ALLOW_LIST_ONLY,
+    )
+    if config.PERSISTED_QUERIES_MANIFEST:
+        store.load_manifest(config.PERSISTED_QUERIES_MANIFEST)
+        metrics.register_operations(store.operation_names())
+
+    return store
+
+
 def _build_schema() -> strawberry.Schema:
-    return strawberry.Schema(query=Query)
+    persisted_query_store = _build_persisted_query_store()
+
+    extensions = [
+        lambda: PersistedQueryExtension(store=persisted_query_store),
+        lambda: QueryCostExtension(
+            max_cost=config.QUERY_MAX_COST,
+            max_depth=config.QUERY_MAX_DEPTH,
+            max_aliases=config.QUERY_MAX_ALIASES,
+        ),
+        SessionReleaseExtension,
+    ]
+    if config.METRICS_ENABLED:
+        extensions.append(MetricsExtension)
+
+    return strawberry.Schema(
+        query=Query,
+        mutation=Mutation,
+        subscription=Subscription,
+        extensions=extensions,
+        # @defer/@stream, respondidos em multipart/mixed a clientes que o aceitem
+        config=StrawberryConfig(enable_experimental_incremental_execution=config.GRAPHQL_INCREMENTAL_DELIVERY),
+    )
 
 
 def get_graphql_router() -> tuple[str, GraphQLRouter]:
-    router = GraphQLRouter(
+    router = EncodedGraphQLRouter(
         schema=_build_schema(),
         context_getter=get_graphql_context,
+        json_encoder=config.GRAPHQL_JSON_ENCODER,
+        compression=Compression(
+            encodings=config.GRAPHQL_COMPRESSION,
+            min_bytes=config.GRAPHQL_COMPRESSION_MIN_BYTES,
+        ),
     )
     return "/graphql", router
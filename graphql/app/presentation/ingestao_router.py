@@ -0,0 +1,88 @@
+import json
+from typing import Any
+
+from fastapi import APIRouter, Request, Response
+
+from app.core import config
+from app.database.core.db import get_db_session, mark_write
+from app.domain.services.ingestao_service import ENTIDADES, IngestaoService, Registro
+from app.presentation.dtos.ingestao_dto import ErroIngestaoDTO, ResultadoIngestaoDTO
+
+
+def get_ingestao_router() -> tuple[str, APIRouter]:
+    router = APIRouter()
+
+    @router.post("/ndjson", response_model=ResultadoIngestaoDTO)
+    async def ingerir_ndjson(request: Request, response: Response) -> ResultadoIngestaoDTO:
+        """
+        Upload em streaming: uma linha JSON por registro, com a entidade em "entidade"
+        (ex.: {"entidade": "danfe", "numero": "...", ...}). O corpo é lido aos poucos e gravado
+        a cada INGESTAO_BATCH_SIZE registros; o índice dos erros é o número da linha (a partir de 0)
+        """
+        resultado = ResultadoIngestaoDTO()
+        pendentes: dict[str, list[Registro]] = {}
+        quantidade = 0
+
+        async with get_db_session() as session:
+            service = IngestaoService(session=session)
+
+            async def gravar() -> None:
+                parcial = await service.ingerir(lote=pendentes)
+                resultado.recebidos += parcial.recebidos
+                resultado.gravados += parcial.gravados
+                resultado.erros.extend(parcial.erros)
+                pendentes.clear()
+
+            indice = 0
+            async for linha in _linhas(request):
+                if linha.strip():
+                    erro = _adicionar(pendentes, indice, linha)
+                    if erro is not None:
+                        resultado.recebidos += 1
+                        resultado.erros.append(erro)
+                    else:
+                        quantidade += 1
+                        if quantidade >= config.INGESTAO_BATCH_SIZE:
+                            await gravar()
+                            quantidade = 0
+                indice += 1
+
+            if pendentes:
+                await gravar()
+
+        mark_write(response)
+
+        return resultado
+
+    return "/ingestao", router
+
+
+async def _linhas(request: Request):
+    resto = b""
+    async for chunk in request.stream():
+        resto += chunk
+        *linhas, resto = resto.split(b"\n")
+        for linha in linhas:
+            yield linha
+    if resto:
+        yield resto
+
+
+def _adicionar(pendentes: dict[str, list[Registro]], indice: int, linha: bytes) -> ErroIngestaoDTO | None:
+    try:
+        campos: dict[str, Any] = json.loads(linha)
+    except ValueError as e:
+        return ErroIngestaoDTO(indice=indice, mensagem=f"JSON inválido: {e}")
+    if not isinstance(campos, dict):
+        return ErroIngestaoDTO(indice=indice, mensagem="A linha deve ser um objeto JSON")
+
+    entidade = campos.pop("entidade", None)
+    if entidade not in ENTIDADES:
+        return ErroIngestaoDTO(
+            entidade=entidade if isinstance(entidade, str) else None,
+            indice=indice,
+            mensagem=f"Entidade deve ser uma de: {', '.join(ENTIDADES)}",
+        )
+
+    pendentes.setdefault(entidade, []).append((indice, campos))
+    return None
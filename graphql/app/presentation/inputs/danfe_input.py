@@ -1,6 +1,6 @@
 from strawberry.experimental.pydantic import input as strawberry_pydantic_input
 
-from app.presentation.filters.danfe_filter import DanfeFilter, DanfesFilter
+from app.presentation.filters.danfe_filter import DanfeAgregadoFilter, DanfeEmitidaFilter, DanfeFilter, DanfesFilter
 
 
 @strawberry_pydantic_input(model=DanfeFilter, all_fields=True)
@@ -11,3 +11,13 @@ class DanfeInput:
 @strawberry_pydantic_input(model=DanfesFilter, all_fields=True)
 class DanfesInput:
     pass
+
+
+@strawberry_pydantic_input(model=DanfeAgregadoFilter, all_fields=True)
+class DanfeAgregadoInput:
+    pass
+
+
+@strawberry_pydantic_input(model=DanfeEmitidaFilter, all_fields=True)
+class DanfeEmitidaInput:
+    pass
@@ -0,0 +1,26 @@
+import strawberry
+from strawberry.experimental.pydantic import input as strawberry_pydantic_input
+
+from app.presentation.dtos.ingestao_dto import ContribuinteIngestaoDTO, DanfeIngestaoDTO, EnderecoIngestaoDTO
+
+
+@strawberry_pydantic_input(model=ContribuinteIngestaoDTO, all_fields=True)
+class ContribuinteIngestaoInput:
+    pass
+
+
+@strawberry_pydantic_input(model=EnderecoIngestaoDTO, all_fields=True)
+class EnderecoIngestaoInput:
+    pass
+
+
+@strawberry_pydantic_input(model=DanfeIngestaoDTO, all_fields=True)
+class DanfeIngestaoInput:
+    pass
+
+
+@strawberry.input
+class LoteIngestaoInput:
+    contribuintes: list[ContribuinteIngestaoInput] = strawberry.field(default_factory=list)
+    enderecos: list[EnderecoIngestaoInput] = strawberry.field(default_factory=list)
+    danfes: list[DanfeIngestaoInput] = strawberry.field(default_factory=list)
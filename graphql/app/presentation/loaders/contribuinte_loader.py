@@ -0,0 +1,15 @@
+from strawberry.dataloader import DataLoader
+
+from app.domain.services.contribuinte_service import ContribuinteService
+from app.presentation.dtos.contribuinte_dto import ContribuinteRow
+
+# Limite de expressões em uma lista IN do Oracle
+MAX_BATCH_SIZE = 1000
+
+
+def create_contribuinte_loader(session) -> DataLoader[str, ContribuinteRow | None]:
+    async def load(cnpjs: list[str]) -> list[ContribuinteRow | None]:
+        service = ContribuinteService(session=session)
+        return await service.get_contribuintes_lote(cnpjs=cnpjs)
+
+    return DataLoader(load_fn=load, max_batch_size=MAX_BATCH_SIZE)
@@ -0,0 +1,15 @@
+from strawberry.dataloader import DataLoader
+
+from app.domain.services.danfe_service import DanfeService
+from app.presentation.dtos.danfe_dto import DanfeRow
+
+# Limite de expressões em uma lista IN do Oracle
+MAX_BATCH_SIZE = 1000
+
+
+def create_danfe_loader(session) -> DataLoader[str, DanfeRow | None]:
+    async def load(numeros: list[str]) -> list[DanfeRow | None]:
+        service = DanfeService(session=session)
+        return await service.get_danfes_lote(numeros=numeros)
+
+    return DataLoader(load_fn=load, max_batch_size=MAX_BATCH_SIZE)
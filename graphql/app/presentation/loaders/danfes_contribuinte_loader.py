@@ -0,0 +1,36 @@
+from strawberry.dataloader import DataLoader
+
+from app.domain.services.danfe_service import DanfeService
+from app.presentation.dtos.danfe_dto import DanfeRow
+from app.presentation.utils.cursor_util import Cursor
+
+# Limite de expressões em uma lista IN do Oracle
+MAX_BATCH_SIZE = 1000
+
+# Chave: (cnpj, first, after, campos)
+DanfesContribuinteKey = tuple[str, int, str | None, frozenset[str]]
+
+
+def create_danfes_contribuinte_loader(session) -> DataLoader[DanfesContribuinteKey, list[DanfeRow]]:
+    async def load(keys: list[DanfesContribuinteKey]) -> list[list[DanfeRow]]:
+        service = DanfeService(session=session)
+
+        # Contribuintes pedidos com a mesma página (first/after) e os mesmos campos são carregados em uma só consulta
+        grupos: dict[tuple[int, str | None, frozenset[str]], list[str]] = {}
+        for cnpj, first, after, campos in keys:
+            grupos.setdefault((first, after, campos), []).append(cnpj)
+
+        items: dict[DanfesContribuinteKey, list[DanfeRow]] = {}
+        for (first, after, campos), cnpjs in grupos.items():
+            danfes = await service.get_danfes_contribuintes(
+                cnpjs=cnpjs,
+                after=Cursor.decode(after),
+                limit=first,
+                campos=set(campos),
+            )
+            for cnpj in cnpjs:
+                items[(cnpj, first, after, campos)] = danfes[cnpj]
+
+        return [items[key] for key in keys]
+
+    return DataLoader(load_fn=load, max_batch_size=MAX_BATCH_SIZE)
@@ -0,0 +1,15 @@
+from strawberry.dataloader import DataLoader
+
+from app.domain.services.endereco_service import EnderecoService
+from app.presentation.dtos.endereco_dto import EnderecoRow
+
+# Limite de expressões em uma lista IN do Oracle
+MAX_BATCH_SIZE = 1000
+
+
+def create_endereco_loader(session) -> DataLoader[str, EnderecoRow | None]:
+    async def load(cnpjs: list[str]) -> list[EnderecoRow | None]:
+        service = EnderecoService(session=session)
+        return await service.get_enderecos_lote(cnpjs=cnpjs)
+
+    return DataLoader(load_fn=load, max_batch_size=MAX_BATCH_SIZE)
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Response
+
+from app.core.metrics import metrics
+
+
+def get_metrics_router() -> tuple[str, APIRouter]:
+    router = APIRouter()
+
+    @router.get("")
+    async def export_metrics() -> Response:
+        """
+        Métricas no formato texto do Prometheus
+        """
+        content, media_type = metrics.render()
+        return Response(content=content, media_type=media_type)
+
+    return "/metrics", router
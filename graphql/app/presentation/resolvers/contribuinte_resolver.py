@@ -1,13 +1,22 @@
 import strawberry
-from strawberry.relay import Connection
 from strawberry.types import Info
 
 from app.core.exceptions import CustomException
+from app.domain.builders.contribuinte_builder import ContribuinteBuilder
 from app.domain.services.contribuinte_service import ContribuinteService
 from app.presentation.decorators.relay_connection_decorator import relay_connection
 from app.presentation.inputs.contribuinte_input import ContribuinteInput, ContribuintesInput
+from app.presentation.types.connection_type import CountableConnection
 from app.presentation.types.contribuinte_type import ContribuinteType
 from app.presentation.utils.cursor_util import Cursor
+from app.presentation.utils.selection_util import Selection
+
+
+async def _count_contribuintes(info: Info, filtro: ContribuintesInput) -> int:
+    # Sessão própria: a contagem roda em paralelo com a consulta da página
+    async with info.context["session"].dedicated() as session:
+        service = ContribuinteService(session=session)
+        return await service.count_contribuintes(filtro=filtro.to_pydantic())
 
 
 @strawberry.type
@@ -16,14 +25,16 @@ class ContribuinteQuery:
     @strawberry.field
     async def contribuinte(self, info: Info, *, filtro: ContribuinteInput) -> ContribuinteType | None:
         try:
-            service = ContribuinteService(session=info.context["session"])
-            result = await service.get_contribuinte(filtro=filtro.to_pydantic())
+            result = await info.context["loaders"]["contribuinte"].load(filtro.to_pydantic().cnpj)
             return result
         except Exception as e:
             raise CustomException(str(e))
 
     @strawberry.field
-    @relay_connection
+    @relay_connection(
+        order_by=lambda kwargs: ContribuinteBuilder.Contribuintes.cursor_keys(kwargs["filtro"].modo),
+        count=_count_contribuintes,
+    )
     async def contribuintes(
         self,
         info: Info,
@@ -31,13 +42,15 @@ class ContribuinteQuery:
         filtro: ContribuintesInput,
         first: int | None = None,
         after: str | None = None,
-    ) -> Connection[ContribuinteType]:
+    ) -> CountableConnection[ContribuinteType]:
         try:
-            service = ContribuinteService(session=info.context["session"])
-            return await service.get_contribuintes(
-                filtro=filtro.to_pydantic(),
-                offset=Cursor.decode(after),
-                limit=first,
-            )
+            async with info.context["session"].root_field() as session:
+                service = ContribuinteService(session=session)
+                return await service.get_contribuintes(
+                    filtro=filtro.to_pydantic(),
+                    after=Cursor.decode(after),
+                    limit=first,
+                    campos=Selection.fields(info, path=("edges", "node")),
+                )
         except Exception as e:
             raise CustomException(str(e))
@@ -1,13 +1,36 @@
+from collections.abc import AsyncGenerator, AsyncIterator
+from typing import Any
+
 import strawberry
-from strawberry.relay import Connection
 from strawberry.types import Info
 
+from app.core import config
 from app.core.exceptions import CustomException
+from app.domain.builders.danfe_builder import DanfeBuilder
+from app.domain.jobs.danfe_emitida_job import danfe_emitida_job
 from app.domain.services.danfe_service import DanfeService
 from app.presentation.decorators.relay_connection_decorator import relay_connection
-from app.presentation.inputs.danfe_input import DanfeInput, DanfesInput
-from app.presentation.types.danfe_type import DanfeType
+from app.presentation.dtos.danfe_dto import DanfeRow
+from app.presentation.inputs.danfe_input import DanfeAgregadoInput, DanfeEmitidaInput, DanfeInput, DanfesInput
+from app.presentation.types.connection_type import CountableConnection
+from app.presentation.types.danfe_type import DanfeAgregadoType, DanfeType
 from app.presentation.utils.cursor_util import Cursor
+from app.presentation.utils.selection_util import Selection
+
+
+async def _count_danfes(info: Info, filtro: DanfesInput) -> int:
+    # Sessão própria: a contagem roda em paralelo com a consulta da página
+    async with info.context["session"].dedicated() as session:
+        service = DanfeService(session=session)
+        return await service.count_danfes(filtro=filtro.to_pydantic())
+
+
+async def _stream_danfes(info: Info, **kwargs: Any) -> AsyncIterator[DanfeRow]:
+    # Sessão própria, mantida enquanto as linhas da página chegam do cursor no servidor
+    async with info.context["session"].dedicated() as session:
+        service = DanfeService(session=session)
+        async for item in service.stream_danfes_page(**kwargs):
+            yield item
 
 
 @strawberry.type
@@ -16,14 +39,13 @@ class DanfeQuery:
     @strawberry.field
     async def danfe(self, info: Info, *, filtro: DanfeInput) -> DanfeType | None:
         try:
-            service = DanfeService(session=info.context["session"])
-            result = await service.get_danfe(filtro=filtro.to_pydantic())
+            result = await info.context["loaders"]["danfe"].load(filtro.to_pydantic().numero)
             return result
         except Exception as e:
             raise CustomException(str(e))
 
     @strawberry.field
-    @relay_connection
+    @relay_connection(order_by=DanfeBuilder.Danfes.ORDER_BY, count=_count_danfes)
     async def danfes(
         self,
         info: Info,
@@ -31,13 +53,49 @@ class DanfeQuery:
         filtro: DanfesInput,
         first: int | None = None,
         after: str | None = None,
-    ) -> Connection[DanfeType]:
+    ) -> CountableConnection[DanfeType]:
         try:
-            service = DanfeService(session=info.context["session"])
-            return await service.get_danfes(
-                filtro=filtro.to_pydantic(),
-                offset=Cursor.decode(after),
-                limit=first,
-            )
+            parameters = {
+                "filtro": filtro.to_pydantic(),
+                "after": Cursor.decode(after),
+                "limit": first,
+                "campos": Selection.fields(info, path=("edges", "node")),
+            }
+            if Selection.streamed(info, path=("edges",)):
+                return _stream_danfes(info, **parameters)
+
+            async with info.context["session"].root_field() as session:
+                service = DanfeService(session=session)
+                return await service.get_danfes(**parameters)
         except Exception as e:
             raise CustomException(str(e))
+
+    @strawberry.field
+    async def danfe_agregado(self, info: Info, *, filtro: DanfeAgregadoInput) -> list[DanfeAgregadoType]:
+        try:
+            async with info.context["session"].root_field() as session:
+                service = DanfeService(session=session)
+                return await service.get_danfe_agregado(filtro=filtro.to_pydantic())
+        except Exception as e:
+            raise CustomException(str(e))
+
+
+@strawberry.type
+class DanfeSubscription:
+
+    @strawberry.subscription
+    async def danfe_emitida(self, info: Info, *, filtro: DanfeEmitidaInput) -> AsyncGenerator[DanfeType, None]:
+        # As danfes vêm do leitor único do processo (DanfeEmitidaJob), não de uma consulta por assinante
+        if not config.DANFE_EMITIDA_ATIVO:
+            raise CustomException("Assinatura danfeEmitida desativada")
+
+        emitida = filtro.to_pydantic()
+        async with danfe_emitida_job.assinar(cnpj=emitida.cnpj, uf=emitida.uf) as assinatura:
+            async for item in assinatura:
+                yield item
+
+                # Campos da danfe anterior já resolvidos: a conexão volta ao pool e o cache dos DataLoaders
+                # é descartado enquanto a assinatura aguarda a próxima
+                await info.context["session"].close()
+                for loader in info.context["loaders"].values():
+                    loader.clear_all()
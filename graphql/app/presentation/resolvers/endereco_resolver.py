@@ -1,13 +1,22 @@
 import strawberry
-from strawberry.relay import Connection
 from strawberry.types import Info
 
 from app.core.exceptions import CustomException
+from app.domain.builders.endereco_builder import EnderecoBuilder
 from app.domain.services.endereco_service import EnderecoService
 from app.presentation.decorators.relay_connection_decorator import relay_connection
 from app.presentation.inputs.endereco_input import EnderecoInput, EnderecosInput
+from app.presentation.types.connection_type import CountableConnection
 from app.presentation.types.endereco_type import EnderecoType
 from app.presentation.utils.cursor_util import Cursor
+from app.presentation.utils.selection_util import Selection
+
+
+async def _count_enderecos(info: Info, filtro: EnderecosInput) -> int:
+    # Sessão própria: a contagem roda em paralelo com a consulta da página
+    async with info.context["session"].dedicated() as session:
+        service = EnderecoService(session=session)
+        return await service.count_enderecos(filtro=filtro.to_pydantic())
 
 
 @strawberry.type
@@ -16,14 +25,13 @@ class EnderecoQuery:
     @strawberry.field
     async def endereco(self, info: Info, *, filtro: EnderecoInput) -> EnderecoType | None:
         try:
-            service = EnderecoService(session=info.context["session"])
-            result = await service.get_endereco(filtro=filtro.to_pydantic())
+            result = await info.context["loaders"]["endereco"].load(filtro.to_pydantic().cnpj)
             return result
         except Exception as e:
             raise CustomException(str(e))
 
     @strawberry.field
-    @relay_connection
+    @relay_connection(order_by=EnderecoBuilder.Enderecos.ORDER_BY, count=_count_enderecos)
     async def enderecos(
         self,
         info: Info,
@@ -31,13 +39,15 @@ class EnderecoQuery:
         filtro: EnderecosInput,
         first: int | None = None,
         after: str | None = None,
-    ) -> Connection[EnderecoType]:
+    ) -> CountableConnection[EnderecoType]:
         try:
-            service = EnderecoService(session=info.context["session"])
-            return await service.get_enderecos(
-                filtro=filtro.to_pydantic(),
-                offset=Cursor.decode(after),
-                limit=first,
-            )
+            async with info.context["session"].root_field() as session:
+                service = EnderecoService(session=session)
+                return await service.get_enderecos(
+                    filtro=filtro.to_pydantic(),
+                    after=Cursor.decode(after),
+                    limit=first,
+                    campos=Selection.fields(info, path=("edges", "node")),
+                )
         except Exception as e:
             raise CustomException(str(e))
@@ -0,0 +1,37 @@
+import strawberry
+from strawberry.types import Info
+
+from app.core.exceptions import CustomException
+from app.database.core.db import get_db_session, mark_write
+from app.domain.services.ingestao_service import IngestaoService
+from app.presentation.inputs.ingestao_input import LoteIngestaoInput
+from app.presentation.types.ingestao_type import ResultadoIngestaoType
+
+
+@strawberry.type
+class IngestaoMutation:
+
+    @strawberry.mutation
+    async def ingerir(self, info: Info, lote: LoteIngestaoInput) -> ResultadoIngestaoType:
+        try:
+            registros = {
+                entidade: [(indice, item.to_pydantic().model_dump()) for indice, item in enumerate(itens)]
+                for entidade, itens in (
+                    ("contribuinte", lote.contribuintes),
+                    ("endereco", lote.enderecos),
+                    ("danfe", lote.danfes),
+                )
+            }
+
+            # Sessão própria de escrita, com commit por lote
+            async with get_db_session() as session:
+                service = IngestaoService(session=session)
+                resultado = await service.ingerir(lote=registros)
+        except Exception as e:
+            raise CustomException(str(e))
+
+        # Leituras seguintes, nesta requisição e nas próximas do cliente, vão ao primário (read-your-writes)
+        await info.context["session"].pin_primary()
+        mark_write(info.context["response"])
+
+        return resultado
@@ -0,0 +1,11 @@
+import strawberry
+from strawberry.relay import Connection
+from strawberry.relay.types import NodeType
+
+
+@strawberry.type(description="A connection to a list of items, with an optional total count.")
+class CountableConnection(Connection[NodeType]):
+    total_count: int | None = strawberry.field(
+        default=None,
+        description="Total de itens que atendem ao filtro (calculado apenas quando solicitado)",
+    )
@@ -1,8 +1,39 @@
+from typing import Annotated
+
+import strawberry
 from strawberry.experimental.pydantic import type as strawberry_pydantic_type
+from strawberry.relay import Connection
+from strawberry.types import Info
+
+from app.domain.builders.danfe_builder import DanfeBuilder
+from app.presentation.decorators.relay_connection_decorator import relay_connection
+from app.presentation.dtos.contribuinte_dto import ContribuinteBuscaTextoRow, ContribuinteDTO, ContribuinteRow
+from app.presentation.utils.selection_util import Selection
 
-from app.presentation.dtos.contribuinte_dto import ContribuinteDTO
+DanfeType = Annotated["DanfeType", strawberry.lazy("app.presentation.types.danfe_type")]
+EnderecoType = Annotated["EnderecoType", strawberry.lazy("app.presentation.types.endereco_type")]
 
 
 @strawberry_pydantic_type(model=ContribuinteDTO, all_fields=True)
 class ContribuinteType:
-    pass
+
+    @strawberry.field
+    async def endereco(self, info: Info) -> EnderecoType | None:
+        return await info.context["loaders"]["endereco"].load(self.cnpj_contribuinte)
+
+    @strawberry.field
+    @relay_connection(order_by=DanfeBuilder.DanfesContribuinte.ORDER_BY)
+    async def danfes(
+        self,
+        info: Info,
+        *,
+        first: int | None = None,
+        after: str | None = None,
+    ) -> Connection[DanfeType]:
+        campos = frozenset(Selection.fields(info, path=("edges", "node")))
+        return await info.context["loaders"]["danfes_contribuinte"].load((self.cnpj_contribuinte, first, after, campos))
+
+
+# Os services devolvem linhas (ContribuinteRow, ContribuinteBuscaTextoRow), não o DTO: o cast faz o tipo aceitá-las
+strawberry.cast(ContribuinteType, ContribuinteRow)
+strawberry.cast(ContribuinteType, ContribuinteBuscaTextoRow)
@@ -1,8 +1,29 @@
+from typing import Annotated
+
+import strawberry
 from strawberry.experimental.pydantic import type as strawberry_pydantic_type
+from strawberry.types import Info
+
+from app.presentation.dtos.danfe_dto import DanfeAgregadoDTO, DanfeAgregadoRow, DanfeDTO, DanfeRow
 
-from app.presentation.dtos.danfe_dto import DanfeDTO
+ContribuinteType = Annotated["ContribuinteType", strawberry.lazy("app.presentation.types.contribuinte_type")]
 
 
 @strawberry_pydantic_type(model=DanfeDTO, all_fields=True)
 class DanfeType:
+
+    @strawberry.field
+    async def contribuinte(self, info: Info) -> ContribuinteType | None:
+        return await info.context["loaders"]["contribuinte"].load(self.cnpj_contribuinte)
+
+
+# Os services devolvem linhas (DanfeRow), não o DTO: o cast faz o tipo aceitá-las
+strawberry.cast(DanfeType, DanfeRow)
+
+
+@strawberry_pydantic_type(model=DanfeAgregadoDTO, all_fields=True)
+class DanfeAgregadoType:
     pass
+
+
+strawberry.cast(DanfeAgregadoType, DanfeAgregadoRow)
@@ -1,8 +1,13 @@
+import strawberry
 from strawberry.experimental.pydantic import type as strawberry_pydantic_type
 
-from app.presentation.dtos.endereco_dto import EnderecoDTO
+from app.presentation.dtos.endereco_dto import EnderecoDTO, EnderecoRow
 
 
 @strawberry_pydantic_type(model=EnderecoDTO, all_fields=True)
 class EnderecoType:
     pass
+
+
+# Os services devolvem linhas (EnderecoRow), não o DTO: o cast faz o tipo aceitá-las
+strawberry.cast(EnderecoType, EnderecoRow)
@@ -0,0 +1,13 @@
+from strawberry.experimental.pydantic import type as strawberry_pydantic_type
+
+from app.presentation.dtos.ingestao_dto import ErroIngestaoDTO, ResultadoIngestaoDTO
+
+
+@strawberry_pydantic_type(model=ErroIngestaoDTO, all_fields=True)
+class ErroIngestaoType:
+    pass
+
+
+@strawberry_pydantic_type(model=ResultadoIngestaoDTO, all_fields=True)
+class ResultadoIngestaoType:
+    pass
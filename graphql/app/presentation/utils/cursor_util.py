@@ -1,5 +1,9 @@
 import base64
+import json
 import logging
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
 
 from app.core.exceptions import CustomException
 
@@ -7,18 +11,48 @@ logger = logging.getLogger(__name__)
 
 
 class Cursor:
+    """
+    Cursor opaco de paginação keyset: guarda a chave de ordenação da última linha da página
+    """
 
     @staticmethod
-    def encode(rn: int) -> str:
-        return base64.b64encode(str(rn).encode()).decode()
+    def encode(keys: dict[str, Any]) -> str:
+        payload = {key: Cursor._serialize(value) for key, value in keys.items()}
+        return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
 
     @staticmethod
-    def decode(after: str) -> int:
+    def decode(after: str | None) -> dict[str, Any] | None:
         try:
             if not after:
-                return 0
+                return None
 
-            return int(base64.b64decode(after).decode())
+            payload = json.loads(base64.urlsafe_b64decode(after).decode())
+            if not isinstance(payload, dict):
+                raise ValueError("Cursor não contém uma chave de ordenação")
+
+            return {key: Cursor._deserialize(value) for key, value in payload.items()}
         except Exception as e:
             logger.exception("Erro ao decodificar cursor: %s", e)
             raise CustomException("Cursor inválido")
+
+    @staticmethod
+    def _serialize(value: Any) -> Any:
+        # Tipos sem representação JSON nativa são marcados para voltarem com o mesmo tipo no bind
+        if isinstance(value, datetime):
+            return {"$dt": value.isoformat()}
+        if isinstance(value, date):
+            return {"$d": value.isoformat()}
+        if isinstance(value, Decimal):
+            return {"$n": str(value)}
+        return value
+
+    @staticmethod
+    def _deserialize(value: Any) -> Any:
+        if isinstance(value, dict):
+            if "$dt" in value:
+                return datetime.fromisoformat(value["$dt"])
+            if "$d" in value:
+                return date.fromisoformat(value["$d"])
+            if "$n" in value:
+                return Decimal(value["$n"])
+        return value
@@ -0,0 +1,159 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Iterable
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, get_args
+
+from pydantic import BaseModel
+
+from app.presentation.enums.export_enum import FormatoExportacao
+
+MEDIA_TYPES = {
+    FormatoExportacao.NDJSON: "application/x-ndjson",
+    FormatoExportacao.CSV: "text/csv; charset=utf-8",
+    FormatoExportacao.PARQUET: "application/vnd.apache.parquet",
+}
+
+Batches = AsyncIterator[list[dict[str, Any]]]
+
+
+class Export:
+    """
+    Codificação incremental de lotes de linhas: cada lote vira um bloco de bytes assim que chega,
+    então a memória fica limitada ao tamanho do lote, independente do total de linhas
+    """
+
+    @staticmethod
+    def available(formato: FormatoExportacao) -> bool:
+        if formato is not FormatoExportacao.PARQUET:
+            return True
+
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return False
+
+        return True
+
+    @staticmethod
+    def encode(
+        formato: FormatoExportacao,
+        batches: Batches,
+        model: type[BaseModel],
+        columns: list[str],
+    ) -> AsyncIterator[bytes]:
+        # `columns`: colunas das linhas na ordem da consulta; cabeçalho do CSV e schema do Parquet mesmo sem linhas
+        if formato is FormatoExportacao.CSV:
+            return Export._csv(batches, columns)
+        if formato is FormatoExportacao.PARQUET:
+            return Export._parquet(batches, model, columns)
+        return Export._ndjson(batches)
+
+    @staticmethod
+    async def _ndjson(batches: Batches) -> AsyncIterator[bytes]:
+        async for rows in batches:
+            yield "".join(json.dumps(row, default=Export._json_default) + "\n" for row in rows).encode()
+
+    @staticmethod
+    async def _csv(batches: Batches, columns: list[str]) -> AsyncIterator[bytes]:
+        # O cabeçalho vai junto do primeiro lote (ou sozinho, se não houver linhas)
+        header = Export._csv_rows([columns])
+        async for rows in batches:
+            if not rows:
+                continue
+
+            yield header + Export._csv_rows([row[column] for column in columns] for row in rows)
+            header = b""
+
+        if header:
+            yield header
+
+    @staticmethod
+    def _csv_rows(rows: Iterable[list[Any]]) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode()
+
+    @staticmethod
+    async def _parquet(batches: Batches, model: type[BaseModel], columns: list[str]) -> AsyncIterator[bytes]:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        sink = _ChunkSink()
+        # Tipos vêm do DTO, não do primeiro lote: colunas só com nulos não viram tipo "null"
+        schema = pa.schema([(column, Export._arrow_type(model, column)) for column in columns])
+        writer = pq.ParquetWriter(sink, schema)
+
+        async for rows in batches:
+            if not rows:
+                continue
+
+            # Cada lote vira um row group, enviado assim que é escrito
+            data = {column: [row[column] for row in rows] for column in columns}
+            for field in writer.schema:
+                if pa.types.is_floating(field.type):
+                    # NUMBER do Oracle pode chegar como Decimal
+                    values = data[field.name]
+                    data[field.name] = [float(value) if value is not None else None for value in values]
+            writer.write_table(pa.Table.from_pydict(data, schema=writer.schema))
+            yield sink.drain()
+
+        writer.close()
+
+        yield sink.drain()
+
+    @staticmethod
+    def _arrow_type(model: type[BaseModel], column: str) -> Any:
+        import pyarrow as pa
+
+        field = model.model_fields.get(column)
+        types = [arg for arg in get_args(field.annotation) if arg is not type(None)] if field else []
+        python_type = types[0] if types else (field.annotation if field else str)
+
+        if python_type is datetime:
+            return pa.timestamp("us")
+        if python_type is date:
+            return pa.date32()
+        if python_type is float:
+            return pa.float64()
+        if python_type is int:
+            return pa.int64()
+        return pa.string()
+
+    @staticmethod
+    def _json_default(value: Any) -> Any:
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return float(value)
+        raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Destino do ParquetWriter que acumula os bytes até o próximo `drain()`.
+    `tell()` continua contando a partir do início do arquivo, como exigem os offsets do rodapé do Parquet
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
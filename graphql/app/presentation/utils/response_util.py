@@ -0,0 +1,122 @@
+import gzip
+import json
+from collections.abc import Callable
+from typing import Any
+
+Encoder = Callable[[Any], bytes]
+Compressor = Callable[[bytes], bytes]
+
+
+class JsonEncoder:
+    """
+    Codificadores JSON das respostas. orjson e msgspec são opcionais; `auto` usa o mais rápido instalado
+    e cai na biblioteca padrão. O resultado GraphQL já chega serializado pelos escalares (datas como texto),
+    então o ganho está em montar os bytes, não em tratar tipos
+    """
+
+    @staticmethod
+    def create(name: str = "auto") -> tuple[str, Encoder]:
+        if name == "auto":
+            for candidate in ("orjson", "msgspec"):
+                encoder = JsonEncoder._load(candidate)
+                if encoder is not None:
+                    return candidate, encoder
+            return "json", JsonEncoder._json
+
+        if name == "json":
+            return name, JsonEncoder._json
+
+        encoder = JsonEncoder._load(name)
+        if encoder is None:
+            raise RuntimeError(f"Codificador JSON '{name}' requer o pacote '{name}' instalado")
+        return name, encoder
+
+    @staticmethod
+    def _load(name: str) -> Encoder | None:
+        try:
+            if name == "orjson":
+                import orjson
+
+                return orjson.dumps
+            if name == "msgspec":
+                import msgspec
+
+                return msgspec.json.Encoder().encode
+        except ImportError:
+            return None
+
+        raise RuntimeError(f"Codificador JSON desconhecido: {name}")
+
+    @staticmethod
+    def _json(data: Any) -> bytes:
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class Compression:
+    """
+    Compressão das respostas negociada pelo Accept-Encoding. `encodings` define a preferência do servidor;
+    brotli (`br`) e zstd dependem dos pacotes opcionais `brotli` e `zstandard` e são ignorados sem eles.
+    Respostas menores que `min_bytes` vão sem compressão: o ganho não paga a CPU
+    """
+
+    def __init__(self, encodings: list[str], min_bytes: int):
+        self.min_bytes = min_bytes
+        self.compressors: dict[str, Compressor] = {}
+        for encoding in encodings:
+            compressor = Compression._load(encoding)
+            if compressor is not None:
+                self.compressors[encoding] = compressor
+
+    def negotiate(self, accept_encoding: str | None, size: int) -> str | None:
+        if size < self.min_bytes or not accept_encoding or not self.compressors:
+            return None
+
+        accepted = Compression._parse(accept_encoding)
+        wildcard = accepted.get("*", 0)
+        for encoding in self.compressors:
+            if accepted.get(encoding, wildcard) > 0:
+                return encoding
+        return None
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        return self.compressors[encoding](body)
+
+    @staticmethod
+    def _parse(accept_encoding: str) -> dict[str, float]:
+        # "gzip, br;q=0.8, zstd;q=0" -> {"gzip": 1.0, "br": 0.8, "zstd": 0.0}
+        accepted = {}
+        for item in accept_encoding.split(","):
+            encoding, _, params = item.strip().partition(";")
+            quality = 1.0
+            name, _, value = params.strip().partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+            if encoding:
+                accepted[encoding.strip().lower()] = quality
+        return accepted
+
+    @staticmethod
+    def _load(encoding: str) -> Compressor | None:
+        # Níveis baixos: a resposta é comprimida a cada requisição, no caminho da latência
+        if encoding == "gzip":
+            return lambda body: gzip.compress(body, compresslevel=5)
+
+        if encoding == "br":
+            try:
+                import brotli
+            except ImportError:
+                return None
+            return lambda body: brotli.compress(body, quality=4)
+
+        if encoding == "zstd":
+            try:
+                import zstandard
+            except ImportError:
+                return None
+            compressor = zstandard.ZstdCompressor(level=3)
+            return compressor.compress
+
+        raise RuntimeError(f"Compressão desconhecida: {encoding}")
@@ -0,0 +1,55 @@
+import re
+
+from strawberry.types import Info
+from strawberry.types.nodes import FragmentSpread, InlineFragment
+from strawberry.types.nodes import Selection as SelectionNode
+
+_CAMEL_CASE = re.compile(r"(?<!^)(?=[A-Z])")
+
+
+class Selection:
+
+    @staticmethod
+    def fields(info: Info, path: tuple[str, ...] = ()) -> set[str]:
+        """
+        Campos (em snake_case) pedidos pelo cliente no campo resolvido, descendo por `path`
+        (ex.: ("edges", "node") em uma Connection)
+        """
+        selections = Selection._children(info.selected_fields)
+        for name in path:
+            selections = Selection._children(
+                [selection for selection in selections if getattr(selection, "name", None) == name]
+            )
+
+        return {_CAMEL_CASE.sub("_", selection.name).lower() for selection in selections}
+
+    @staticmethod
+    def streamed(info: Info, path: tuple[str, ...]) -> bool:
+        """
+        Se o campo ao fim de `path` (ex.: ("edges",) em uma Connection) foi pedido com @stream
+        """
+        *parents, name = path
+        selections = Selection._children(info.selected_fields)
+        for parent in parents:
+            selections = Selection._children(
+                [selection for selection in selections if getattr(selection, "name", None) == parent]
+            )
+
+        return any(
+            getattr(selection, "name", None) == name and selection.directives.get("stream", {}).get("if", True)
+            for selection in selections
+            if "stream" in getattr(selection, "directives", {})
+        )
+
+    @staticmethod
+    def _children(selections: list[SelectionNode]) -> list[SelectionNode]:
+        children = []
+        for selection in selections:
+            for child in selection.selections:
+                # Fragmentos são achatados para o nível em que aparecem
+                if isinstance(child, (FragmentSpread, InlineFragment)):
+                    children.extend(Selection._children([child]))
+                else:
+                    children.append(child)
+
+        return children
@@ -0,0 +1,104 @@
+"""
+Documentos representativos do tráfego do /graphql. Cada cenário sorteia variáveis sobre a população
+gerada pelo benchmark.seed; `paginas` > 1 percorre as páginas seguintes pelo endCursor
+"""
+
+import random
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from benchmark.seed import NOMES, PREFIXOS, cnpj, numero
+
+
+@dataclass(frozen=True)
+class Populacao:
+    contribuintes: int
+    danfes: int
+
+
+@dataclass(frozen=True)
+class Cenario:
+    nome: str
+    query: str
+    variables: Callable[[random.Random, Populacao], dict[str, Any]]
+    paginas: int = 1
+    # Caminho até a Connection paginada na resposta (usado quando paginas > 1)
+    connection: tuple[str, ...] = field(default=())
+
+
+def _contribuinte_frequente(rng: random.Random, populacao: Populacao) -> str:
+    # Os primeiros contribuintes concentram as danfes (mesma distribuição do seed)
+    return cnpj(int(populacao.contribuintes * rng.random() ** 3))
+
+
+CENARIOS = {
+    cenario.nome: cenario
+    for cenario in (
+        Cenario(
+            nome="contribuinte",
+            query="""
+            query Contribuinte($cnpj: String!) {
+              contribuinte(filtro: { cnpj: $cnpj }) { cnpjContribuinte nmFantasia }
+            }
+            """,
+            variables=lambda rng, populacao: {"cnpj": cnpj(rng.randrange(populacao.contribuintes))},
+        ),
+        Cenario(
+            nome="danfe",
+            query="""
+            query Danfe($numero: String!) {
+              danfe(filtro: { numero: $numero }) { numero valorTotal dataEmissao cnpjContribuinte }
+            }
+            """,
+            variables=lambda rng, populacao: {"numero": numero(rng.randrange(populacao.danfes))},
+        ),
+        Cenario(
+            nome="danfes_paginacao_profunda",
+            query="""
+            query Danfes($cnpj: String!, $after: String) {
+              danfes(filtro: { cnpj: $cnpj }, first: 5, after: $after) {
+                edges { node { numero valorTotal dataEmissao } }
+                pageInfo { hasNextPage endCursor }
+              }
+            }
+            """,
+            variables=lambda rng, populacao: {"cnpj": _contribuinte_frequente(rng, populacao)},
+            paginas=20,
+            connection=("danfes",),
+        ),
+        Cenario(
+            nome="contribuintes_busca_nome",
+            query="""
+            query Contribuintes($nome: String!) {
+              contribuintes(filtro: { nmFantasia: $nome, modo: PREFIXO }, first: 5) {
+                totalCount
+                edges { node { cnpjContribuinte nmFantasia } }
+              }
+            }
+            """,
+            variables=lambda rng, populacao: {"nome": f"{rng.choice(PREFIXOS)} {rng.choice(NOMES)}"},
+        ),
+        Cenario(
+            nome="multiplas_raizes",
+            query="""
+            query Painel($cnpj: String!, $uf: UF!, $municipio: String!) {
+              contribuinte(filtro: { cnpj: $cnpj }) {
+                nmFantasia
+                endereco { municipio uf }
+                danfes(first: 5) { edges { node { numero valorTotal } } }
+              }
+              danfes(filtro: { cnpj: $cnpj }, first: 5) { totalCount edges { node { numero dataEmissao } } }
+              enderecos(filtro: { uf: $uf, municipio: $municipio }, first: 5) {
+                edges { node { cnpjContribuinte logradouro } }
+              }
+            }
+            """,
+            variables=lambda rng, populacao: {
+                "cnpj": _contribuinte_frequente(rng, populacao),
+                "uf": "BA",
+                "municipio": rng.choice(["SALVADOR", "FEIRA DE SANTANA", "CAMACARI"]),
+            },
+        ),
+    )
+}
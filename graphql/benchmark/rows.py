@@ -0,0 +1,125 @@
+"""
+Custo por linha da conversão do resultado do banco para o GraphQL: DTO Pydantic (model_validate)
+contra as linhas sem validação (RowDTO.from_row). Mede só a conversão e a conversão seguida da
+execução GraphQL de uma página com todos os campos escalares, sem banco.
+
+Uso (a partir de graphql/):
+    python -m benchmark.rows --linhas 1000 --repeticoes 30
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+import strawberry
+
+from app.presentation.dtos.contribuinte_dto import ContribuinteDTO, ContribuinteRow
+from app.presentation.dtos.danfe_dto import DanfeDTO, DanfeRow
+from app.presentation.types.contribuinte_type import ContribuinteType
+from app.presentation.types.danfe_type import DanfeType
+
+DOCUMENTOS = {
+    "danfe": "{ danfes { cnpjContribuinte nmFantasia numero valorTotal dataEmissao logradouro municipio uf } }",
+    "contribuinte": "{ contribuintes { cnpjContribuinte nmFantasia } }",
+}
+
+
+def _linhas(quantidade: int, seed: int) -> dict[str, list[dict[str, Any]]]:
+    # Mesmo formato devolvido pelos repositórios (dict por linha); datas já como datetime, como no Oracle
+    rng = random.Random(seed)
+    inicio = datetime(2020, 1, 1)
+
+    return {
+        "danfe": [
+            {
+                "cnpj_contribuinte": f"{i % 5000:014d}",
+                "nm_fantasia": f"Loja {i % 5000}",
+                "numero": f"NF{i:013d}",
+                "valor_total": round(rng.uniform(1, 20000), 2),
+                "data_emissao": inicio + timedelta(seconds=rng.randrange(5 * 365 * 86400)),
+                "logradouro": f"Rua {i % 700}",
+                "municipio": "São Paulo",
+                "uf": "SP",
+            }
+            for i in range(quantidade)
+        ],
+        "contribuinte": [{"cnpj_contribuinte": f"{i:014d}", "nm_fantasia": f"Loja {i}"} for i in range(quantidade)],
+    }
+
+
+def _schema(itens: dict[str, list[Any]]) -> strawberry.Schema:
+    @strawberry.type
+    class Query:
+
+        @strawberry.field
+        def danfes(self) -> list[DanfeType]:
+            return itens["danfe"]
+
+        @strawberry.field
+        def contribuintes(self) -> list[ContribuinteType]:
+            return itens["contribuinte"]
+
+    return strawberry.Schema(query=Query)
+
+
+def _medir(funcao: Callable[[], Any], linhas: int, repeticoes: int) -> dict[str, float]:
+    # Nanossegundos por linha em cada repetição; a primeira é aquecimento
+    funcao()
+    amostras = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter_ns()
+        funcao()
+        amostras.append((time.perf_counter_ns() - inicio) / linhas)
+
+    return {"mediana": round(statistics.median(amostras), 1), "min": round(min(amostras), 1)}
+
+
+def benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    linhas = _linhas(args.linhas, args.seed)
+    caminhos = {
+        "dto": {"danfe": DanfeDTO.model_validate, "contribuinte": ContribuinteDTO.model_validate},
+        "row": {"danfe": DanfeRow.from_row, "contribuinte": ContribuinteRow.from_row},
+    }
+
+    resultado: dict[str, Any] = {}
+    for entidade, documento in DOCUMENTOS.items():
+        resultado[entidade] = {}
+        for caminho, conversores in caminhos.items():
+            converter = conversores[entidade]
+            itens: dict[str, list[Any]] = {}
+            schema = _schema(itens)
+
+            def converte():
+                itens[entidade] = [converter(linha) for linha in linhas[entidade]]
+
+            def executa():
+                converte()
+                result = schema.execute_sync(documento)
+                if result.errors:
+                    raise result.errors[0]
+
+            resultado[entidade][caminho] = {
+                "conversaoNsPorLinha": _medir(converte, args.linhas, args.repeticoes),
+                "conversaoGraphqlNsPorLinha": _medir(executa, args.linhas, args.repeticoes),
+            }
+
+    return {"parametros": {"linhas": args.linhas, "repeticoes": args.repeticoes}, "entidades": resultado}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Custo por linha: model_validate contra RowDTO.from_row")
+    parser.add_argument("--linhas", type=int, default=1000, help="Linhas por página")
+    parser.add_argument("--repeticoes", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(json.dumps(benchmark(args), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""
+Carga sobre o /graphql com concorrência fixa. Mede latência (p50/p95/p99) e QPS por cenário
+e, com a aplicação no mesmo processo, o tempo de espera por conexões do pool.
+O relatório em JSON serve de baseline para comparar execuções.
+
+Uso (a partir de graphql/, depois do benchmark.seed):
+    python -m benchmark.run --database benchmark.db --concurrency 16 --duration 30 --output baseline.json
+    python -m benchmark.run --url http://localhost:8080/graphql --contribuintes 100000 --danfes 2000000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+import httpx
+
+from benchmark.documents import CENARIOS, Cenario, Populacao
+
+
+@dataclass
+class Amostras:
+    latencias: list[float] = field(default_factory=list)
+    erros: int = 0
+
+
+class PoolWait:
+    """
+    Tempo de espera por uma conexão do pool da aplicação (do pedido até o checkout).
+    Só disponível quando a aplicação roda no mesmo processo do benchmark
+    """
+
+    def __init__(self, pool):
+        self.esperas: list[float] = []
+        self._pool = pool
+        self._do_get = pool._do_get
+        pool._do_get = self._timed_do_get
+
+    def _timed_do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return self._do_get()
+        finally:
+            self.esperas.append(time.perf_counter() - inicio)
+
+    def close(self) -> None:
+        self._pool._do_get = self._do_get
+
+
+def _percentis(valores: list[float]) -> dict[str, float | None]:
+    if not valores:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+
+    if len(valores) == 1:
+        cortes = valores * 99
+    else:
+        cortes = statistics.quantiles(valores, n=100, method="inclusive")
+
+    return {
+        "p50": round(cortes[49] * 1000, 3),
+        "p95": round(cortes[94] * 1000, 3),
+        "p99": round(cortes[98] * 1000, 3),
+        "max": round(max(valores) * 1000, 3),
+    }
+
+
+def _populacao(args: argparse.Namespace) -> Populacao:
+    if args.contribuintes is not None and args.danfes is not None:
+        return Populacao(contribuintes=args.contribuintes, danfes=args.danfes)
+
+    # Sem os totais informados, lê do próprio banco gerado pelo seed
+    connection = sqlite3.connect(args.database)
+    try:
+        contribuintes = connection.execute("SELECT COUNT(*) FROM contribuinte").fetchone()[0]
+        danfes = connection.execute("SELECT MAX(id_danfe) FROM danfe").fetchone()[0]
+    finally:
+        connection.close()
+
+    return Populacao(contribuintes=contribuintes, danfes=danfes)
+
+
+async def _executar(
+    client: httpx.AsyncClient,
+    path: str,
+    cenario: Cenario,
+    variables: dict[str, Any],
+    amostras: Amostras,
+) -> None:
+    for _ in range(cenario.paginas):
+        inicio = time.perf_counter()
+        try:
+            response = await client.post(path, json={"query": cenario.query, "variables": variables})
+            body = response.json()
+            ok = response.status_code == 200 and not body.get("errors")
+        except (httpx.HTTPError, ValueError):
+            body, ok = {}, False
+        amostras.latencias.append(time.perf_counter() - inicio)
+
+        if not ok:
+            amostras.erros += 1
+            return
+
+        # Próxima página pelo endCursor da Connection
+        connection = body.get("data") or {}
+        for key in cenario.connection:
+            connection = connection.get(key) or {}
+        page_info = connection.get("pageInfo") or {}
+        if not page_info.get("hasNextPage"):
+            return
+        variables = variables | {"after": page_info["endCursor"]}
+
+
+async def _worker(
+    client: httpx.AsyncClient,
+    path: str,
+    cenarios: list[Cenario],
+    populacao: Populacao,
+    rng: random.Random,
+    fim: float,
+    resultados: dict[str, Amostras] | None,
+) -> None:
+    # resultados=None: aquecimento, amostras descartadas
+    while time.perf_counter() < fim:
+        cenario = rng.choice(cenarios)
+        amostras = resultados[cenario.nome] if resultados is not None else Amostras()
+        await _executar(client, path, cenario, cenario.variables(rng, populacao), amostras)
+
+
+async def _carga(client, path, cenarios, populacao, args, resultados) -> float:
+    duracao = args.duration if resultados is not None else args.warmup
+    inicio = time.perf_counter()
+    fim = inicio + duracao
+    await asyncio.gather(
+        *(
+            _worker(client, path, cenarios, populacao, random.Random(args.seed + i), fim, resultados)
+            for i in range(args.concurrency)
+        )
+    )
+    return time.perf_counter() - inicio
+
+
+def _client(args: argparse.Namespace) -> tuple[httpx.AsyncClient, str, Any]:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    if args.url:
+        return httpx.AsyncClient(limits=limits, timeout=args.timeout), args.url, None
+
+    # Aplicação no mesmo processo, sobre o banco SQLite local (selecionado pelo db.py via DB_URL)
+    if not os.environ.get("DB_URL"):
+        os.environ["DB_URL"] = f"sqlite+aiosqlite:///{os.path.abspath(args.database)}"
+    from main import app
+
+    transport = httpx.ASGITransport(app=app)
+    client = httpx.AsyncClient(transport=transport, base_url="http://benchmark", limits=limits, timeout=args.timeout)
+    return client, "/graphql", app
+
+
+async def benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    cenarios = [CENARIOS[nome] for nome in args.scenarios]
+    populacao = _populacao(args)
+    client, path, app = _client(args)
+
+    pool_wait = None
+    if app is not None:
+        from app.database.core import db
+
+        pool_wait = PoolWait(db.engine.sync_engine.pool)
+
+    resultados = {cenario.nome: Amostras() for cenario in cenarios}
+    try:
+        if args.warmup > 0:
+            await _carga(client, path, cenarios, populacao, args, None)
+        if pool_wait is not None:
+            pool_wait.esperas.clear()
+
+        duracao = await _carga(client, path, cenarios, populacao, args, resultados)
+    finally:
+        await client.aclose()
+        if pool_wait is not None:
+            pool_wait.close()
+            await db.shutdown_db()
+
+    todas = [latencia for amostras in resultados.values() for latencia in amostras.latencias]
+    return {
+        "executadoEm": datetime.now(timezone.utc).isoformat(),
+        "ambiente": {
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "alvo": args.url or os.environ["DB_URL"],
+        },
+        "parametros": {
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "contribuintes": populacao.contribuintes,
+            "danfes": populacao.danfes,
+        },
+        "total": {
+            "requisicoes": len(todas),
+            "erros": sum(amostras.erros for amostras in resultados.values()),
+            "qps": round(len(todas) / duracao, 2),
+            "latenciaMs": _percentis(todas),
+        },
+        "cenarios": {
+            nome: {
+                "requisicoes": len(amostras.latencias),
+                "erros": amostras.erros,
+                "qps": round(len(amostras.latencias) / duracao, 2),
+                "latenciaMs": _percentis(amostras.latencias),
+            }
+            for nome, amostras in resultados.items()
+        },
+        "pool": (
+            {"checkouts": len(pool_wait.esperas), "esperaMs": _percentis(pool_wait.esperas)}
+            if pool_wait is not None
+            else None
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de latência e vazão do /graphql")
+    parser.add_argument("--url", help="Endpoint /graphql de um servidor já em execução (padrão: app no processo)")
+    parser.add_argument("--database", default="benchmark.db", help="Banco SQLite gerado pelo benchmark.seed")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30, help="Segundos de medição")
+    parser.add_argument("--warmup", type=float, default=3, help="Segundos de aquecimento, descartados")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--contribuintes", type=int, help="Tamanho da população (padrão: lido do banco)")
+    parser.add_argument("--danfes", type=int, help="Quantidade de danfes (padrão: lida do banco)")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(CENARIOS), default=list(CENARIOS))
+    parser.add_argument("--output", help="Arquivo JSON do relatório (padrão: saída padrão)")
+    args = parser.parse_args()
+
+    relatorio = asyncio.run(benchmark(args))
+
+    content = json.dumps(relatorio, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(content + "\n")
+    else:
+        print(content)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Gera um banco SQLite com contribuintes, endereços e danfes sintéticos para o benchmark.
+
+Uso (a partir de graphql/):
+    python -m benchmark.seed --database benchmark.db --contribuintes 100000 --danfes 2000000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import time
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+
+from app.domain.builders.contribuinte_builder import nm_fantasia_busca
+
+# Mesmas tabelas e índices do setup.sql, com os tipos equivalentes do SQLite
+_SCHEMA = """
+CREATE TABLE contribuinte (
+    cnpj_contribuinte TEXT PRIMARY KEY,
+    nm_fantasia TEXT NOT NULL,
+    nm_fantasia_busca TEXT
+);
+CREATE INDEX ix_contribuinte_nm_busca ON contribuinte (nm_fantasia_busca);
+
+CREATE TABLE danfe (
+    id_danfe INTEGER PRIMARY KEY,
+    cnpj_contribuinte TEXT NOT NULL REFERENCES contribuinte (cnpj_contribuinte),
+    numero TEXT NOT NULL UNIQUE,
+    valor_total REAL NOT NULL,
+    data_emissao TIMESTAMP NOT NULL
+);
+
+CREATE TABLE endereco (
+    cnpj_contribuinte TEXT PRIMARY KEY REFERENCES contribuinte (cnpj_contribuinte),
+    logradouro TEXT NOT NULL,
+    municipio TEXT NOT NULL,
+    uf TEXT NOT NULL
+);
+"""
+
+# Criados depois da carga: inserir com o índice já existente é bem mais lento
+_INDEXES = """
+CREATE INDEX ix_danfe_cnpj_emissao ON danfe (cnpj_contribuinte, data_emissao);
+"""
+
+PREFIXOS = ["Mercado", "Farmácia", "Padaria", "Auto Peças", "Loja", "Distribuidora", "Açougue", "Papelaria"]
+NOMES = ["São João", "Bom Preço", "Central", "Estrela", "União", "Progresso", "Vitória", "Aliança", "Nordeste"]
+_MUNICIPIOS = {
+    "BA": ["SALVADOR", "FEIRA DE SANTANA", "VITORIA DA CONQUISTA", "CAMACARI"],
+    "SP": ["SAO PAULO", "CAMPINAS", "SANTOS"],
+    "MG": ["BELO HORIZONTE", "UBERLANDIA"],
+    "PE": ["RECIFE", "OLINDA"],
+    "RJ": ["RIO DE JANEIRO", "NITEROI"],
+}
+
+_CHUNK = 50_000
+_INICIO = datetime(2020, 1, 1)
+_PERIODO_SEGUNDOS = int(timedelta(days=5 * 365).total_seconds())
+
+
+def cnpj(indice: int) -> str:
+    return f"{indice:014d}"
+
+
+def numero(indice: int) -> str:
+    return f"NF{indice:013d}"
+
+
+def _contribuintes(total: int, rng: random.Random) -> Iterator[tuple]:
+    for i in range(total):
+        nome = f"{rng.choice(PREFIXOS)} {rng.choice(NOMES)} {i}"
+        yield cnpj(i), nome, nm_fantasia_busca(nome)
+
+
+def _enderecos(total: int, rng: random.Random) -> Iterator[tuple]:
+    ufs = list(_MUNICIPIOS)
+    for i in range(total):
+        uf = rng.choice(ufs)
+        yield cnpj(i), f"RUA {rng.randint(1, 5000)}, {rng.randint(1, 999)}", rng.choice(_MUNICIPIOS[uf]), uf
+
+
+def _danfes(total: int, contribuintes: int, rng: random.Random) -> Iterator[tuple]:
+    # Distribuição desigual entre contribuintes (poucos emitem muito), como na base real
+    for i in range(total):
+        contribuinte = int(contribuintes * rng.random() ** 3)
+        emissao = _INICIO + timedelta(seconds=rng.randrange(_PERIODO_SEGUNDOS))
+        yield i + 1, cnpj(contribuinte), numero(i), round(rng.uniform(1, 20_000), 2), emissao.isoformat(" ")
+
+
+def _insert(connection: sqlite3.Connection, statement: str, rows: Iterator[tuple]) -> int:
+    total = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= _CHUNK:
+            connection.executemany(statement, chunk)
+            total += len(chunk)
+            chunk = []
+    if chunk:
+        connection.executemany(statement, chunk)
+        total += len(chunk)
+
+    connection.commit()
+    return total
+
+
+def seed(database: str, contribuintes: int, danfes: int, seed_value: int = 42) -> None:
+    if os.path.exists(database):
+        os.remove(database)
+
+    rng = random.Random(seed_value)
+    connection = sqlite3.connect(database)
+    connection.executescript("PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;" + _SCHEMA)
+
+    etapas = (
+        ("contribuinte", "INSERT INTO contribuinte VALUES (?, ?, ?)", _contribuintes(contribuintes, rng)),
+        ("endereco", "INSERT INTO endereco VALUES (?, ?, ?, ?)", _enderecos(contribuintes, rng)),
+        ("danfe", "INSERT INTO danfe VALUES (?, ?, ?, ?, ?)", _danfes(danfes, contribuintes, rng)),
+    )
+    for tabela, statement, rows in etapas:
+        inicio = time.perf_counter()
+        total = _insert(connection, statement, rows)
+        print(f"{tabela}: {total} linhas em {time.perf_counter() - inicio:.1f}s")
+
+    connection.executescript(_INDEXES + "ANALYZE;")
+    connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gera o banco SQLite sintético do benchmark")
+    parser.add_argument("--database", default="benchmark.db")
+    parser.add_argument("--contribuintes", type=int, default=100_000)
+    parser.add_argument("--danfes", type=int, default=2_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    seed(database=args.database, contribuintes=args.contribuintes, danfes=args.danfes, seed_value=args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,16 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
-from app.database.core.db import shutdown_db
+from app.core import config
+from app.database.core.db import shutdown_db, startup_db
+from app.domain.jobs.alteracao_limpeza_job import AlteracaoLimpezaJob
+from app.domain.jobs.danfe_emitida_job import danfe_emitida_job
+from app.domain.jobs.danfe_resumo_job import DanfeResumoJob
+from app.domain.notifiers.invalidacao_cache import alteracao_notifier
+from app.presentation.export_router import get_export_router
 from app.presentation.graphql_router import get_graphql_router
+from app.presentation.ingestao_router import get_ingestao_router
+from app.presentation.metrics_router import get_metrics_router
 
 logger = logging.getLogger(__name__)
 
@@ -16,8 +24,43 @@ async def lifespan(_app: FastAPI):
     logger.info("SQLAlchemy ORM inicializado")
     logger.info("===========================")
 
+    # Health check das réplicas de leitura
+    startup_db()
+
+    # Manutenção incremental do resumo mensal de danfes
+    resumo_job = None
+    if config.RESUMO_MENSAL_ATIVO:
+        resumo_job = DanfeResumoJob(
+            intervalo=config.RESUMO_MENSAL_INTERVALO,
+            reconstrucao=config.RESUMO_MENSAL_RECONSTRUCAO,
+            lote=config.CACHE_INVALIDACAO_LOTE,
+            espera=config.CACHE_INVALIDACAO_ESPERA,
+        )
+        resumo_job.start()
+        logger.info("Job do resumo mensal de danfes iniciado")
+
+    # Leitor das danfes inseridas para a assinatura danfeEmitida
+    if config.DANFE_EMITIDA_ATIVO:
+        danfe_emitida_job.start()
+
+    # Invalidação do cache por alterações nos dados (leitor do log com CACHE_INVALIDACAO=tabela)
+    alteracao_notifier.start()
+
+    # Limpeza do log de alterações, lido ou não pelos jobs acima
+    limpeza_job = None
+    if config.ALTERACAO_RETENCAO > 0:
+        limpeza_job = AlteracaoLimpezaJob(retencao=config.ALTERACAO_RETENCAO)
+        limpeza_job.start()
+
     yield
 
+    if limpeza_job is not None:
+        await limpeza_job.stop()
+    await alteracao_notifier.stop()
+    await danfe_emitida_job.stop()
+    if resumo_job is not None:
+        await resumo_job.stop()
+
     logger.info("Encerrando aplicação e liberando recursos SQLAlchemy")
     await shutdown_db()
     logger.info("Pool de conexões SQLAlchemy encerrado com sucesso")
@@ -34,6 +77,19 @@ app = FastAPI(
 prefix, router = get_graphql_router()
 app.include_router(router=router, prefix=prefix)
 
+# Exportação em lote (streaming), ao lado do GraphQL
+prefix, router = get_export_router()
+app.include_router(router=router, prefix=prefix)
+
+# Ingestão em lote (upload NDJSON em streaming)
+prefix, router = get_ingestao_router()
+app.include_router(router=router, prefix=prefix)
+
+# Métricas Prometheus (pool, SQL por builder, resolvers e operações)
+if config.METRICS_ENABLED:
+    prefix, router = get_metrics_router()
+    app.include_router(router=router, prefix=prefix)
+
 
 @app.get("/")
 def root():
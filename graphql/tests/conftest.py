@@ -0,0 +1,4 @@
+import os
+
+# Os testes não acessam o banco: o engine só precisa ser criado na importação da aplicação
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
@@ -0,0 +1,53 @@
+import pytest
+
+from app.core import config
+from app.domain.builders.contribuinte_builder import ContribuinteBuilder, nm_fantasia_busca
+from app.presentation.dtos.contribuinte_dto import ContribuinteBuscaTextoRow, ContribuinteDTO
+from app.presentation.enums.contribuinte_enum import ModoBusca
+from app.presentation.filters.contribuinte_filter import ContribuintesFilter
+
+
+def test_contribuinte_nao_expoe_relevancia():
+    assert "relevancia" not in ContribuinteDTO.model_fields
+
+
+@pytest.mark.parametrize("modo", [ModoBusca.PREFIXO, ModoBusca.CONTEM])
+def test_cursor_sem_relevancia_fora_da_busca_por_texto(modo):
+    assert ContribuinteBuilder.Contribuintes.cursor_keys(modo) == ("nm_fantasia", "cnpj_contribuinte")
+
+
+def test_busca_por_texto_ordena_e_pagina_pela_relevancia(monkeypatch):
+    monkeypatch.setattr(config, "DB_BACKEND", "oracle")
+    filtro = ContribuintesFilter(nmFantasia="padaria central", modo=ModoBusca.TEXTO)
+    after = {"relevancia": 12.0, "nm_fantasia": "Padaria Central", "cnpj_contribuinte": "12345678000199"}
+
+    statement, parameters = ContribuinteBuilder.Contribuintes.build_statement(filtro=filtro, after=after, limit=10)
+
+    assert ContribuinteBuilder.Contribuintes.cursor_keys(filtro.modo) == tuple(after)
+    assert "SCORE(1) AS relevancia" in str(statement)
+    assert parameters["after_relevancia"] == 12.0
+    assert parameters["nmFantasiaTexto"] == "padaria% AND central%"
+
+
+def test_linha_da_busca_por_texto_leva_a_relevancia():
+    row = ContribuinteBuscaTextoRow.from_row(
+        {"cnpj_contribuinte": "12345678000199", "nm_fantasia": "Padaria Central", "relevancia": 12.0}
+    )
+
+    assert (row.nm_fantasia, row.relevancia) == ("Padaria Central", 12.0)
+
+
+@pytest.mark.parametrize(
+    ("termo", "prefixo"),
+    [("São João", "SAO JOAO%"), ("peña", "PEÑA%"), ("Ação_100%", "ACAO\\_100\\%%")],
+)
+def test_prefixo_normaliza_como_a_coluna(termo, prefixo):
+    filtro = ContribuintesFilter(nmFantasia=termo, modo=ModoBusca.PREFIXO)
+
+    _, parameters = ContribuinteBuilder.Contribuintes.build_statement(filtro=filtro, after=None, limit=10)
+
+    assert parameters["nmFantasiaPrefixo"] == prefixo
+
+
+def test_letras_fora_do_mapa_ficam_como_na_coluna():
+    assert nm_fantasia_busca("Peña Café") == "PEÑA CAFE"
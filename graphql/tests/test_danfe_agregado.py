@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import create_engine, event
+
+from app.core import config
+from app.domain.builders.danfe_agregado_builder import DanfeAgregadoBuilder
+from app.domain.helpers.resumo_helper import resumo_mensal
+from app.presentation.dtos.danfe_dto import DanfeAgregadoDTO
+from app.presentation.filters.danfe_filter import DanfeAgregadoFilter
+
+
+@pytest.fixture
+def connection():
+    engine = create_engine("sqlite://")
+
+    @event.listens_for(engine, "connect")
+    def _attach_schema(dbapi_connection, connection_record):
+        dbapi_connection.execute("ATTACH DATABASE ':memory:' AS nota_fiscal")
+
+    with engine.connect() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE nota_fiscal.danfe (id_danfe INTEGER PRIMARY KEY, cnpj_contribuinte TEXT, numero TEXT,"
+            " valor_total REAL, data_emissao TIMESTAMP)"
+        )
+        connection.exec_driver_sql(
+            "CREATE TABLE nota_fiscal.danfe_resumo_mensal (cnpj_contribuinte TEXT, ano INTEGER, mes INTEGER,"
+            " mes_emissao TIMESTAMP, quantidade INTEGER, soma REAL, minimo REAL, maximo REAL)"
+        )
+        yield connection
+
+
+def _agregado(connection, filtro: DanfeAgregadoFilter) -> list[DanfeAgregadoDTO]:
+    statement, parameters = DanfeAgregadoBuilder.Agregado.build_statement(filtro=filtro, limit=10)
+    return [DanfeAgregadoDTO(**row) for row in connection.execute(statement, parameters).mappings()]
+
+
+@pytest.mark.parametrize("agrupar_por", [[], ["MES"]])
+def test_resumo_e_danfe_concordam_sem_danfes(connection, monkeypatch, agrupar_por):
+    filtro = DanfeAgregadoFilter(cnpj="12345678000199", agruparPor=agrupar_por)
+
+    monkeypatch.setattr(config, "RESUMO_MENSAL_ATIVO", False)
+    bruto = _agregado(connection, filtro)
+    monkeypatch.setattr(config, "RESUMO_MENSAL_ATIVO", True)
+    monkeypatch.setattr(resumo_mensal, "pronto", True)
+    resumo = _agregado(connection, filtro)
+
+    assert resumo == bruto
+    assert bruto == ([DanfeAgregadoDTO(quantidade=0)] if not agrupar_por else [])
+
+
+@pytest.mark.parametrize("pronto", [False, True])
+def test_resumo_so_responde_depois_de_construido(monkeypatch, pronto):
+    monkeypatch.setattr(config, "RESUMO_MENSAL_ATIVO", True)
+    monkeypatch.setattr(resumo_mensal, "pronto", pronto)
+
+    statement, _ = DanfeAgregadoBuilder.Agregado.build_statement(
+        filtro=DanfeAgregadoFilter(agruparPor=["MES"]), limit=10
+    )
+
+    assert ("danfe_resumo_mensal" in str(statement)) is pronto
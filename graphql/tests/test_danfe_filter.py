@@ -0,0 +1,93 @@
+import asyncio
+from datetime import date, datetime
+
+import httpx
+import pytest
+from pydantic import ValidationError
+
+from app.domain.builders.danfe_agregado_builder import DanfeAgregadoBuilder
+from app.domain.builders.danfe_builder import DanfeBuilder
+from app.presentation.filters.danfe_filter import DanfeAgregadoFilter, DanfesFilter
+from main import app
+
+
+@pytest.mark.parametrize("ano", [-1, 0, 1899, 9999, 99999])
+def test_danfes_rejeita_ano_fora_do_intervalo(ano):
+    with pytest.raises(ValidationError):
+        DanfesFilter(cnpj="12345678000199", ano=ano)
+
+
+@pytest.mark.parametrize("ano", [1900, 2024, 9998])
+def test_danfes_periodo_do_ano(ano):
+    filtro = DanfesFilter(cnpj="12345678000199", ano=ano)
+
+    _, parameters = DanfeBuilder.Danfes.build_statement(filtro=filtro, after=None, limit=10)
+
+    assert parameters["anoInicio"] == datetime(ano, 1, 1)
+    assert parameters["anoFim"] == datetime(ano + 1, 1, 1)
+
+
+@pytest.mark.parametrize("ano", [-1, 0, 1899, 9999, 99999])
+def test_agregado_rejeita_ano_fora_do_intervalo(ano):
+    with pytest.raises(ValidationError):
+        DanfeAgregadoFilter(agruparPor=["MES"], ano=ano)
+
+
+@pytest.mark.parametrize("ano", [1900, 9998])
+def test_agregado_periodo_do_ano(ano):
+    filtro = DanfeAgregadoFilter(agruparPor=["MES"], ano=ano)
+
+    _, parameters = DanfeAgregadoBuilder.Agregado.build_statement(filtro=filtro, limit=10)
+
+    assert parameters["anoInicio"] == datetime(ano, 1, 1)
+    assert parameters["anoFim"] == datetime(ano + 1, 1, 1)
+
+
+def test_exportacao_recusa_ano_fora_do_intervalo_antes_do_streaming():
+    async def get():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.get("/export/danfes", params={"cnpj": "12345678000199", "ano": 99999})
+
+    response = asyncio.run(get())
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["ano"]
+
+
+@pytest.mark.parametrize("campo", ["dataInicio", "dataFim"])
+@pytest.mark.parametrize("data", [date(1, 1, 1), date(1899, 12, 31), date(9999, 1, 1), date(9999, 12, 31)])
+def test_danfes_rejeita_data_fora_do_intervalo(campo, data):
+    with pytest.raises(ValidationError):
+        DanfesFilter(cnpj="12345678000199", **{campo: data})
+
+
+def test_danfes_periodo_da_ultima_data_aceita():
+    filtro = DanfesFilter(cnpj="12345678000199", dataFim=date(9998, 12, 31))
+    _, parameters = DanfeBuilder.Danfes.build_statement(filtro=filtro, after=None, limit=10)
+    assert parameters["dataFim"] == datetime(9999, 1, 1)
+
+
+def test_exportacao_recusa_data_fora_do_intervalo_antes_do_streaming():
+    async def get():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.get("/export/danfes", params={"cnpj": "12345678000199", "dataFim": "9999-12-31"})
+
+    response = asyncio.run(get())
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["dataFim"]
+
+
+@pytest.mark.parametrize("campo", ["dataInicio", "dataFim"])
+@pytest.mark.parametrize("data", [date(1, 1, 1), date(1899, 12, 31), date(9999, 1, 1), date(9999, 12, 31)])
+def test_agregado_rejeita_data_fora_do_intervalo(campo, data):
+    with pytest.raises(ValidationError):
+        DanfeAgregadoFilter(agruparPor=["MES"], **{campo: data})
+
+
+def test_agregado_periodo_da_ultima_data_aceita():
+    filtro = DanfeAgregadoFilter(agruparPor=["MES"], dataFim=date(9998, 12, 31))
+
+    _, parameters = DanfeAgregadoBuilder.Agregado.build_statement(filtro=filtro, limit=10)
+
+    assert parameters["dataFim"] == datetime(9999, 1, 1)
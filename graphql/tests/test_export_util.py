@@ -0,0 +1,35 @@
+import asyncio
+
+from app.domain.builders.danfe_builder import DanfeBuilder
+from app.presentation.dtos.danfe_dto import DanfeDTO
+from app.presentation.enums.export_enum import FormatoExportacao
+from app.presentation.utils.export_util import Export
+
+
+def _exportar(formato: FormatoExportacao, lotes: list[list[dict]], columns: list[str]) -> bytes:
+    async def batches():
+        for rows in lotes:
+            yield rows
+
+    async def encode():
+        return b"".join([chunk async for chunk in Export.encode(formato, batches(), DanfeDTO, columns=columns)])
+
+    return asyncio.run(encode())
+
+
+def test_colunas_da_exportacao_incluem_a_ordenacao():
+    assert DanfeBuilder.Danfes.export_columns({"valor_total"}) == ["numero", "valor_total", "data_emissao"]
+
+
+def test_csv_sem_linhas_tem_cabecalho():
+    columns = DanfeBuilder.Danfes.export_columns({"valor_total"})
+
+    assert _exportar(FormatoExportacao.CSV, [], columns) == b"numero,valor_total,data_emissao\r\n"
+    assert _exportar(FormatoExportacao.CSV, [[]], columns) == b"numero,valor_total,data_emissao\r\n"
+
+
+def test_csv_cabecalho_uma_vez_antes_das_linhas():
+    columns = ["numero", "valor_total"]
+    lotes = [[{"valor_total": 1.5, "numero": "NF1"}], [{"valor_total": 2.0, "numero": "NF2"}]]
+
+    assert _exportar(FormatoExportacao.CSV, lotes, columns) == b"numero,valor_total\r\nNF1,1.5\r\nNF2,2.0\r\n"
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+
+from app.domain.services.ingestao_service import IngestaoService
+from app.presentation.dtos.ingestao_dto import DanfeIngestaoDTO, EnderecoIngestaoDTO
+
+ENDERECO = {"cnpj_contribuinte": "12345678000199", "logradouro": "Rua A", "municipio": "SALVADOR", "uf": "BA"}
+
+
+def test_endereco_grava_a_uf_do_enum():
+    assert EnderecoIngestaoDTO.model_validate(ENDERECO).model_dump()["uf"] == "BA"
+
+
+@pytest.mark.parametrize("campos", [ENDERECO | {"uf": "XX"}, ENDERECO | {"uf": None}, {"cnpj_contribuinte": "1"}])
+def test_endereco_invalido(campos):
+    with pytest.raises(ValidationError):
+        EnderecoIngestaoDTO.model_validate(campos)
+
+
+def test_registros_invalidos_viram_erros_sem_gravar():
+    lote = {
+        "endereco": [(0, ENDERECO | {"uf": "XX"})],
+        "danfe": [(1, {"cnpj_contribuinte": "12345678000199", "numero": "NF1"})],
+    }
+
+    resultado = asyncio.run(IngestaoService(session=None).ingerir(lote=lote))
+
+    assert (resultado.recebidos, resultado.gravados) == (2, 0)
+    assert [(erro.entidade, erro.indice, erro.chave) for erro in resultado.erros] == [
+        ("endereco", 0, "12345678000199"),
+        ("danfe", 1, "NF1"),
+    ]
+    assert resultado.erros[1].mensagem == "valor_total: Field required; data_emissao: Field required"
+
+
+def test_danfe_exige_todas_as_colunas():
+    assert set(DanfeIngestaoDTO.model_json_schema()["required"]) == {
+        "cnpj_contribuinte",
+        "numero",
+        "valor_total",
+        "data_emissao",
+    }
@@ -0,0 +1,46 @@
+import time
+
+from app.domain.helpers.marca_helper import MAX_PENDENTES, MarcaHelper
+
+
+def test_ids_pulados_ficam_pendentes_ate_aparecerem():
+    marca = MarcaHelper(espera=30, salto_maximo=10)
+    marca.reiniciar(marca=10)
+
+    marca.avancar([11, 14, 15])
+
+    assert marca.marca == 15
+    assert marca.pendentes == [12, 13]
+
+    marca.encontrados([13])
+
+    assert marca.pendentes == [12]
+
+
+def test_salto_maior_que_o_maximo_nao_e_acompanhado():
+    marca = MarcaHelper(espera=30, salto_maximo=10)
+    marca.reiniciar(marca=10)
+
+    marca.avancar([30])
+
+    assert (marca.marca, marca.pendentes) == (30, [])
+
+
+def test_pendentes_expiram_depois_da_espera(monkeypatch):
+    marca = MarcaHelper(espera=30, salto_maximo=10)
+    marca.reiniciar(marca=0)
+    marca.avancar([3])
+
+    agora = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: agora + 31)
+
+    assert marca.pendentes == []
+
+
+def test_pendentes_limitados():
+    marca = MarcaHelper(espera=30, salto_maximo=MAX_PENDENTES * 2)
+    marca.reiniciar(marca=0)
+
+    marca.avancar([MAX_PENDENTES * 2])
+
+    assert len(marca.pendentes) == MAX_PENDENTES
@@ -0,0 +1,23 @@
+from app.core.metrics import ANONYMOUS_OPERATION, OTHER_OPERATION, Metrics
+from app.presentation.extensions.persisted_query_extension import PersistedQueryStore
+
+
+def test_operacoes_alem_do_limite_viram_outra():
+    metrics = Metrics(operations=["Dashboard"], max_operations=2)
+
+    labels = [metrics.operation(nome) for nome in ["A", "B", "C", "Dashboard", "A", None, "x" * 101]]
+
+    assert labels == ["A", "B", OTHER_OPERATION, "Dashboard", "A", ANONYMOUS_OPERATION, OTHER_OPERATION]
+
+
+def test_operacoes_do_manifesto_sao_conhecidas(tmp_path):
+    query = "query Painel { __typename } query { __typename }"
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(f'{{"{PersistedQueryStore.hash(query)}": "{query}"}}', encoding="utf-8")
+    store = PersistedQueryStore(max_entries=10)
+    store.load_manifest(str(manifest))
+    metrics = Metrics(max_operations=0)
+
+    metrics.register_operations(store.operation_names())
+
+    assert (metrics.operation("Painel"), metrics.operation("Outra")) == ("Painel", OTHER_OPERATION)
@@ -0,0 +1,53 @@
+import asyncio
+
+import httpx
+
+from main import app
+
+# Painel: um card por contribuinte acompanhado (lookups por cnpj com alias) e o resumo do contribuinte em foco,
+# no formato do cenário multiplas_raizes do benchmark
+CARDS = "\n".join(
+    f'c{i}: contribuinte(filtro: {{ cnpj: "{i:014d}" }}) {{ nmFantasia endereco {{ municipio uf }} }}'
+    for i in range(20)
+)
+PAINEL = f"""
+query Painel {{
+  {CARDS}
+  contribuinte(filtro: {{ cnpj: "00000000000001" }}) {{
+    nmFantasia
+    danfes(first: 5) {{ edges {{ node {{ numero valorTotal }} }} }}
+  }}
+  danfes(filtro: {{ cnpj: "00000000000001" }}, first: 5) {{ totalCount edges {{ node {{ numero dataEmissao }} }} }}
+  enderecos(filtro: {{ uf: BA, municipio: "SALVADOR" }}, first: 5) {{ edges {{ node {{ cnpjContribuinte }} }} }}
+}}
+"""
+
+
+def _post(query: str) -> dict:
+    async def post():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return (await client.post("/graphql", json={"query": query})).json()
+
+    return asyncio.run(post())
+
+
+def _codes(result: dict) -> set[str]:
+    return {(error.get("extensions") or {}).get("code") for error in result.get("errors") or ()}
+
+
+def test_painel_com_lookups_em_lote_nao_conta_aliases():
+    result = _post(PAINEL)
+
+    assert not _codes(result) & {"TOO_MANY_ALIASES", "QUERY_TOO_EXPENSIVE", "QUERY_TOO_DEEP"}
+    assert result["extensions"]["cost"]["aliases"] == 0
+
+
+def test_aliases_de_consultas_paginadas_continuam_limitados():
+    paginas = "\n".join(
+        f'p{i}: contribuintes(filtro: {{ nmFantasia: "loja" }}, first: 1) {{ edges {{ node {{ nmFantasia }} }} }}'
+        for i in range(16)
+    )
+
+    result = _post(f"{{ {paginas} }}")
+
+    assert "TOO_MANY_ALIASES" in _codes(result)
@@ -0,0 +1,118 @@
+import asyncio
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from app.core.cache.memory_cache_backend import MemoryCacheBackend
+from app.core.cache.read_through_cache import ReadThroughCache
+
+LINHA = {
+    "numero": "1",
+    "valor_total": Decimal("10.50"),
+    "data_emissao": datetime(2024, 1, 15, 10, 30),
+    "vencimento": date(2024, 2, 1),
+}
+
+
+def _cache() -> ReadThroughCache:
+    return ReadThroughCache(backend=MemoryCacheBackend(max_bytes=1024 * 1024), ttls={"danfe": 60})
+
+
+def _get(cache: ReadThroughCache, loader, tags=None):
+    return cache.get_or_load(entity="danfe", statement="SELECT 1", parameters={}, loader=loader, tags=tags)
+
+
+def test_cancelamento_de_quem_carrega_nao_cancela_quem_aguarda():
+    async def run():
+        cache = _cache()
+        cargas = []
+
+        async def loader():
+            cargas.append(len(cargas))
+            await asyncio.sleep(0.01)
+            return [{"numero": "1"}]
+
+        dona = asyncio.create_task(_get(cache, loader))
+        await asyncio.sleep(0)
+        aguardando = asyncio.create_task(_get(cache, loader))
+        await asyncio.sleep(0)
+        dona.cancel()
+
+        assert await aguardando == [{"numero": "1"}]
+        assert dona.cancelled()
+        return cargas
+
+    assert asyncio.run(run()) == [0, 1]
+
+
+class _BackendForaDoAr(MemoryCacheBackend):
+    async def get(self, key):
+        raise ConnectionError("cache fora do ar")
+
+    async def set(self, key, value, ttl, tags=()):
+        raise ConnectionError("cache fora do ar")
+
+
+def test_falha_do_backend_cai_no_loader():
+    async def loader():
+        return [{"numero": "1"}]
+
+    cache = ReadThroughCache(backend=_BackendForaDoAr(max_bytes=1024), ttls={"danfe": 60})
+
+    assert asyncio.run(_get(cache, loader)) == [{"numero": "1"}]
+    assert cache.misses == 1
+
+
+def test_single_flight_carrega_uma_vez_e_guarda_em_json():
+    async def run():
+        cache = _cache()
+        cargas = []
+
+        async def loader():
+            cargas.append(len(cargas))
+            await asyncio.sleep(0.01)
+            return [LINHA]
+
+        resultados = await asyncio.gather(*(_get(cache, loader) for _ in range(5)))
+        hit = await _get(cache, loader)
+        (data,) = [value for _, value, _ in cache.backend._items.values()]
+        return resultados, hit, cargas, cache.stats(), data
+
+    resultados, hit, cargas, stats, data = asyncio.run(run())
+
+    assert resultados == [[LINHA]] * 5
+    assert hit == [LINHA]
+    assert {campo: type(valor) for campo, valor in hit[0].items()} == {
+        campo: type(valor) for campo, valor in LINHA.items()
+    }
+    assert cargas == [0]
+    assert (stats["misses"], stats["coalesced"], stats["hits"]) == (1, 4, 1)
+    assert json.loads(data)[0]["numero"] == "1"
+
+
+def test_invalidacao_durante_a_carga_nao_guarda_o_valor():
+    async def run():
+        cache = _cache()
+
+        async def loader():
+            await cache.invalidate({"cnpj:1"})
+            return [LINHA]
+
+        valor = await _get(cache, loader, tags=lambda rows: {"cnpj:1"})
+        return valor, cache.backend.size()
+
+    assert asyncio.run(run()) == ([LINHA], 0)
+
+
+def test_entrada_ilegivel_vira_miss():
+    async def run():
+        cache = _cache()
+
+        async def loader():
+            return [LINHA]
+
+        key = cache._key(entity="danfe", statement="SELECT 1", parameters={})
+        await cache.backend.set(key, b"\x80\x05 pickle antigo", 60)
+        return await _get(cache, loader), cache.misses
+
+    assert asyncio.run(run()) == ([LINHA], 1)